@@ -0,0 +1,93 @@
+"""Compare streamed Jinja responses sending each fragment with coalesced chunks
+
+Usage: python benchmarks/jinja_streaming.py [--rows N]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from asgikit.requests import Request
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.ext.templates.jinja.service import JinjaTemplate
+
+TEMPLATE = """\
+<table>
+{% for row in rows %}
+<tr><td>{{ row.id }}</td><td>{{ row.name }}</td><td>{{ row.value }}</td></tr>
+{% endfor %}
+</table>
+"""
+
+
+async def stream(template: JinjaTemplate, rows: list) -> tuple[float, int]:
+    messages = 0
+
+    async def send(_message):
+        nonlocal messages
+        messages += 1
+        # each message goes through the server and the socket
+        await asyncio.sleep(0)
+
+    async def receive():
+        # the client never disconnects
+        await asyncio.Future()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/",
+        "query_string": b"",
+        "headers": [],
+    }
+
+    request = Request(scope, receive, send)
+
+    start = time.perf_counter()
+    await template.respond(request.response, "table.html", {"rows": rows}, stream=True)
+    return time.perf_counter() - start, messages
+
+
+def make_template(directory: str, chunk_size: int) -> JinjaTemplate:
+    settings = Settings(
+        default_settings
+        | {
+            "templates": {
+                "jinja": {"paths": [directory], "streaming": {"chunk_size": chunk_size}}
+            }
+        }
+    )
+
+    template = JinjaTemplate(settings)
+    template.initialize()
+    return template
+
+
+async def main(num_rows: int):
+    rows = [{"id": i, "name": f"<item {i}>", "value": i / 3} for i in range(num_rows)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "table.html").write_text(TEMPLATE)
+
+        # a chunk size of 1 sends every fragment as it is rendered
+        for name, chunk_size in [("fragments", 1), ("coalesced", 4096)]:
+            template = make_template(tmp, chunk_size)
+            await stream(template, rows[:10])
+
+            elapsed, messages = await stream(template, rows)
+            print(f"{name:10} {elapsed * 1000:10.2f} ms {messages:8} messages")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rows))
@@ -0,0 +1,102 @@
+"""Compare the cost of a disabled debug log on each request with and without
+checking the level first
+
+Usage: python benchmarks/logging_guards.py [--requests N]
+"""
+
+import argparse
+import logging
+import time
+
+import structlog
+from asgikit.requests import Request
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.logging import get_logger, setup
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/items",
+    "raw_path": b"/items",
+    "query_string": b"page=2&size=50&sort=name",
+    "root_path": "",
+    "headers": [(b"host", b"localhost")],
+    "server": ("localhost", 8000),
+    "client": ("127.0.0.1", 50000),
+}
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(_message):
+    pass
+
+
+def unguarded(num_requests: int) -> float:
+    logger = structlog.get_logger()
+
+    start = time.perf_counter()
+    for _ in range(num_requests):
+        request = Request(SCOPE, receive, send)
+        logger.debug(
+            "handling request",
+            method=str(request.method),
+            path=request.path,
+            query=request.query,
+        )
+    return time.perf_counter() - start
+
+
+def guarded(num_requests: int) -> float:
+    logger = get_logger("benchmark")
+
+    start = time.perf_counter()
+    for _ in range(num_requests):
+        request = Request(SCOPE, receive, send)
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                "handling request",
+                method=str(request.method),
+                path=request.path,
+                query=request.query,
+            )
+    return time.perf_counter() - start
+
+
+def baseline(num_requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(num_requests):
+        Request(SCOPE, receive, send)
+    return time.perf_counter() - start
+
+
+def main(num_requests: int):
+    logging_settings = {"setup": "selva.logging:setup", "root": "info"}
+    setup(Settings(default_settings | {"logging": logging_settings}))
+
+    base = baseline(num_requests)
+    results = {
+        "unguarded": unguarded(num_requests),
+        "guarded": guarded(num_requests),
+    }
+
+    for name, elapsed in results.items():
+        per_request = (elapsed - base) / num_requests * 1_000_000
+        print(
+            f"{name:9} total: {elapsed * 1000:8.2f} ms  logging: {per_request:6.2f} us/request"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=100_000)
+    args = parser.parse_args()
+
+    main(args.requests)
@@ -0,0 +1,87 @@
+"""Compare the time spent logging in the caller with the stream handler and with
+the queue handler
+
+Usage: python benchmarks/logging_queue.py [--records N] [--write-latency SECONDS]
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+
+import structlog
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.logging import flush_handlers, setup
+
+
+class SlowStream:
+    """Stream where each write blocks, like a pipe to a slow log collector"""
+
+    def __init__(self, stream, latency: float):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, data: str):
+        time.sleep(self.latency)
+        return self.stream.write(data)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def run(queue: dict | None, num_records: int) -> tuple[float, float]:
+    logging_settings = {
+        "setup": "selva.logging:setup",
+        "format": "json",
+        "root": "info",
+    }
+
+    if queue is not None:
+        logging_settings["queue"] = queue
+
+    setup(Settings(default_settings | {"logging": logging_settings}))
+    logger = structlog.get_logger("benchmark")
+
+    start = time.perf_counter()
+    for i in range(num_records):
+        logger.info("request handled", path="/items", status=200, index=i)
+    caller = time.perf_counter() - start
+
+    flush_handlers()
+    total = time.perf_counter() - start
+
+    return caller, total
+
+
+def main(num_records: int, write_latency: float):
+    stderr = sys.stderr
+
+    # logs are written to a file, like when redirected by a process manager
+    with tempfile.TemporaryFile("w") as output:
+        sys.stderr = SlowStream(output, write_latency)
+        try:
+            results = {
+                "stream": run(None, num_records),
+                "queue": run({"max_size": num_records}, num_records),
+            }
+        finally:
+            sys.stderr = stderr
+            logging.getLogger().handlers.clear()
+
+    for name, (caller, total) in results.items():
+        print(
+            f"{name:7} in caller: {caller * 1000:8.2f} ms"
+            f"  until written: {total * 1000:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--write-latency", type=float, default=0.0001)
+    args = parser.parse_args()
+
+    main(args.records, args.write_latency)
@@ -0,0 +1,94 @@
+"""Compare the latency of small renders while large templates are rendered,
+with Mako rendering inline, in a thread pool and in a process pool
+
+Usage: python benchmarks/mako_executor.py [--requests N] [--rows N]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.ext.templates.mako.service import MakoTemplate
+
+LARGE_TEMPLATE = """\
+<table>
+% for row in rows:
+<tr><td>${row["id"]}</td><td>${row["name"] | h}</td><td>${"%.2f" % row["value"]}</td></tr>
+% endfor
+</table>
+"""
+
+SMALL_TEMPLATE = "<h1>${title | h}</h1>"
+
+
+def make_template(directory: str, executor: dict) -> MakoTemplate:
+    settings = Settings(
+        default_settings
+        | {"templates": {"mako": {"directories": [directory], "executor": executor}}}
+    )
+
+    template = MakoTemplate(settings)
+    template.initialize()
+    return template
+
+
+async def small_render(template: MakoTemplate, arrival: float) -> float:
+    await template.render("small.html", {"title": "index"})
+    return time.perf_counter() - arrival
+
+
+async def mixed_workload(template: MakoTemplate, num_requests: int, rows: list):
+    # one large render for every ten small ones, all arriving at once
+    large = [
+        template.render("large.html", {"rows": rows}) for _ in range(num_requests // 10)
+    ]
+    start = time.perf_counter()
+    small = [small_render(template, start) for _ in range(num_requests)]
+
+    *_, latencies = await asyncio.gather(asyncio.gather(*large), asyncio.gather(*small))
+    return time.perf_counter() - start, latencies
+
+
+async def main(num_requests: int, num_rows: int):
+    rows = [{"id": i, "name": f"<item {i}>", "value": i / 3} for i in range(num_rows)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "large.html").write_text(LARGE_TEMPLATE)
+        (Path(tmp) / "small.html").write_text(SMALL_TEMPLATE)
+
+        executors = {
+            "inline": {},
+            "thread": {"type": "thread", "inline_threshold": 4096},
+            "process": {"type": "process", "inline_threshold": 4096},
+        }
+
+        for name, executor in executors.items():
+            template = make_template(tmp, executor)
+
+            # compile the templates, start the workers and record the output sizes
+            await mixed_workload(template, 10, rows)
+
+            total, latencies = await mixed_workload(template, num_requests, rows)
+            latencies = sorted(latencies)
+            p50 = statistics.median(latencies) * 1000
+            p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+            print(
+                f"{name:8} total: {total * 1000:8.2f} ms"
+                f"  small p50: {p50:8.2f} ms  p99: {p99:8.2f} ms"
+            )
+
+            template.finalize()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=5_000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.rows))
@@ -0,0 +1,52 @@
+"""Compare concurrent memcached 'get' calls with and without batching
+
+Usage: python benchmarks/memcached_batching.py [--keys N] [--latency SECONDS]
+"""
+
+import argparse
+import asyncio
+import time
+
+from aiomcache import FlagClient
+from memcached_server import MemcachedServer
+
+from selva.ext.data.memcached.batching import BatchingClient
+
+
+async def run(client, keys: list[bytes]) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*[client.get(key) for key in keys])
+    return time.perf_counter() - start
+
+
+async def main(num_keys: int, latency: float):
+    server = MemcachedServer(latency)
+    await server.start()
+
+    keys = [f"key{i}".encode() for i in range(num_keys)]
+
+    client = FlagClient("127.0.0.1", server.port, pool_size=10)
+    for key in keys:
+        await client.set(key, b"value")
+
+    server.requests = 0
+    elapsed = await run(client, keys)
+    print(f"plain:    {server.requests:5d} requests {elapsed * 1000:8.2f} ms")
+
+    batching = BatchingClient(client, max_keys=100)
+
+    server.requests = 0
+    elapsed = await run(batching, keys)
+    print(f"batching: {server.requests:5d} requests {elapsed * 1000:8.2f} ms")
+
+    await batching.close()
+    await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.0005)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.keys, args.latency))
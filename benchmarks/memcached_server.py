@@ -0,0 +1,70 @@
+"""Minimal in-process stand-in for memcached, used by the benchmarks
+
+Implements the 'get', 'gets', 'set' and 'delete' commands of the text protocol
+and counts the requests it receives, so benchmarks can compare round-trips.
+"""
+
+import asyncio
+
+
+class MemcachedServer:
+    def __init__(self, latency: float = 0.0005):
+        self.latency = latency
+        self.data: dict[bytes, tuple[int, bytes]] = {}
+        self.requests = 0
+        self.server: asyncio.Server | None = None
+        self.handlers: set[asyncio.Task] = set()
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+        # clients should be closed before, so handlers finish on their own
+        if self.handlers:
+            await asyncio.wait(self.handlers, timeout=1)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.handlers.add(asyncio.current_task())
+
+        try:
+            while line := await reader.readline():
+                self.requests += 1
+                # simulate the network round-trip
+                await asyncio.sleep(self.latency)
+
+                command, *args = line.split()
+                match command:
+                    case b"get" | b"gets":
+                        for key in args:
+                            if item := self.data.get(key):
+                                flags, value = item
+                                cas = b" 1" if command == b"gets" else b""
+                                writer.write(
+                                    b"VALUE %s %d %d%s\r\n%s\r\n"
+                                    % (key, flags, len(value), cas, value)
+                                )
+                        writer.write(b"END\r\n")
+                    case b"set":
+                        key, flags, _exptime, size = args[:4]
+                        value = (await reader.readexactly(int(size) + 2))[:-2]
+                        self.data[key] = (int(flags), value)
+                        writer.write(b"STORED\r\n")
+                    case b"delete":
+                        found = self.data.pop(args[0], None) is not None
+                        writer.write(b"DELETED\r\n" if found else b"NOT_FOUND\r\n")
+                    case _:
+                        writer.write(b"ERROR\r\n")
+
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            self.handlers.discard(asyncio.current_task())
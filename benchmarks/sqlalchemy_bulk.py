@@ -0,0 +1,102 @@
+"""Compare row by row inserts with bulk inserts, and OFFSET with keyset pagination
+
+Usage: python benchmarks/sqlalchemy_bulk.py [--rows N] [--page-size N]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import String, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from selva.ext.data.sqlalchemy.bulk import bulk_insert
+from selva.ext.data.sqlalchemy.pagination import Cursor, paginate
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "item"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(100))
+
+
+async def insert_row_by_row(sessionmaker, rows: list[dict]):
+    async with sessionmaker() as session:
+        for row in rows:
+            await session.execute(Item.__table__.insert(), row)
+        await session.commit()
+
+
+async def insert_bulk(sessionmaker, rows: list[dict]):
+    async with sessionmaker() as session:
+        await bulk_insert(session, Item, rows)
+        await session.commit()
+
+
+async def last_page_offset(sessionmaker, page_size: int):
+    async with sessionmaker() as session:
+        count = await session.scalar(select(func.count()).select_from(Item))
+        offset = count - page_size
+        stmt = select(Item).order_by(Item.id).offset(offset).limit(page_size)
+        return (await session.scalars(stmt)).all()
+
+
+async def last_page_keyset(sessionmaker, page_size: int, cursor):
+    async with sessionmaker() as session:
+        page = await paginate(
+            session, select(Item), [Item.id], cursor=cursor, limit=page_size
+        )
+        return page.items
+
+
+async def timed(coro) -> float:
+    start = time.perf_counter()
+    await coro
+    return time.perf_counter() - start
+
+
+async def reset(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def main(num_rows: int, page_size: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'db.sqlite3'}")
+        sessionmaker = async_sessionmaker(engine)
+        rows = [{"id": i, "name": f"item{i}"} for i in range(num_rows)]
+
+        await reset(engine)
+        elapsed = await timed(insert_row_by_row(sessionmaker, rows))
+        print(f"insert row by row: {elapsed * 1000:10.2f} ms")
+
+        await reset(engine)
+        elapsed = await timed(insert_bulk(sessionmaker, rows))
+        print(f"bulk_insert:       {elapsed * 1000:10.2f} ms")
+
+        elapsed = await timed(last_page_offset(sessionmaker, page_size))
+        print(f"last page offset:  {elapsed * 1000:10.2f} ms")
+
+        # cursor of the item before the last page, as a client would send it
+        cursor = Cursor([num_rows - page_size - 1])
+        elapsed = await timed(last_page_keyset(sessionmaker, page_size, cursor))
+        print(f"last page keyset:  {elapsed * 1000:10.2f} ms")
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rows, args.page_size))
@@ -22,6 +22,9 @@ async def clicked(request: Request, template: A[JinjaTemplate, Inject]):
 
     click_count += 1
 
-    rendered = await template.render("click-count.html", {"click_count": click_count})
+    # only the block with the counter is rendered, not the whole page
+    rendered = await template.render_block(
+        "index.html", "click_count", {"click_count": click_count, "oob": True}
+    )
 
     await respond_text(request.response, rendered + "Clicked!")
@@ -0,0 +1,243 @@
+import zlib
+from collections.abc import Iterator
+from typing import Protocol
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+__all__ = (
+    "Compressor",
+    "Decompressor",
+    "DecompressionError",
+    "make_compressor",
+    "make_decompressor",
+    "supported_decodings",
+    "supported_encodings",
+)
+
+
+class DecompressionError(Exception):
+    def __init__(self, encoding: str):
+        super().__init__(f"invalid '{encoding}' compressed data")
+        self.encoding = encoding
+
+
+class Decompressor(Protocol):
+    def decompress(self, data: bytes, max_length: int) -> Iterator[bytes]:
+        """Decompress data, yielding chunks of about `max_length` bytes"""
+
+    def flush(self) -> Iterator[bytes]:
+        """Yield remaining data and verify the stream is complete"""
+
+
+class ZlibDecompressor:
+    def __init__(self, encoding: str, wbits: int):
+        self.encoding = encoding
+        self.wbits = wbits
+        self._obj = zlib.decompressobj(wbits)
+
+    def decompress(self, data: bytes, max_length: int) -> Iterator[bytes]:
+        try:
+            yield from self._decompress(data, max_length)
+        except zlib.error as err:
+            raise DecompressionError(self.encoding) from err
+
+    def _decompress(self, data: bytes, max_length: int) -> Iterator[bytes]:
+        pending = False
+
+        while data or pending:
+            chunk = self._obj.decompress(data, max_length)
+            if chunk:
+                yield chunk
+
+            # output limit reached, there might be more data buffered
+            pending = len(chunk) == max_length
+
+            if self._obj.eof and (unused_data := self._obj.unused_data):
+                if self.wbits <= zlib.MAX_WBITS:
+                    raise DecompressionError(self.encoding)
+
+                # concatenated gzip members start a new stream
+                self._obj = zlib.decompressobj(self.wbits)
+                data = unused_data
+            else:
+                data = self._obj.unconsumed_tail
+
+    def flush(self) -> Iterator[bytes]:
+        try:
+            if chunk := self._obj.flush():
+                yield chunk
+        except zlib.error as err:
+            raise DecompressionError(self.encoding) from err
+
+        if not self._obj.eof:
+            raise DecompressionError(self.encoding)
+
+
+class DeflateDecompressor(ZlibDecompressor):
+    """Decompressor for the 'deflate' content coding
+
+    The specification defines 'deflate' as zlib wrapped data, but some clients
+    send raw deflate data, so the format is detected from the first bytes.
+    """
+
+    def __init__(self):
+        super().__init__("deflate", zlib.MAX_WBITS)
+        self._detected = False
+
+    def decompress(self, data: bytes, max_length: int) -> Iterator[bytes]:
+        if not self._detected and data:
+            self._detected = True
+            if not _is_zlib_header(data):
+                self.wbits = -zlib.MAX_WBITS
+                self._obj = zlib.decompressobj(self.wbits)
+
+        yield from super().decompress(data, max_length)
+
+
+def _is_zlib_header(data: bytes) -> bool:
+    if len(data) < 2:
+        return True
+
+    cmf, flg = data[0], data[1]
+    return cmf & 0x0F == 8 and (cmf << 8 | flg) % 31 == 0
+
+
+class BrotliDecompressor:
+    encoding = "br"
+
+    def __init__(self):
+        self._obj = brotli.Decompressor()
+
+    def decompress(self, data: bytes, max_length: int) -> Iterator[bytes]:
+        try:
+            chunk = self._obj.process(data, output_buffer_limit=max_length)
+            if chunk:
+                yield chunk
+
+            # output limit reached, there might be more data buffered
+            while len(chunk) >= max_length or not self._obj.can_accept_more_data():
+                chunk = self._obj.process(b"", output_buffer_limit=max_length)
+                if chunk:
+                    yield chunk
+        except brotli.error as err:
+            raise DecompressionError(self.encoding) from err
+
+    def flush(self) -> Iterator[bytes]:
+        if not self._obj.is_finished():
+            raise DecompressionError(self.encoding)
+
+        yield from ()
+
+
+def supported_decodings() -> set[str]:
+    result = {"gzip", "x-gzip", "deflate"}
+    if brotli is not None:
+        result.add("br")
+    return result
+
+
+def make_decompressor(encoding: str) -> Decompressor | None:
+    """Create a decompressor for the given content coding
+
+    :return: The decompressor or None if the content coding is not supported
+    """
+
+    match encoding.lower():
+        case "gzip" | "x-gzip":
+            return ZlibDecompressor("gzip", 16 + zlib.MAX_WBITS)
+        case "deflate":
+            return DeflateDecompressor()
+        case "br" if brotli is not None:
+            return BrotliDecompressor()
+        case _:
+            return None
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes:
+        """Compress data, possibly keeping part of it in internal buffers"""
+
+    def flush(self) -> bytes:
+        """Return all pending data so the output so far can be decompressed"""
+
+    def finish(self) -> bytes:
+        """Return remaining data and end the stream"""
+
+
+class GzipCompressor:
+    def __init__(self, level: int = None):
+        level = level if level is not None else zlib.Z_DEFAULT_COMPRESSION
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor:
+    def __init__(self, level: int = None):
+        kwargs = {"quality": level} if level is not None else {}
+        self._obj = brotli.Compressor(**kwargs)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int = None):
+        kwargs = {"level": level} if level is not None else {}
+        self._obj = zstandard.ZstdCompressor(**kwargs).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def supported_encodings() -> set[str]:
+    result = {"gzip"}
+    if brotli is not None:
+        result.add("br")
+    if zstandard is not None:
+        result.add("zstd")
+    return result
+
+
+def make_compressor(encoding: str, level: int = None) -> Compressor | None:
+    """Create a compressor for the given content coding
+
+    :return: The compressor or None if the content coding is not supported
+    """
+
+    match encoding.lower():
+        case "gzip":
+            return GzipCompressor(level)
+        case "br" if brotli is not None:
+            return BrotliCompressor(level)
+        case "zstd" if zstandard is not None:
+            return ZstdCompressor(level)
+        case _:
+            return None
@@ -1 +1,2 @@
 from .dotted_path import DottedPath  # noqa: F401
+from .optional_settings import enable_with_bool  # noqa: F401
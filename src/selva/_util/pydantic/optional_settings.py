@@ -0,0 +1,21 @@
+from pydantic import field_validator
+
+
+def _enable_settings(_cls, value):
+    match value:
+        case True:
+            return {}
+        case False:
+            return None
+        case _:
+            return value
+
+
+def enable_with_bool(*fields: str):
+    """Validator that accepts a bool for optional settings models
+
+    `True` enables the settings with their default values and `False` disables
+    them, so `batching: true` can be used instead of `batching: {}`.
+    """
+
+    return field_validator(*fields, mode="before")(classmethod(_enable_settings))
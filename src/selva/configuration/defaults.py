@@ -10,10 +10,36 @@ default_settings = {
         "mako": {},
     },
     "data": {
+        "cache": {},
         "memcached": {},
         "redis": {},
         "sqlalchemy": {},
     },
+    "request": {
+        "decompression": {
+            "enabled": True,
+            "max_size": 10 * 1024 * 1024,
+        },
+    },
+    "compression": {
+        "encodings": ["br", "zstd", "gzip"],
+        "minimum_size": 500,
+        "content_types": [
+            "text/",
+            "application/json",
+            "application/javascript",
+            "application/xml",
+            "application/xhtml+xml",
+            "application/x-ndjson",
+            "image/svg+xml",
+        ],
+        "levels": {
+            "gzip": 6,
+            "br": 4,
+            "zstd": 3,
+        },
+        "thread_threshold": 64 * 1024,
+    },
     "staticfiles": {
         "path": "/static",
         "root": "resources/static",
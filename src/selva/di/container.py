@@ -1,11 +1,10 @@
 import asyncio
 import inspect
+import logging
 from collections.abc import AsyncGenerator, Awaitable, Generator, Iterable
 from types import FunctionType, ModuleType
 from typing import Any, TypeVar
 
-import structlog
-
 from selva._util.maybe_async import maybe_async
 from selva._util.package_scan import scan_packages
 from selva.di.decorator import ATTRIBUTE_DI_SERVICE
@@ -20,8 +19,9 @@ from selva.di.interceptor import Interceptor
 from selva.di.service.model import InjectableType, ServiceDependency, ServiceSpec
 from selva.di.service.parse import parse_service_spec
 from selva.di.service.registry import ServiceRegistry
+from selva.logging import get_logger
 
-logger = structlog.get_logger(__name__)
+logger = get_logger(__name__)
 
 T = TypeVar("T")
 
@@ -58,6 +58,9 @@ class Container:
 
         self.registry[provided_service, name] = service_spec
 
+        if not logger.is_enabled_for(logging.DEBUG):
+            return
+
         log_context = {
             "service": f"{injectable.__module__}.{injectable.__qualname__}",
         }
@@ -73,6 +76,9 @@ class Container:
     def define(self, service_type: type, instance: Any, *, name: str = None):
         self.cache[service_type, name] = instance
 
+        if not logger.is_enabled_for(logging.DEBUG):
+            return
+
         log_context = {
             "service": f"{service_type.__module__}.{service_type.__qualname__}"
         }
@@ -92,10 +98,11 @@ class Container:
         )
         self.interceptors.append(interceptor)
 
-        logger.debug(
-            "interceptor registered",
-            interceptor=f"{interceptor.__module__}.{interceptor.__qualname__}",
-        )
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                "interceptor registered",
+                interceptor=f"{interceptor.__module__}.{interceptor.__qualname__}",
+            )
 
     def has(self, service_type: type, name: str = None) -> bool:
         definition = self.registry.get(service_type, name=name)
@@ -145,7 +152,8 @@ class Container:
         )
 
         # check if service exists in cache
-        if instance := self._get_from_cache(service_type, service_name):
+        instance = self._get_from_cache(service_type, service_name)
+        if instance is not None:
             return instance
 
         try:
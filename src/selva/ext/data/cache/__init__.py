@@ -0,0 +1,15 @@
+from selva.configuration.settings import Settings
+from selva.di.container import Container
+from selva.ext.data.cache.cached import CachedInterceptor, cached
+from selva.ext.data.cache.store import CacheStore, MemoryCacheStore
+
+from .service import make_service
+
+__all__ = ("cached", "CacheStore", "MemoryCacheStore")
+
+
+def init_extension(container: Container, settings: Settings):
+    for name in settings.data.cache:
+        container.register(make_service(name))
+
+    container.interceptor(CachedInterceptor)
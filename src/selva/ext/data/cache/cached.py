@@ -0,0 +1,309 @@
+import asyncio
+import functools
+import hashlib
+import inspect
+import pickle
+import struct
+import time
+import weakref
+from collections.abc import Awaitable, Callable
+from typing import Annotated, Any, Protocol
+
+from selva.di.container import Container
+from selva.di.inject import Inject
+from selva.logging import get_logger
+
+from .store import CacheStore
+
+__all__ = ("cached", "CachedFunction", "CachedInterceptor")
+
+logger = get_logger(__name__)
+
+# header of cache entries: time until the value is fresh and flags
+_ENTRY_HEADER = struct.Struct("!dB")
+_FLAG_NEGATIVE = 1
+
+
+class Serializer(Protocol):
+    def dumps(self, value: Any) -> bytes:
+        pass
+
+    def loads(self, data: bytes) -> Any:
+        pass
+
+
+KeyBuilder = str | Callable[..., str]
+
+
+class CachedFunction:
+    """Async function whose results are stored in a cache store
+
+    Concurrent calls with the same key share a single call to the wrapped
+    function, so a cache miss on a hot key does not cause a stampede.
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+    def __init__(
+        self,
+        func: Callable[..., Awaitable],
+        ttl: float,
+        *,
+        key: KeyBuilder = None,
+        store: str = "default",
+        negative_ttl: float = None,
+        stale_ttl: float = None,
+        serializer: Serializer = pickle,
+    ):
+        functools.update_wrapper(self, func)
+
+        self.func = func
+        self.ttl = ttl
+        self.key = key
+        self.store_name = store
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self.serializer = serializer
+        self.store: CacheStore | None = None
+
+        self.signature = inspect.signature(func)
+        self.prefix = f"{func.__module__}.{func.__qualname__}"
+
+        self._inflight: dict[tuple[CacheStore, str], asyncio.Task] = {}
+
+        # stores bound to service instances, which can be created by different
+        # containers. Instances that cannot be weakly referenced or hashed are
+        # kept by their id
+        self._instance_stores: weakref.WeakKeyDictionary[object, CacheStore] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._instance_stores_by_id: dict[int, tuple[object, CacheStore]] = {}
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return BoundCachedFunction(self, instance)
+
+    def bind(self, store: CacheStore):
+        """Set the store used by functions not defined in services
+
+        Methods of services use the store bound to each service instance.
+        """
+        self.store = store
+
+    async def __call__(self, *args, **kwargs):
+        return await self.call(self.store, None, args, kwargs)
+
+    async def invalidate(self, *args, **kwargs):
+        """Remove the cached result for the given arguments"""
+        await self.invalidate_for(self.store, None, args, kwargs)
+
+    def store_for(self, instance) -> CacheStore | None:
+        """Store bound to the given service instance"""
+        try:
+            return self._instance_stores.get(instance)
+        except TypeError:
+            _, store = self._instance_stores_by_id.get(id(instance), (None, None))
+            return store
+
+    def bind_instance(self, instance, store: CacheStore):
+        """Set the store used by the method of the given service instance"""
+        try:
+            self._instance_stores[instance] = store
+        except TypeError:
+            self._instance_stores_by_id[id(instance)] = (instance, store)
+
+    async def call(self, store: CacheStore | None, instance, args: tuple, kwargs: dict):
+        if store is None:
+            raise RuntimeError(f"cache store not bound to '{self.prefix}'")
+
+        key = self.make_key(instance, args, kwargs)
+
+        try:
+            entry = await store.get(key)
+        except Exception:
+            logger.exception("failed to read from cache", key=key)
+            return await self._call_func(instance, args, kwargs)
+
+        if entry is not None:
+            fresh_until, negative, value = self._decode(entry)
+
+            if fresh_until < time.time() and (store, key) not in self._inflight:
+                # serve the stale value while it is refreshed in the background
+                task = self._start_load(store, key, instance, args, kwargs)
+                task.add_done_callback(self._log_refresh_error)
+
+            return None if negative else value
+
+        if not (task := self._inflight.get((store, key))):
+            task = self._start_load(store, key, instance, args, kwargs)
+
+        # shield the shared call from the cancellation of a single caller
+        return await asyncio.shield(task)
+
+    async def invalidate_for(
+        self, store: CacheStore | None, instance, args: tuple, kwargs: dict
+    ):
+        if store is None:
+            raise RuntimeError(f"cache store not bound to '{self.prefix}'")
+
+        await store.delete(self.make_key(instance, args, kwargs))
+
+    def make_key(self, instance, args: tuple, kwargs: dict) -> str:
+        if instance is not None:
+            args = (instance, *args)
+
+        bound = self.signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+
+        arguments = dict(bound.arguments)
+        if instance is not None:
+            # remove 'self'
+            del arguments[next(iter(self.signature.parameters))]
+
+        match self.key:
+            case str() as template:
+                return f"{self.prefix}:{template.format(**arguments)}"
+            case key_builder if callable(key_builder):
+                return f"{self.prefix}:{key_builder(**arguments)}"
+
+        for name, value in arguments.items():
+            if type(value).__repr__ is object.__repr__:
+                # the default repr contains the address of the object, so the
+                # key would be different on every call
+                raise TypeError(
+                    f"argument '{name}' of '{self.prefix}' cannot be used in the"
+                    " default cache key, use 'key' to build it"
+                )
+
+        digest = hashlib.sha1(
+            repr(sorted(arguments.items())).encode(), usedforsecurity=False
+        )
+        return f"{self.prefix}:{digest.hexdigest()}"
+
+    def _start_load(
+        self, store: CacheStore, key: str, instance, args: tuple, kwargs: dict
+    ) -> asyncio.Task:
+        task = asyncio.create_task(self._load(store, key, instance, args, kwargs))
+        self._inflight[store, key] = task
+        task.add_done_callback(lambda _: self._inflight.pop((store, key), None))
+        return task
+
+    def _log_refresh_error(self, task: asyncio.Task):
+        if not task.cancelled() and (error := task.exception()):
+            logger.error(
+                "failed to refresh cached value", function=self.prefix, exc_info=error
+            )
+
+    async def _load(
+        self, store: CacheStore, key: str, instance, args: tuple, kwargs: dict
+    ):
+        value = await self._call_func(instance, args, kwargs)
+
+        if value is None and self.negative_ttl is None:
+            return value
+
+        if value is None:
+            fresh_ttl, store_ttl = self.negative_ttl, self.negative_ttl
+            entry = _ENTRY_HEADER.pack(time.time() + fresh_ttl, _FLAG_NEGATIVE)
+        else:
+            fresh_ttl = self.ttl
+            store_ttl = self.ttl + (self.stale_ttl or 0)
+            entry = _ENTRY_HEADER.pack(
+                time.time() + fresh_ttl, 0
+            ) + self.serializer.dumps(value)
+
+        try:
+            await store.set(key, entry, store_ttl)
+        except Exception:
+            logger.exception("failed to write to cache", key=key)
+
+        return value
+
+    async def _call_func(self, instance, args: tuple, kwargs: dict):
+        if instance is not None:
+            return await self.func(instance, *args, **kwargs)
+        return await self.func(*args, **kwargs)
+
+    def _decode(self, entry: bytes) -> tuple[float, bool, Any]:
+        fresh_until, flags = _ENTRY_HEADER.unpack_from(entry)
+        if flags & _FLAG_NEGATIVE:
+            return fresh_until, True, None
+
+        value = self.serializer.loads(entry[_ENTRY_HEADER.size :])
+        return fresh_until, False, value
+
+
+class BoundCachedFunction:
+    def __init__(self, cached_function: CachedFunction, instance):
+        self.cached_function = cached_function
+        self.instance = instance
+
+    async def __call__(self, *args, **kwargs):
+        store = self.cached_function.store_for(self.instance)
+        return await self.cached_function.call(store, self.instance, args, kwargs)
+
+    async def invalidate(self, *args, **kwargs):
+        """Remove the cached result for the given arguments"""
+        store = self.cached_function.store_for(self.instance)
+        await self.cached_function.invalidate_for(store, self.instance, args, kwargs)
+
+
+# pylint: disable=too-many-arguments
+def cached(
+    ttl: float,
+    *,
+    key: KeyBuilder = None,
+    store: str = "default",
+    negative_ttl: float = None,
+    stale_ttl: float = None,
+    serializer: Serializer = pickle,
+):
+    """Cache the results of the decorated async function or service method
+
+    :param ttl: Time, in seconds, a result is fresh
+    :param key: Format string or callable receiving the function arguments used
+    to build the cache key. If not given, the key is a hash of the arguments
+    :param store: Name of the cache store
+    :param negative_ttl: Time, in seconds, a None result is cached. If not given,
+    None results are not cached
+    :param stale_ttl: Time, in seconds, a result is served after it is no longer
+    fresh while a new result is computed in the background
+    :param serializer: Object with 'dumps' and 'loads' functions used to convert
+    results to and from bytes
+    """
+
+    assert ttl > 0
+
+    def inner(func: Callable[..., Awaitable]) -> CachedFunction:
+        if not inspect.iscoroutinefunction(func):
+            raise TypeError("cached function must be async")
+
+        return CachedFunction(
+            func,
+            ttl,
+            key=key,
+            store=store,
+            negative_ttl=negative_ttl,
+            stale_ttl=stale_ttl,
+            serializer=serializer,
+        )
+
+    return inner
+
+
+class CachedInterceptor:
+    """Bind the cache stores of cached methods of services when they are created"""
+
+    di: Annotated[Container, Inject]
+
+    async def intercept(self, instance: object, service_type: type):
+        for cls in type(instance).__mro__:
+            for attribute in vars(cls).values():
+                if isinstance(attribute, CachedFunction):
+                    name = attribute.store_name
+                    attribute.bind_instance(
+                        instance,
+                        await self.di.get(
+                            CacheStore, name=name if name != "default" else None
+                        ),
+                    )
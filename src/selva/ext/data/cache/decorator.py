@@ -0,0 +1,32 @@
+from collections.abc import Callable, Iterable
+from typing import NamedTuple
+
+__all__ = ("cache_response", "CacheResponseInfo", "ATTRIBUTE_CACHE_RESPONSE")
+
+ATTRIBUTE_CACHE_RESPONSE = "__selva_cache_response__"
+
+
+class CacheResponseInfo(NamedTuple):
+    ttl: float
+    vary: tuple[str, ...]
+
+
+def cache_response(ttl: float, *, vary: Iterable[str] = ()):
+    """Cache responses of the decorated handler for `ttl` seconds
+
+    :param ttl: Time, in seconds, the response will be cached
+    :param vary: Request headers whose values produce distinct cached responses,
+    in addition to the ones in the response 'vary' header
+    """
+
+    assert ttl > 0
+
+    def inner(handler: Callable):
+        setattr(
+            handler,
+            ATTRIBUTE_CACHE_RESPONSE,
+            CacheResponseInfo(ttl, tuple(name.lower() for name in vary)),
+        )
+        return handler
+
+    return inner
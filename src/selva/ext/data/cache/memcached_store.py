@@ -0,0 +1,53 @@
+import hashlib
+import math
+import re
+
+from aiomcache import Client
+
+__all__ = ("MemcachedCacheStore",)
+
+MAX_KEY_LENGTH = 250
+
+# memcached keys cannot contain whitespace or control characters
+RE_INVALID_KEY_CHARS = re.compile(rb"[\x00-\x20\x7f]")
+
+# expiration times greater than 30 days are treated as unix timestamps
+MAX_RELATIVE_EXPTIME = 60 * 60 * 24 * 30
+
+
+class MemcachedCacheStore:
+    """Cache store backed by Memcached
+
+    Keys that are not valid memcached keys are replaced by their sha256 digest.
+
+    :param client: The Memcached client
+    :param prefix: Prefix added to every key
+    """
+
+    def __init__(self, client: Client, prefix: str = ""):
+        self.client = client
+        self.prefix = prefix
+
+    def make_key(self, key: str) -> bytes:
+        result = (self.prefix + key).encode()
+        if len(result) > MAX_KEY_LENGTH or RE_INVALID_KEY_CHARS.search(result):
+            digest = hashlib.sha256(result).hexdigest()
+            result = (self.prefix + digest).encode()
+
+        return result
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.client.get(self.make_key(key))
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None):
+        if ttl is None:
+            exptime = 0
+        elif ttl <= MAX_RELATIVE_EXPTIME:
+            exptime = max(math.ceil(ttl), 1)
+        else:
+            exptime = MAX_RELATIVE_EXPTIME
+
+        await self.client.set(self.make_key(key), value, exptime=exptime)
+
+    async def delete(self, key: str):
+        await self.client.delete(self.make_key(key))
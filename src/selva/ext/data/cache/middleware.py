@@ -0,0 +1,273 @@
+import hashlib
+import time
+from collections.abc import Callable
+from http import HTTPMethod, HTTPStatus
+from urllib.parse import parse_qsl, urlencode
+
+from pydantic import BaseModel, ConfigDict
+
+from selva.configuration.settings import Settings
+from selva.di.container import Container
+from selva.logging import get_logger
+from selva.web.routing.router import Router
+
+from .decorator import ATTRIBUTE_CACHE_RESPONSE, CacheResponseInfo
+from .store import CacheStore
+
+__all__ = ("ResponseCacheMiddleware", "response_cache_middleware")
+
+logger = get_logger(__name__)
+
+
+class ResponseCacheSettings(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    store: str = "default"
+    prefix: str = "response:"
+    max_size: int = 1024 * 1024
+
+
+def parse_cache_control(value: bytes) -> dict[str, str | None]:
+    result = {}
+    for directive in value.decode("latin-1").split(","):
+        name, _, argument = directive.strip().partition("=")
+        if name:
+            result[name.lower()] = argument.strip('"') if argument else None
+    return result
+
+
+def encode_entry(
+    status: int, headers: list[tuple[bytes, bytes]], body: bytes, created: float
+) -> bytes:
+    """Encode a response in a format that can be sent without serialization work
+
+    The format resembles an HTTP/1.1 response: a line with status and creation time,
+    one line for each header, an empty line and the body.
+    """
+
+    lines = [b"%d %d" % (status, created)]
+    lines.extend(name + b": " + value for name, value in headers)
+    return b"\r\n".join(lines) + b"\r\n\r\n" + body
+
+
+def decode_entry(data: bytes) -> tuple[int, float, list[tuple[bytes, bytes]], bytes]:
+    head, _, body = data.partition(b"\r\n\r\n")
+    status_line, *header_lines = head.split(b"\r\n")
+    status, created = status_line.split(b" ")
+
+    headers = []
+    for line in header_lines:
+        name, _, value = line.partition(b": ")
+        headers.append((name, value))
+
+    return int(status), float(created), headers, body
+
+
+class ResponseRecorder:
+    """Wraps the asgi 'send' callable to record the response while it is sent"""
+
+    def __init__(self, send, max_size: int):
+        self.send = send
+        self.max_size = max_size
+        self.status: int | None = None
+        self.headers: list[tuple[bytes, bytes]] = []
+        self.body = bytearray()
+        self.complete = False
+        self.recording = True
+
+    async def __call__(self, message: dict):
+        match message["type"]:
+            case "http.response.start":
+                self.status = message["status"]
+                self.headers = list(message.get("headers", []))
+            case "http.response.body" if self.recording:
+                self.body.extend(message.get("body", b""))
+                if len(self.body) > self.max_size:
+                    self.recording = False
+                    self.body.clear()
+                elif not message.get("more_body", False):
+                    self.complete = True
+            case _:
+                self.recording = False
+
+        await self.send(message)
+
+
+class ResponseCacheMiddleware:
+    """Serve responses of handlers decorated with `cache_response` from a cache
+
+    Responses are cached by method, path, normalized query and the values of the
+    request headers listed in the response 'vary' header. The list of 'vary'
+    headers is stored alongside the responses, so lookups need two cache reads.
+    """
+
+    def __init__(
+        self,
+        app: Callable,
+        store: CacheStore,
+        router: Router,
+        settings: ResponseCacheSettings,
+    ):
+        self.app = app
+        self.store = store
+        self.router = router
+        self.prefix = settings.prefix
+        self.max_size = settings.max_size
+
+        self.enabled = any(
+            hasattr(route.action, ATTRIBUTE_CACHE_RESPONSE)
+            for route in router.routes.values()
+        )
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        info = self._get_cache_info(scope)
+        if not info:
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = {}
+        for name, value in scope["headers"]:
+            name = name.lower()
+            if name in request_headers:
+                request_headers[name] += b", " + value
+            else:
+                request_headers[name] = value
+
+        # responses to authenticated requests should not be shared
+        if b"authorization" in request_headers:
+            await self.app(scope, receive, send)
+            return
+
+        cache_control = parse_cache_control(request_headers.get(b"cache-control", b""))
+        if "no-store" in cache_control:
+            await self.app(scope, receive, send)
+            return
+
+        key = self._make_key(scope)
+
+        if "no-cache" not in cache_control:
+            try:
+                entry = await self._lookup(key, request_headers)
+            except Exception:
+                logger.exception("failed to read response from cache", key=key)
+                entry = None
+
+            if entry:
+                await self._send_entry(entry, send)
+                return
+
+        recorder = ResponseRecorder(send, self.max_size)
+        await self.app(scope, receive, recorder)
+
+        if recorder.complete:
+            await self._store(key, info, request_headers, recorder)
+
+    def _get_cache_info(self, scope) -> CacheResponseInfo | None:
+        if match := self.router.match(HTTPMethod.GET, scope["path"]):
+            return getattr(match.route.action, ATTRIBUTE_CACHE_RESPONSE, None)
+        return None
+
+    def _make_key(self, scope) -> str:
+        query = parse_qsl(
+            scope["query_string"].decode("latin-1"), keep_blank_values=True
+        )
+        return f"{self.prefix}{scope['path']}?{urlencode(sorted(query))}"
+
+    @staticmethod
+    def _make_variant_key(
+        key: str, vary: list[bytes], request_headers: dict[bytes, bytes]
+    ) -> str:
+        digest = hashlib.sha1(usedforsecurity=False)
+        for name in vary:
+            digest.update(name + b"=" + request_headers.get(name, b"") + b"\n")
+        return f"{key}#{digest.hexdigest()}"
+
+    async def _lookup(
+        self, key: str, request_headers: dict[bytes, bytes]
+    ) -> bytes | None:
+        vary = await self.store.get(key)
+        if vary is None:
+            return None
+
+        vary_names = vary.split(b",") if vary else []
+        variant_key = self._make_variant_key(key, vary_names, request_headers)
+        return await self.store.get(variant_key)
+
+    async def _send_entry(self, entry: bytes, send):
+        status, created, headers, body = decode_entry(entry)
+        age = max(int(time.time() - created), 0)
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": headers + [(b"age", b"%d" % age)],
+            }
+        )
+        await send({"type": "http.response.body", "body": body, "more_body": False})
+
+    async def _store(
+        self,
+        key: str,
+        info: CacheResponseInfo,
+        request_headers: dict[bytes, bytes],
+        recorder: ResponseRecorder,
+    ):
+        if recorder.status != HTTPStatus.OK:
+            return
+
+        ttl = info.ttl
+        vary = {name.encode("latin-1") for name in info.vary}
+
+        for name, value in recorder.headers:
+            match name.lower():
+                case b"set-cookie":
+                    return
+                case b"cache-control":
+                    cache_control = parse_cache_control(value)
+                    if {"no-store", "no-cache", "private"} & cache_control.keys():
+                        return
+
+                    max_age = cache_control.get("s-maxage") or cache_control.get(
+                        "max-age"
+                    )
+                    if max_age and max_age.isdigit():
+                        ttl = min(ttl, int(max_age))
+                case b"vary":
+                    for item in value.lower().split(b","):
+                        if (item := item.strip()) == b"*":
+                            return
+                        vary.add(item)
+
+        if ttl <= 0:
+            return
+
+        vary_names = sorted(vary)
+        variant_key = self._make_variant_key(key, vary_names, request_headers)
+        entry = encode_entry(
+            recorder.status, recorder.headers, bytes(recorder.body), time.time()
+        )
+
+        try:
+            await self.store.set(key, b",".join(vary_names), ttl)
+            await self.store.set(variant_key, entry, ttl)
+        except Exception:
+            logger.exception("failed to store response in cache", key=key)
+
+
+async def response_cache_middleware(app, settings: Settings, di: Container):
+    cache_settings = ResponseCacheSettings.model_validate(
+        dict(settings.get("response_cache", {}))
+    )
+
+    store_name = cache_settings.store
+    store = await di.get(
+        CacheStore, name=store_name if store_name != "default" else None
+    )
+    router = await di.get(Router)
+
+    return ResponseCacheMiddleware(app, store, router, cache_settings)
@@ -0,0 +1,27 @@
+from redis.asyncio import Redis
+
+__all__ = ("RedisCacheStore",)
+
+
+class RedisCacheStore:
+    """Cache store backed by Redis
+
+    :param redis: The Redis client
+    :param prefix: Prefix added to every key
+    """
+
+    def __init__(self, redis: Redis, prefix: str = ""):
+        self.redis = redis
+        self.prefix = prefix
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.redis.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None):
+        if ttl is not None:
+            await self.redis.set(self.prefix + key, value, px=max(int(ttl * 1000), 1))
+        else:
+            await self.redis.set(self.prefix + key, value)
+
+    async def delete(self, key: str):
+        await self.redis.delete(self.prefix + key)
@@ -0,0 +1,61 @@
+from selva.configuration.settings import Settings
+from selva.di.container import Container
+from selva.di.decorator import service
+
+from .settings import CacheSettings
+from .store import CacheStore, MemoryCacheStore
+
+
+def make_service(name: str):
+    @service(name=name if name != "default" else None)
+    async def cache_store_service(settings: Settings, di: Container) -> CacheStore:
+        # pylint: disable=import-outside-toplevel
+        cache_settings = CacheSettings.model_validate(dict(settings.data.cache[name]))
+
+        connection = cache_settings.connection
+        connection_name = connection if connection != "default" else None
+
+        match cache_settings.backend:
+            case "redis":
+                from redis.asyncio import Redis
+
+                from .redis_store import RedisCacheStore
+
+                redis = await di.get(Redis, name=connection_name)
+                yield RedisCacheStore(redis, cache_settings.prefix)
+            case "memcached":
+                from aiomcache import Client
+
+                from .memcached_store import MemcachedCacheStore
+
+                client = await di.get(Client, name=connection_name)
+                yield MemcachedCacheStore(client, cache_settings.prefix)
+            case "tiered":
+                from .tiered_store import TieredCacheStore
+
+                store_name = cache_settings.store
+                remote = await di.get(
+                    CacheStore, name=store_name if store_name != "default" else None
+                )
+
+                redis = None
+                if connection:
+                    from redis.asyncio import Redis
+
+                    redis = await di.get(Redis, name=connection_name)
+
+                store = TieredCacheStore(
+                    MemoryCacheStore(cache_settings.max_size),
+                    remote,
+                    redis,
+                    channel=cache_settings.channel,
+                    local_ttl=cache_settings.local_ttl,
+                )
+
+                await store.start()
+                yield store
+                await store.stop()
+            case _:
+                yield MemoryCacheStore(cache_settings.max_size)
+
+    return cache_store_service
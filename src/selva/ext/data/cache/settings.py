@@ -0,0 +1,30 @@
+from typing import Literal, Self
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+class CacheSettings(BaseModel):
+    """Settings for a cache store defined in a settings file."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    backend: Literal["memory", "redis", "memcached", "tiered"] = "memory"
+    connection: str = None
+    prefix: str = ""
+    max_size: int = 1024
+    store: str = None
+    channel: str = "selva:cache:invalidate"
+    local_ttl: float = Field(60, gt=0)
+
+    @model_validator(mode="after")
+    def verify_connection(self) -> Self:
+        if self.backend == "memory" and self.connection:
+            raise ValueError("'connection' cannot be used with 'memory' backend")
+
+        if self.backend == "tiered" and not self.store:
+            raise ValueError("'store' is required with 'tiered' backend")
+
+        if self.backend != "tiered" and self.store:
+            raise ValueError("'store' can only be used with 'tiered' backend")
+
+        return self
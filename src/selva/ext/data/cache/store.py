@@ -0,0 +1,77 @@
+import time
+from collections import OrderedDict
+from typing import Protocol, runtime_checkable
+
+__all__ = ("CacheStore", "MemoryCacheStore")
+
+
+@runtime_checkable
+class CacheStore(Protocol):
+    """Key-value store for cached data
+
+    Values are stored as bytes, so the store does not need to know how cached
+    data is serialized.
+    """
+
+    async def get(self, key: str) -> bytes | None:
+        """Get the value of `key`, or None if it is not cached or has expired"""
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None):
+        """Store `value` under `key`, expiring after `ttl` seconds if given"""
+
+    async def delete(self, key: str):
+        """Remove `key` from the store"""
+
+
+class MemoryCacheStore:
+    """In-process cache store that evicts the least recently used entries
+
+    :param max_size: Maximum number of entries kept in the store
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._data: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get_nowait(key) is not None
+
+    def get_nowait(self, key: str) -> bytes | None:
+        try:
+            value, expires_at = self._data[key]
+        except KeyError:
+            return None
+
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set_nowait(self, key: str, value: bytes, ttl: float | None = None):
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete_nowait(self, key: str):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    async def get(self, key: str) -> bytes | None:
+        return self.get_nowait(key)
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None):
+        self.set_nowait(key, value, ttl)
+
+    async def delete(self, key: str):
+        self.delete_nowait(key)
@@ -0,0 +1,146 @@
+import asyncio
+import uuid
+from typing import TYPE_CHECKING
+
+from selva.logging import get_logger
+
+from .store import CacheStore, MemoryCacheStore
+
+__all__ = ("TieredCacheStore",)
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+logger = get_logger(__name__)
+
+
+class TieredCacheStore:
+    """Cache store that keeps recently used entries in memory over a remote store
+
+    Writes and deletions are published to a Redis channel, so other workers drop
+    their local copy of the entry. While the subscription to the channel is not
+    active, the local cache is bypassed, so workers never serve entries they
+    could have missed invalidations for.
+
+    :param local: The in-process store
+    :param remote: The shared store
+    :param redis: Redis client used to broadcast invalidations. If not given,
+    entries are only invalidated in the current worker
+    :param channel: Name of the channel invalidations are published to
+    :param local_ttl: Maximum time, in seconds, entries are kept in memory. Entries
+    that expire in the remote store are not invalidated, so it bounds how long a
+    worker may serve them after they expired
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        local: MemoryCacheStore,
+        remote: CacheStore,
+        redis: "Redis" = None,
+        *,
+        channel: str = "selva:cache:invalidate",
+        local_ttl: float = 60,
+    ):
+        if local_ttl is None or local_ttl <= 0:
+            raise ValueError("'local_ttl' must be a positive number")
+
+        self.local = local
+        self.remote = remote
+        self.redis = redis
+        self.channel = channel
+        self.local_ttl = local_ttl
+
+        self.worker_id = uuid.uuid4().hex.encode()
+        self.listening = redis is None
+
+        # incremented on every invalidation, so values read from the remote store
+        # while an invalidation arrives are not kept in memory
+        self._generation = 0
+        self._listener: asyncio.Task | None = None
+
+    async def get(self, key: str) -> bytes | None:
+        if self.listening and (value := self.local.get_nowait(key)) is not None:
+            return value
+
+        generation = self._generation
+        value = await self.remote.get(key)
+
+        if value is not None and self.listening and generation == self._generation:
+            self.local.set_nowait(key, value, self.local_ttl)
+
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None):
+        # reads in progress must not keep the previous value locally, as this
+        # worker ignores its own invalidations
+        self._generation += 1
+        await self.remote.set(key, value, ttl)
+        await self._publish(key)
+
+        if self.listening:
+            self.local.set_nowait(key, value, self._local_ttl(ttl))
+
+    async def delete(self, key: str):
+        self._generation += 1
+        self.local.delete_nowait(key)
+        await self.remote.delete(key)
+        await self._publish(key)
+
+    def invalidate(self, message: bytes | str):
+        """Handle an invalidation message published by a worker"""
+
+        if isinstance(message, str):
+            message = message.encode()
+
+        sender, _, key = message.partition(b":")
+        if sender == self.worker_id:
+            return
+
+        self._generation += 1
+        self.local.delete_nowait(key.decode())
+
+    async def start(self):
+        if self.redis is not None and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    def _local_ttl(self, ttl: float | None) -> float:
+        if ttl is None:
+            return self.local_ttl
+        return min(ttl, self.local_ttl)
+
+    async def _publish(self, key: str):
+        if self.redis is not None:
+            await self.redis.publish(self.channel, self.worker_id + b":" + key.encode())
+
+    async def _listen(self):
+        delay = 0.1
+
+        while True:
+            try:
+                async with self.redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    self.listening = True
+                    delay = 0.1
+
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.invalidate(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("cache invalidation subscription failed")
+
+            # invalidations may have been missed while disconnected
+            self.listening = False
+            self._generation += 1
+            self.local.clear()
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 5)
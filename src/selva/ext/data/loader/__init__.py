@@ -0,0 +1,3 @@
+from selva.ext.data.loader.loader import BatchLoader, loader_scope
+
+__all__ = ("BatchLoader", "loader_scope")
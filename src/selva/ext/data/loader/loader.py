@@ -0,0 +1,161 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import Hashable, Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Generic, TypeVar
+
+__all__ = ("BatchLoader", "loader_scope")
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class _LoaderState:
+    def __init__(self, memoize: bool):
+        self.memoize = memoize
+        self.memo: dict = {}
+        self.queue: list[tuple] = []
+        self.scheduled = False
+
+
+# references to running batches, so they are not garbage collected
+_batch_tasks: set[asyncio.Task] = set()
+
+_scope: ContextVar[dict["BatchLoader", _LoaderState] | None] = ContextVar(
+    "selva_batch_loader_scope", default=None
+)
+
+
+@contextmanager
+def loader_scope() -> Iterator[None]:
+    """Scope in which batch loaders memoize loaded values
+
+    Each request gets its own scope when 'batch_loader_middleware' is used.
+    """
+
+    token = _scope.set({})
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+class BatchLoader(ABC, Generic[K, V]):
+    """Load values in batches, grouping the keys requested in the same iteration
+    of the event loop into a single call to `load_many`
+
+    Within a `loader_scope`, loaded values are memoized, so each key is loaded
+    at most once per scope. Outside a scope, only concurrent loads are grouped.
+
+    Subclasses implement `load_many` and can be declared as services.
+    """
+
+    max_batch_size: int | None = None
+
+    _unscoped_state: _LoaderState | None = None
+
+    @abstractmethod
+    async def load_many(self, keys: list[K]) -> Sequence[V] | Mapping[K, V]:
+        """Load the values of the given keys
+
+        :return: A sequence of values in the same order as `keys`, or a mapping
+        of keys to values, where missing keys are loaded as None. Values that are
+        exceptions are raised to the callers that requested their keys.
+        """
+
+    async def load(self, key: K) -> V:
+        state = self._get_state()
+
+        if (future := state.memo.get(key)) is None:
+            future = asyncio.get_running_loop().create_future()
+            state.memo[key] = future
+            state.queue.append((key, future))
+
+            if not state.scheduled:
+                state.scheduled = True
+                asyncio.get_running_loop().call_soon(self._dispatch, state)
+
+        # shield the shared result from the cancellation of a single caller
+        return await asyncio.shield(future)
+
+    async def load_all(self, keys: Iterable[K]) -> list[V]:
+        return list(await asyncio.gather(*[self.load(key) for key in keys]))
+
+    def prime(self, key: K, value: V):
+        """Add a value to the memoized values of the current scope"""
+
+        state = self._get_state()
+        if state.memoize and key not in state.memo:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            state.memo[key] = future
+
+    def clear(self, key: K):
+        """Remove a value from the memoized values of the current scope"""
+        self._get_state().memo.pop(key, None)
+
+    def clear_all(self):
+        """Remove all memoized values of the current scope"""
+        self._get_state().memo.clear()
+
+    def _get_state(self) -> _LoaderState:
+        scope = _scope.get()
+        if scope is None:
+            if self._unscoped_state is None:
+                self._unscoped_state = _LoaderState(memoize=False)
+            return self._unscoped_state
+
+        if (state := scope.get(self)) is None:
+            state = scope[self] = _LoaderState(memoize=True)
+
+        return state
+
+    def _dispatch(self, state: _LoaderState):
+        queue, state.queue = state.queue, []
+        state.scheduled = False
+
+        if not state.memoize:
+            # outside a scope values are only shared by concurrent loads
+            for key, _ in queue:
+                state.memo.pop(key, None)
+
+        size = self.max_batch_size or len(queue)
+        for i in range(0, len(queue), size):
+            batch = queue[i : i + size]
+            task = asyncio.create_task(self._load_batch(state, batch))
+            _batch_tasks.add(task)
+            task.add_done_callback(_batch_tasks.discard)
+
+    async def _load_batch(self, state: _LoaderState, batch: list[tuple]):
+        keys = [key for key, _ in batch]
+
+        try:
+            values = await self.load_many(keys)
+
+            if isinstance(values, Mapping):
+                values = [values.get(key) for key in keys]
+            elif len(values) != len(keys):
+                raise ValueError(
+                    f"{type(self).__qualname__}.load_many returned {len(values)}"
+                    f" values for {len(keys)} keys"
+                )
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            for key, future in batch:
+                # failed loads are not memoized, so they can be retried
+                if state.memo.get(key) is future:
+                    del state.memo[key]
+                if not future.done():
+                    future.set_exception(err)
+            return
+
+        for (key, future), value in zip(batch, values):
+            if future.done():
+                continue
+
+            if isinstance(value, Exception):
+                if state.memo.get(key) is future:
+                    del state.memo[key]
+                future.set_exception(value)
+            else:
+                future.set_result(value)
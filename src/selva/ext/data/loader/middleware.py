@@ -0,0 +1,18 @@
+from selva.configuration.settings import Settings
+from selva.di.container import Container
+
+from .loader import loader_scope
+
+__all__ = ("batch_loader_middleware",)
+
+
+def batch_loader_middleware(app, settings: Settings, di: Container):
+    async def handler(scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await app(scope, receive, send)
+            return
+
+        with loader_scope():
+            await app(scope, receive, send)
+
+    return handler
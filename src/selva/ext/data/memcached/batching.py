@@ -0,0 +1,124 @@
+import asyncio
+import functools
+import inspect
+
+from aiomcache import Client
+
+__all__ = ("BatchingClient",)
+
+
+class BatchingClient:
+    """Memcached client that coalesces concurrent `get` calls into `multi_get`
+
+    Keys requested in the same iteration of the event loop, or within `window`
+    seconds, are fetched with a single `multi_get`, split in chunks of at most
+    `max_keys` keys. Every operation fails with `TimeoutError` if it takes more
+    than `timeout` seconds. With `coalesce` disabled, `get` calls are sent as they
+    are issued and only large `multi_get` calls are split.
+
+    Other methods are delegated to the wrapped client.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        *,
+        max_keys: int = 100,
+        window: float = 0,
+        timeout: float = None,
+        coalesce: bool = True,
+    ):
+        self.client = client
+        self.max_keys = max_keys
+        self.window = window
+        self.timeout = timeout
+        self.coalesce = coalesce
+
+        self._batch: list[tuple[bytes, asyncio.Future]] = []
+        self._flush_handle: asyncio.Handle | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.client, name)
+        if self.timeout is None or not inspect.iscoroutinefunction(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def inner(*args, **kwargs):
+            async with asyncio.timeout(self.timeout):
+                return await attribute(*args, **kwargs)
+
+        return inner
+
+    async def get(self, key: bytes, default=None):
+        if not self.coalesce:
+            async with asyncio.timeout(self.timeout):
+                return await self.client.get(key, default)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._batch.append((key, future))
+
+        if len(self._batch) >= self.max_keys:
+            self._flush()
+        elif self._flush_handle is None:
+            if self.window > 0:
+                self._flush_handle = loop.call_later(self.window, self._flush)
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
+
+        value = await future
+        return value if value is not None else default
+
+    async def multi_get(self, *keys: bytes) -> tuple:
+        if len(keys) <= self.max_keys:
+            return await self._multi_get(keys)
+
+        chunks = [
+            keys[i : i + self.max_keys] for i in range(0, len(keys), self.max_keys)
+        ]
+        results = await asyncio.gather(*[self._multi_get(chunk) for chunk in chunks])
+        return tuple(value for result in results for value in result)
+
+    async def close(self):
+        self._flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+        await self.client.close()
+
+    async def _multi_get(self, keys: tuple[bytes, ...]) -> tuple:
+        async with asyncio.timeout(self.timeout):
+            return await self.client.multi_get(*keys)
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._execute_batch(batch))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _execute_batch(self, batch: list[tuple[bytes, asyncio.Future]]):
+        keys = tuple(dict.fromkeys(key for key, _ in batch))
+
+        try:
+            if len(keys) == 1:
+                async with asyncio.timeout(self.timeout):
+                    values = {keys[0]: await self.client.get(keys[0])}
+            else:
+                values = dict(zip(keys, await self.multi_get(*keys)))
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(err)
+            return
+
+        for key, future in batch:
+            if not future.done():
+                future.set_result(values.get(key))
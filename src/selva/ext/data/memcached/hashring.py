@@ -0,0 +1,148 @@
+import asyncio
+import bisect
+import hashlib
+from collections.abc import Sequence
+
+from aiomcache import Client
+
+__all__ = ("HashRing", "HashRingClient")
+
+
+class HashRing:
+    """Ketama consistent hash ring
+
+    Each node is placed on the ring at `points_per_node * weight` positions, so
+    adding or removing a node only remaps the keys of that node.
+    """
+
+    def __init__(
+        self,
+        nodes: Sequence[str],
+        weights: Sequence[int] = None,
+        points_per_node: int = 160,
+    ):
+        if not nodes:
+            raise ValueError("hash ring must have at least one node")
+
+        weights = weights or [1] * len(nodes)
+
+        points = []
+        for node, weight in zip(nodes, weights):
+            # each md5 digest gives 4 points
+            for i in range(points_per_node * weight // 4):
+                digest = hashlib.md5(f"{node}-{i}".encode(), usedforsecurity=False)
+                digest = digest.digest()
+                for j in range(4):
+                    point = int.from_bytes(digest[j * 4 : j * 4 + 4], "little")
+                    points.append((point, node))
+
+        points.sort()
+        self._points = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def get_node(self, key: bytes) -> str:
+        digest = hashlib.md5(key, usedforsecurity=False).digest()
+        point = int.from_bytes(digest[:4], "little")
+
+        index = bisect.bisect(self._points, point)
+        if index == len(self._points):
+            index = 0
+
+        return self._nodes[index]
+
+
+class HashRingClient:
+    """Memcached client that distributes keys across several servers
+
+    Keys are mapped to servers with a consistent hash ring and `multi_get`
+    fetches the keys of each server concurrently.
+
+    :param clients: Mapping of node name to the client connected to it
+    :param weights: Weight of each node in the ring
+    """
+
+    def __init__(self, clients: dict[str, Client], weights: dict[str, int] = None):
+        self.clients = clients
+        self.ring = HashRing(
+            list(clients.keys()),
+            [weights.get(node, 1) for node in clients] if weights else None,
+        )
+
+    def get_client(self, key: bytes) -> Client:
+        return self.clients[self.ring.get_node(key)]
+
+    async def get(self, key: bytes, default=None):
+        return await self.get_client(key).get(key, default)
+
+    async def gets(self, key: bytes, default: bytes = None):
+        return await self.get_client(key).gets(key, default)
+
+    async def multi_get(self, *keys: bytes) -> tuple:
+        groups: dict[str, list[bytes]] = {}
+        for key in keys:
+            groups.setdefault(self.ring.get_node(key), []).append(key)
+
+        if len(groups) == 1:
+            node, node_keys = next(iter(groups.items()))
+            return await self.clients[node].multi_get(*node_keys)
+
+        results = await asyncio.gather(
+            *[
+                self.clients[node].multi_get(*node_keys)
+                for node, node_keys in groups.items()
+            ]
+        )
+
+        values = {}
+        for node_keys, node_values in zip(groups.values(), results):
+            values.update(zip(node_keys, node_values))
+
+        return tuple(values[key] for key in keys)
+
+    async def set(self, key: bytes, value, exptime: int = 0) -> bool:
+        return await self.get_client(key).set(key, value, exptime)
+
+    async def cas(self, key: bytes, value, cas_token: int, exptime: int = 0) -> bool:
+        return await self.get_client(key).cas(key, value, cas_token, exptime)
+
+    async def add(self, key: bytes, value, exptime: int = 0) -> bool:
+        return await self.get_client(key).add(key, value, exptime)
+
+    async def replace(self, key: bytes, value, exptime: int = 0) -> bool:
+        return await self.get_client(key).replace(key, value, exptime)
+
+    async def append(self, key: bytes, value, exptime: int = 0) -> bool:
+        return await self.get_client(key).append(key, value, exptime)
+
+    async def prepend(self, key: bytes, value: bytes, exptime: int = 0) -> bool:
+        return await self.get_client(key).prepend(key, value, exptime)
+
+    async def delete(self, key: bytes) -> bool:
+        return await self.get_client(key).delete(key)
+
+    async def incr(self, key: bytes, increment: int = 1) -> int | None:
+        return await self.get_client(key).incr(key, increment)
+
+    async def decr(self, key: bytes, decrement: int = 1) -> int | None:
+        return await self.get_client(key).decr(key, decrement)
+
+    async def touch(self, key: bytes, exptime: int) -> bool:
+        return await self.get_client(key).touch(key, exptime)
+
+    async def stats(self, args: bytes = None) -> dict[str, dict]:
+        results = await asyncio.gather(
+            *[client.stats(args) for client in self.clients.values()]
+        )
+        return dict(zip(self.clients.keys(), results))
+
+    async def version(self) -> dict[str, bytes]:
+        results = await asyncio.gather(
+            *[client.version() for client in self.clients.values()]
+        )
+        return dict(zip(self.clients.keys(), results))
+
+    async def flush_all(self):
+        await asyncio.gather(*[client.flush_all() for client in self.clients.values()])
+
+    async def close(self):
+        await asyncio.gather(*[client.close() for client in self.clients.values()])
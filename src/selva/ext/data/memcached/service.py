@@ -3,7 +3,9 @@ from aiomcache import Client, FlagClient
 from selva.configuration.settings import Settings
 from selva.di.decorator import service
 
-from .settings import MemcachedSettings
+from .batching import BatchingClient
+from .hashring import HashRingClient
+from .settings import MemcachedNodeSettings, MemcachedSettings
 
 
 def parse_memcached_address(address: str) -> tuple[str, int]:
@@ -15,6 +17,27 @@ def parse_memcached_address(address: str) -> tuple[str, int]:
             return host, port
 
 
+def make_hash_ring_client(
+    nodes: list[str | MemcachedNodeSettings], options: dict
+) -> HashRingClient:
+    clients = {}
+    weights = {}
+
+    for node in nodes:
+        if isinstance(node, str):
+            node = MemcachedNodeSettings(address=node)
+
+        host, port = parse_memcached_address(node.address)
+        node_options = options | node.model_dump(
+            include={"pool_size", "pool_minsize"}, exclude_none=True
+        )
+
+        clients[f"{host}:{port}"] = FlagClient(host, port, **node_options)
+        weights[f"{host}:{port}"] = node.weight
+
+    return HashRingClient(clients, weights)
+
+
 def make_service(name: str):
     @service(name=name if name != "default" else None)
     async def memcached_service(settings: Settings) -> Client:
@@ -27,8 +50,24 @@ def make_service(name: str):
         else:
             memcached_options = {}
 
-        host, port = parse_memcached_address(memcached_settings.address)
-        client = FlagClient(host, port, **memcached_options)
+        match memcached_settings.address:
+            case str(address):
+                host, port = parse_memcached_address(address)
+                client = FlagClient(host, port, **memcached_options)
+            case nodes:
+                client = make_hash_ring_client(nodes, memcached_options)
+
+        if batching := memcached_settings.batching:
+            client = BatchingClient(
+                client,
+                max_keys=batching.max_keys,
+                window=batching.window,
+                timeout=memcached_settings.timeout,
+            )
+        elif memcached_settings.timeout is not None:
+            client = BatchingClient(
+                client, coalesce=False, timeout=memcached_settings.timeout
+            )
 
         yield client
         await client.close()
@@ -1,8 +1,8 @@
 from collections.abc import Callable
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
-from selva._util.pydantic import DottedPath
+from selva._util.pydantic import DottedPath, enable_with_bool
 
 
 class MemcachedOptions(BaseModel):
@@ -15,8 +15,36 @@ class MemcachedOptions(BaseModel):
     conn_args: DottedPath[dict] = None
 
 
-class MemcachedSettings(BaseModel):
+class MemcachedNodeSettings(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     address: str
+    weight: int = Field(1, gt=0)
+    pool_size: int = None
+    pool_minsize: int = None
+
+
+class MemcachedBatchingSettings(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    window: float = 0
+    max_keys: int = 100
+
+
+class MemcachedSettings(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    address: str | list[str | MemcachedNodeSettings]
     options: MemcachedOptions = None
+    batching: MemcachedBatchingSettings | None = None
+    timeout: float = None
+
+    enable_batching = enable_with_bool("batching")
+
+    @field_validator("address")
+    @classmethod
+    def verify_address(cls, value):
+        if isinstance(value, list) and not value:
+            raise ValueError("At least one address must be provided")
+
+        return value
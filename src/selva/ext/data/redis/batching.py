@@ -0,0 +1,134 @@
+import asyncio
+
+from redis.asyncio import Redis
+
+__all__ = ("BatchingRedis",)
+
+# commands that block the connection or depend on its state cannot share a pipeline
+UNBATCHED_COMMANDS = frozenset(
+    {
+        "AUTH",
+        "BLMOVE",
+        "BLMPOP",
+        "BLPOP",
+        "BRPOP",
+        "BRPOPLPUSH",
+        "BZMPOP",
+        "BZPOPMAX",
+        "BZPOPMIN",
+        "CLIENT",
+        "DISCARD",
+        "EXEC",
+        "HELLO",
+        "MONITOR",
+        "MULTI",
+        "PSUBSCRIBE",
+        "QUIT",
+        "RESET",
+        "SELECT",
+        "SSUBSCRIBE",
+        "SUBSCRIBE",
+        "UNWATCH",
+        "WAIT",
+        "WAITAOF",
+        "WATCH",
+        "XREAD",
+        "XREADGROUP",
+    }
+)
+
+
+class BatchingRedis(Redis):
+    """Redis client that sends concurrent commands in a single pipeline
+
+    Commands issued within `batch_window` seconds (or in the same iteration of
+    the event loop, if it is 0) are sent together in a non transactional
+    pipeline, and each caller receives the result of its own command.
+    """
+
+    def __init__(self, *args, batch_window: float = 0, batch_size: int = 100, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batch_window = batch_window
+        self.batch_size = batch_size
+        self._batch: list[tuple[tuple, dict, asyncio.Future]] = []
+        self._flush_handle: asyncio.Handle | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    async def execute_command(self, *args, **options):
+        command_name = str(args[0]).split(" ", maxsplit=1)[0].upper()
+        if command_name in UNBATCHED_COMMANDS or self.single_connection_client:
+            return await super().execute_command(*args, **options)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._batch.append((args, options, future))
+
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            if self.batch_window > 0:
+                self._flush_handle = loop.call_later(self.batch_window, self._flush)
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._execute_batch(batch))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _execute_batch(self, batch: list[tuple[tuple, dict, asyncio.Future]]):
+        # skip futures of callers that were cancelled while waiting
+        batch = [item for item in batch if not item[2].done()]
+
+        if len(batch) == 1:
+            args, options, future = batch[0]
+            try:
+                result = await super().execute_command(*args, **options)
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                _set_exception(future, err)
+            else:
+                _set_result(future, result)
+            return
+
+        try:
+            async with self.pipeline(transaction=False) as pipe:
+                for args, options, _ in batch:
+                    pipe.execute_command(*args, **options)
+                results = await pipe.execute(raise_on_error=False)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            for *_, future in batch:
+                _set_exception(future, err)
+            return
+
+        for (*_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                _set_exception(future, result)
+            else:
+                _set_result(future, result)
+
+    async def aclose(self, close_connection_pool: bool | None = None):
+        self._flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+        await super().aclose(close_connection_pool)
+
+
+def _set_result(future: asyncio.Future, result):
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future: asyncio.Future, error: Exception):
+    if not future.done():
+        future.set_exception(error)
@@ -3,6 +3,7 @@ from redis.asyncio import Redis
 from selva.configuration.settings import Settings
 from selva.di.decorator import service
 
+from .batching import BatchingRedis
 from .settings import RedisSettings
 
 
@@ -12,11 +13,16 @@ def make_service(name: str):
         redis_settings = RedisSettings.model_validate(dict(settings.data.redis[name]))
 
         kwargs = redis_settings.model_dump(exclude_unset=True)
+        redis_class = BatchingRedis if redis_settings.batching else Redis
 
         if url := kwargs.pop("url", ""):
-            redis = Redis.from_url(url, **kwargs)
+            redis = redis_class.from_url(url, **kwargs)
         else:
-            redis = Redis(**kwargs)
+            redis = redis_class(**kwargs)
+
+        if batching := redis_settings.batching:
+            redis.batch_window = batching.window
+            redis.batch_size = batching.max_size
 
         await redis.initialize()
         yield redis
@@ -2,7 +2,13 @@ import socket
 from types import NoneType
 from typing import Annotated, Any, Literal, Self
 
-from pydantic import BaseModel, ConfigDict, Field, model_serializer, model_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    model_serializer,
+    model_validator,
+)
 from redis.backoff import (
     AbstractBackoff,
     ConstantBackoff,
@@ -14,7 +20,7 @@ from redis.backoff import (
 )
 from redis.retry import Retry
 
-from selva._util.pydantic import DottedPath
+from selva._util.pydantic import DottedPath, enable_with_bool
 
 
 class NoBackoffSchema(BaseModel):
@@ -152,6 +158,13 @@ class RedisOptions(BaseModel):
         return result
 
 
+class RedisBatchingSettings(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    window: float = 0
+    max_size: int = 100
+
+
 class RedisSettings(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -162,6 +175,9 @@ class RedisSettings(BaseModel):
     username: str = None
     password: str = None
     options: RedisOptions = None
+    batching: RedisBatchingSettings | None = None
+
+    enable_batching = enable_with_bool("batching")
 
     @model_validator(mode="after")
     def verify_either_url_or_components(self) -> Self:
@@ -177,7 +193,7 @@ class RedisSettings(BaseModel):
         data = {
             field: getattr(self, field)
             for field in set(self.model_fields_set)
-            if field != "options"
+            if field not in ("options", "batching")
         }
 
         if self.options:
@@ -1,15 +1,21 @@
 from importlib.util import find_spec
 
+from sqlalchemy.ext.asyncio import AsyncEngine
+
 from selva.configuration.settings import Settings
 from selva.di.container import Container
+from selva.ext.data.sqlalchemy.pagination import CursorParamConverter
 from selva.ext.data.sqlalchemy.service import (
     engine_dict_service,
     make_engine_service,
+    query_cache_service,
     sessionmaker_service,
 )
+from selva.ext.data.sqlalchemy.session import scoped_session_service
+from selva.ext.data.sqlalchemy.settings import SqlAlchemyEngineSettings
 
 
-def init_extension(container: Container, settings: Settings):
+async def init_extension(container: Container, settings: Settings):
     if find_spec("sqlalchemy") is None:
         raise ModuleNotFoundError(
             "Missing 'sqlalchemy'. Install 'selva' with 'sqlalchemy' extra."
@@ -20,3 +26,13 @@ def init_extension(container: Container, settings: Settings):
 
     container.register(engine_dict_service)
     container.register(sessionmaker_service)
+    container.register(scoped_session_service)
+    container.register(CursorParamConverter)
+
+    if settings.data.sqlalchemy.get("query_cache") not in (None, False):
+        container.register(query_cache_service)
+
+    # create engines with warmup enabled, so their pools are ready on startup
+    for name, connection in settings.data.sqlalchemy.connections.items():
+        if SqlAlchemyEngineSettings.model_validate(connection).warmup is not None:
+            await container.get(AsyncEngine, name=name if name != "default" else None)
@@ -0,0 +1,146 @@
+from collections.abc import Iterable, Mapping, Sequence
+from itertools import islice
+
+from sqlalchemy import Insert, Row, Table, inspect
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import DeclarativeBase
+
+__all__ = ("bulk_insert", "bulk_upsert")
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _get_table(target: Table | type[DeclarativeBase]) -> Table:
+    if isinstance(target, Table):
+        return target
+    return inspect(target).local_table
+
+
+def _get_dialect_name(executor: AsyncSession | AsyncConnection, table: Table) -> str:
+    if isinstance(executor, AsyncSession):
+        return executor.get_bind(clause=table).dialect.name
+    return executor.dialect.name
+
+
+async def _execute_batches(
+    executor: AsyncSession | AsyncConnection,
+    statement: Insert,
+    rows: Iterable[Mapping],
+    batch_size: int,
+    returning: bool,
+) -> list[Row] | None:
+    results = [] if returning else None
+
+    # each batch is sent as an 'executemany', which SQLAlchemy splits in
+    # multi-row INSERT statements of 'insertmanyvalues_page_size' rows
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        result = await executor.execute(statement, batch)
+        if returning:
+            results.extend(result.all())
+
+    return results
+
+
+async def bulk_insert(
+    executor: AsyncSession | AsyncConnection,
+    target: Table | type[DeclarativeBase],
+    rows: Iterable[Mapping],
+    *,
+    returning: Sequence = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> list[Row] | None:
+    """Insert rows in batches
+
+    Rows are sent in batches of `batch_size` rows instead of one statement per
+    row. Objects are not added to the session, so this is faster than `add_all`
+    for large amounts of data.
+
+    :param executor: Session or connection used to insert the rows
+    :param target: Table or mapped class where rows are inserted
+    :param rows: Mappings of column names to values
+    :param returning: Columns to return for each inserted row
+    :param batch_size: Maximum number of rows in each execution
+    :return: Rows with the `returning` columns, if given
+    """
+
+    table = _get_table(target)
+    statement = table.insert()
+    if returning:
+        statement = statement.returning(*returning, sort_by_parameter_order=True)
+
+    return await _execute_batches(
+        executor, statement, rows, batch_size, bool(returning)
+    )
+
+
+async def bulk_upsert(
+    executor: AsyncSession | AsyncConnection,
+    target: Table | type[DeclarativeBase],
+    rows: Iterable[Mapping],
+    *,
+    index_elements: Sequence[str] = None,
+    update: Sequence[str] = None,
+    returning: Sequence = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> list[Row] | None:
+    """Insert rows in batches, updating the rows that already exist
+
+    Supported in PostgreSQL, SQLite, MySQL and MariaDB.
+
+    :param executor: Session or connection used to insert the rows
+    :param target: Table or mapped class where rows are inserted
+    :param rows: Mappings of column names to values
+    :param index_elements: Columns of the unique constraint that identifies
+    existing rows, defaults to the primary key. Ignored in MySQL and MariaDB,
+    where any unique constraint applies
+    :param update: Columns updated in existing rows, defaults to all columns not
+    in `index_elements`. If empty, existing rows are left unchanged
+    :param returning: Columns to return for each row
+    :param batch_size: Maximum number of rows in each execution
+    :return: Rows with the `returning` columns, if given
+    :raise ValueError: If the database does not support upsert
+    """
+
+    table = _get_table(target)
+    dialect_name = _get_dialect_name(executor, table)
+
+    if index_elements is None:
+        index_elements = [column.name for column in table.primary_key]
+
+    if update is None:
+        update = [
+            column.name for column in table.columns if column.name not in index_elements
+        ]
+
+    match dialect_name:
+        case "postgresql" | "sqlite":
+            dialect = postgresql if dialect_name == "postgresql" else sqlite
+            statement = dialect.insert(table)
+            if update:
+                statement = statement.on_conflict_do_update(
+                    index_elements=index_elements,
+                    set_={name: statement.excluded[name] for name in update},
+                )
+            else:
+                statement = statement.on_conflict_do_nothing(
+                    index_elements=index_elements
+                )
+        case "mysql" | "mariadb":
+            statement = mysql.insert(table)
+            if update:
+                values = {name: statement.inserted[name] for name in update}
+            else:
+                # setting a column to its current value leaves the row unchanged
+                values = {name: table.c[name] for name in index_elements}
+            statement = statement.on_duplicate_key_update(values)
+        case _:
+            raise ValueError(f"upsert is not supported on '{dialect_name}'")
+
+    if returning:
+        statement = statement.returning(*returning, sort_by_parameter_order=True)
+
+    return await _execute_batches(
+        executor, statement, rows, batch_size, bool(returning)
+    )
@@ -0,0 +1,99 @@
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+__all__ = (
+    "QueryStats",
+    "current_query_stats",
+    "instrument_engine",
+    "query_stats_scope",
+)
+
+_INFO_KEY = "selva_query_start"
+
+
+class QueryStats:
+    """Statements executed within a `query_stats_scope`
+
+    Statements are grouped by their fingerprint, the SQL text with whitespace
+    collapsed, which does not include the parameter values.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        self.statements[" ".join(statement.split())] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements executed at least `threshold` times, likely N+1 queries"""
+
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar(
+    "selva_sqlalchemy_query_stats", default=None
+)
+
+
+@contextmanager
+def query_stats_scope() -> Iterator[QueryStats]:
+    """Collect the statements executed by instrumented engines in this scope"""
+
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault(_INFO_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if (stats := _current_stats.get()) is None:
+        return
+
+    if start_stack := conn.info.get(_INFO_KEY):
+        stats.record(statement, time.perf_counter() - start_stack.pop())
+
+
+def _handle_error(context):
+    # failed statements do not reach 'after_cursor_execute'
+    if (conn := context.connection) is not None and (
+        start_stack := conn.info.get(_INFO_KEY)
+    ):
+        start_stack.pop()
+
+
+def instrument_engine(engine: AsyncEngine):
+    """Record the statements executed by the engine in the current scope
+
+    Outside a `query_stats_scope`, the event listeners return immediately.
+    """
+
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(sync_engine, "handle_error", _handle_error)
@@ -0,0 +1,156 @@
+import logging
+from http import HTTPStatus
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from selva.configuration.settings import Settings
+from selva.di.container import Container
+from selva.logging import get_logger
+
+from .instrumentation import instrument_engine, query_stats_scope
+from .session import session_scope
+from .settings import SqlAlchemySettings
+
+__all__ = ("sqlalchemy_session_middleware", "sqlalchemy_instrumentation_middleware")
+
+logger = get_logger(__name__)
+
+
+async def sqlalchemy_session_middleware(app, settings: Settings, di: Container):
+    """Create a session scope for each request
+
+    The session is committed before the last part of the response body is sent
+    to the client, or rolled back if an exception is raised or the response
+    status is a server error. The start of the response is held until then, so if
+    the commit fails, the response is replaced by a server error. Streamed
+    responses are started before the commit, so if it fails, the response is left
+    incomplete.
+    """
+
+    session = await di.get(AsyncSession)
+
+    async def handler(scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await app(scope, receive, send)
+            return
+
+        status = None
+        response_start = None
+        commit_failed = False
+
+        async def send_wrapper(message: dict):
+            nonlocal status, response_start, commit_failed
+
+            if commit_failed:
+                # the response was replaced by a server error or left incomplete
+                return
+
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+                if status >= 500:
+                    if session.registry.has():
+                        await session.rollback()
+                else:
+                    # hold the start until it is known whether the commit succeeds
+                    response_start = message
+                    return
+            elif message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                if status < 500 and session.registry.has():
+                    try:
+                        await session.commit()
+                    except Exception:  # pylint: disable=broad-exception-caught
+                        logger.exception("session commit failed")
+                        commit_failed = True
+                        await session.rollback()
+
+                        if response_start is None:
+                            # a streamed response has already started
+                            return
+
+                        response_start = None
+                        status = HTTPStatus.INTERNAL_SERVER_ERROR
+                        await send(
+                            {
+                                "type": "http.response.start",
+                                "status": status,
+                                "headers": [(b"content-length", b"0")],
+                            }
+                        )
+                        await send({"type": "http.response.body", "body": b""})
+                        return
+
+            if response_start is not None:
+                await send(response_start)
+                response_start = None
+
+            await send(message)
+
+        async with session_scope(session):
+            await app(scope, receive, send_wrapper)
+
+            if response_start is not None:
+                await send(response_start)
+
+            if status is not None and status >= 500 and session.registry.has():
+                await session.rollback()
+
+    return handler
+
+
+async def sqlalchemy_instrumentation_middleware(app, settings: Settings, di: Container):
+    """Collect the statements executed in each request
+
+    The number of statements and the time spent executing them are logged and
+    added to the response headers, and statements repeated more than the
+    configured threshold are reported as likely N+1 queries.
+    """
+
+    instrumentation = SqlAlchemySettings.model_validate(
+        settings.data.sqlalchemy
+    ).instrumentation
+
+    engines = await di.get(dict[str, AsyncEngine])
+    for engine in engines.values():
+        instrument_engine(engine)
+
+    async def handler(scope, receive, send):
+        if scope["type"] != "http":
+            await app(scope, receive, send)
+            return
+
+        with query_stats_scope() as stats:
+
+            async def send_wrapper(message: dict):
+                if message["type"] == "http.response.start" and instrumentation.headers:
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"x-query-count", str(stats.count).encode()),
+                        (
+                            b"server-timing",
+                            f"db;dur={stats.duration * 1000:.3f}".encode(),
+                        ),
+                    ]
+                await send(message)
+
+            await app(scope, receive, send_wrapper)
+
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                "sqlalchemy queries",
+                path=scope["path"],
+                count=stats.count,
+                duration=stats.duration,
+            )
+
+        for statement, count in stats.repeated(instrumentation.n_plus_one_threshold):
+            logger.warning(
+                "possible n+1 query",
+                path=scope["path"],
+                statement=statement,
+                count=count,
+            )
+
+    return handler
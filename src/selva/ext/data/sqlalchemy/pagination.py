@@ -0,0 +1,214 @@
+import base64
+import binascii
+import datetime
+import decimal
+import json
+import uuid
+from collections.abc import Sequence
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import Column, Row, Select, and_, false, inspect, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import QueryableAttribute
+from sqlalchemy.sql import ColumnElement, operators
+from sqlalchemy.sql.elements import UnaryExpression
+
+from selva.web.converter.decorator import register_converter
+from selva.web.exception import HTTPBadRequestException
+
+__all__ = ("Cursor", "Page", "paginate")
+
+T = TypeVar("T")
+
+
+class Cursor:
+    """Position in a keyset paginated query
+
+    Holds the values of the ordering columns of the last item of a page, and is
+    exchanged with clients as an opaque string.
+    """
+
+    def __init__(self, values: Sequence):
+        self.values = tuple(values)
+
+    def __eq__(self, other):
+        return isinstance(other, Cursor) and self.values == other.values
+
+    def __repr__(self):
+        return f"Cursor({self.values!r})"
+
+    def encode(self) -> str:
+        data = json.dumps(self.values, default=str, separators=(",", ":"))
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "Cursor":
+        """
+        :raise ValueError: If the value is not a valid cursor
+        :raise TypeError: If the value does not hold a list of values
+        """
+
+        try:
+            data = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+            values = json.loads(data)
+        except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as err:
+            raise ValueError("invalid cursor") from err
+
+        if not isinstance(values, list):
+            raise TypeError("invalid cursor")
+
+        return cls(values)
+
+
+@register_converter(str, Cursor)
+class CursorParamConverter:
+    @staticmethod
+    def convert(value: str, _original_type: type[Cursor]) -> Cursor:
+        try:
+            return Cursor.decode(value)
+        except (ValueError, TypeError) as err:
+            raise HTTPBadRequestException() from err
+
+
+class Page(Generic[T]):
+    """Items of a page and the cursor to fetch the next one"""
+
+    def __init__(self, items: list[T], next_cursor: Cursor | None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+def _parse_order(order: ColumnElement) -> tuple[ColumnElement, bool]:
+    if isinstance(order, UnaryExpression) and order.modifier in (
+        operators.desc_op,
+        operators.asc_op,
+    ):
+        column, desc = order.element, order.modifier is operators.desc_op
+    else:
+        column, desc = order, False
+
+    # comparisons with NULL are never true, so rows would be skipped
+    expression = getattr(column, "__clause_element__", lambda: column)()
+    if isinstance(expression, Column) and expression.nullable:
+        raise ValueError(f"cannot paginate by nullable column '{expression}'")
+
+    return column, desc
+
+
+# values that json cannot represent are encoded as strings in the cursor
+_FROM_STR = {
+    datetime.datetime: datetime.datetime.fromisoformat,
+    datetime.date: datetime.date.fromisoformat,
+    datetime.time: datetime.time.fromisoformat,
+    decimal.Decimal: decimal.Decimal,
+    uuid.UUID: uuid.UUID,
+}
+
+
+def _cursor_value(column: ColumnElement, value) -> Any:
+    if not isinstance(value, str):
+        return value
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+
+    if convert := _FROM_STR.get(python_type):
+        try:
+            return convert(value)
+        except ValueError as err:
+            raise HTTPBadRequestException() from err
+
+    return value
+
+
+def _seek(columns: list[tuple[ColumnElement, bool]], values: tuple) -> ColumnElement:
+    if len(values) != len(columns):
+        raise HTTPBadRequestException()
+
+    values = [
+        _cursor_value(column, value) for (column, _), value in zip(columns, values)
+    ]
+
+    descending = {desc for _, desc in columns}
+    if len(descending) == 1 and len(columns) > 1:
+        # row value comparison can use a composite index directly
+        left = tuple_(*[column for column, _ in columns])
+        right = tuple_(*values)
+        return left < right if descending.pop() else left > right
+
+    # (a > x) OR (a = x AND b > y) OR ...
+    clauses = []
+    for i, (column, desc) in enumerate(columns):
+        equals = [prev == value for (prev, _), value in zip(columns[:i], values)]
+        compare = column < values[i] if desc else column > values[i]
+        clauses.append(and_(*equals, compare))
+
+    return or_(false(), *clauses)
+
+
+def _key_value(item, column: ColumnElement):
+    if isinstance(item, Row):
+        return item._mapping[column]
+
+    if isinstance(column, QueryableAttribute):
+        return getattr(item, column.key)
+
+    # the mapped attribute may be named differently from the column
+    prop = inspect(item).mapper.get_property_by_column(column)
+    return getattr(item, prop.key)
+
+
+async def paginate(
+    session: AsyncSession,
+    statement: Select,
+    order_by: Sequence[ColumnElement],
+    *,
+    cursor: Cursor | None = None,
+    limit: int = 50,
+) -> Page:
+    """Fetch a page of the statement using keyset pagination
+
+    Instead of skipping rows with OFFSET, the query seeks past the values of the
+    ordering columns of the last item of the previous page, so every page takes
+    the same time, regardless of how deep it is.
+
+    :param session: Session to execute the statement
+    :param statement: Select statement, without ORDER BY and LIMIT
+    :param order_by: Columns that order the results, optionally with `.desc()`.
+    Together they must be unique, usually by ending with the primary key, and
+    cannot be nullable
+    :param cursor: Cursor of the previous page, or None for the first page
+    :param limit: Maximum number of items in the page
+
+    :raise ValueError: If an `order_by` column is nullable
+    """
+
+    columns = [_parse_order(order) for order in order_by]
+
+    if cursor is not None:
+        statement = statement.where(_seek(columns, cursor.values))
+
+    # fetch one more item to know if there is a next page
+    statement = statement.order_by(*order_by).limit(limit + 1)
+    result = await session.execute(statement)
+
+    descriptions = statement.column_descriptions
+    if len(descriptions) == 1 and descriptions[0]["expr"] is descriptions[0]["entity"]:
+        items = list(result.scalars())
+    else:
+        items = list(result)
+
+    if len(items) <= limit:
+        return Page(items, None)
+
+    items = items[:limit]
+    last = items[-1]
+    next_cursor = Cursor([_key_value(last, column) for column, _ in columns])
+
+    return Page(items, next_cursor)
@@ -0,0 +1,168 @@
+import hashlib
+import pickle
+import uuid
+
+from sqlalchemy import Table, TextClause, event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.orm.loading import merge_frozen_result
+from sqlalchemy.sql.util import find_tables
+from sqlalchemy.util import LRUCache, await_only
+
+from selva.ext.data.cache.store import CacheStore
+
+__all__ = ("QueryCache",)
+
+CACHE_OPTION = "query_cache"
+
+_WRITES_KEY = "selva_query_cache_writes"
+
+# version shared by all cached results, changed by textual statements that may
+# write to any table
+_ALL_TABLES = "*"
+
+
+class QueryCache:
+    """Cache the results of select statements in a `CacheStore`
+
+    Only statements with the `query_cache` execution option are cached, which
+    can be `True` or the time to live, in seconds, of the cached result.
+
+    Cache keys include a version of each table read by the statement. When a
+    session commits writes to a table, the version of that table changes, so
+    previously cached results are no longer used. Sessions with uncommitted
+    writes do not use the cache, so they always read their own writes.
+
+    Textual statements other than `SELECT` may write to any table, so when a
+    session that executed them commits, all cached results are invalidated.
+
+    :param store: Store where results are cached
+    :param ttl: Default time to live of cached results
+    :param prefix: Prefix of the keys in the store
+    """
+
+    def __init__(
+        self, store: CacheStore, ttl: float = None, prefix: str = "sqlalchemy:"
+    ):
+        self.store = store
+        self.ttl = ttl
+        self.prefix = prefix
+        self._statement_cache = LRUCache(1000)
+
+    def session_class(self, base: type[Session] = Session) -> type[Session]:
+        """Create a subclass of `base` whose sessions use this cache"""
+
+        session_class = type("QueryCacheSession", (base,), {})
+
+        event.listen(session_class, "do_orm_execute", self._do_orm_execute)
+        event.listen(session_class, "after_flush", self._after_flush)
+        event.listen(session_class, "after_commit", self._after_commit)
+        event.listen(session_class, "after_soft_rollback", self._after_rollback)
+
+        return session_class
+
+    async def invalidate(self, *tables: str):
+        """Invalidate the cached results that read from the given tables"""
+
+        for table in tables:
+            await self.store.set(self._version_key(table), _new_version())
+
+    async def invalidate_all(self):
+        """Invalidate all cached results"""
+
+        await self.invalidate(_ALL_TABLES)
+
+    def _do_orm_execute(self, state: ORMExecuteState):
+        writes: set[str] = state.session.info.setdefault(_WRITES_KEY, set())
+
+        if state.is_insert or state.is_update or state.is_delete:
+            writes.add(state.statement.table.fullname)
+            return None
+
+        if isinstance(state.statement, TextClause):
+            if not _is_textual_select(state.statement):
+                writes.add(_ALL_TABLES)
+            return None
+
+        option = state.execution_options.get(CACHE_OPTION)
+        if not state.is_select or not option or writes:
+            return None
+
+        if (key := self._cache_key(state)) is None:
+            return None
+
+        ttl = self.ttl if option is True else option
+
+        if (data := await_only(self.store.get(key))) is not None:
+            frozen_result = pickle.loads(data)
+        else:
+            frozen_result = state.invoke_statement().freeze()
+            await_only(self.store.set(key, pickle.dumps(frozen_result), ttl))
+
+        return merge_frozen_result(
+            state.session, state.statement, frozen_result, load=False
+        )()
+
+    def _after_flush(self, session: Session, _flush_context):
+        writes: set[str] = session.info.setdefault(_WRITES_KEY, set())
+        for instance in (*session.new, *session.dirty, *session.deleted):
+            writes.update(table.fullname for table in inspect(instance).mapper.tables)
+
+    def _after_commit(self, session: Session):
+        if writes := session.info.pop(_WRITES_KEY, None):
+            await_only(self.invalidate(*writes))
+
+    def _after_rollback(self, session: Session, _previous_transaction):
+        if not session.in_transaction():
+            session.info.pop(_WRITES_KEY, None)
+
+    def _cache_key(self, state: ORMExecuteState) -> str | None:
+        statement = state.statement
+
+        if (statement_key := statement._generate_cache_key()) is None:
+            # the statement contains elements that cannot be cached
+            return None
+
+        tables = sorted(
+            {
+                table.fullname
+                for table in find_tables(
+                    statement, check_columns=True, include_aliases=True
+                )
+                if isinstance(table, Table)
+            }
+        )
+
+        versions = [self._get_version(table) for table in (_ALL_TABLES, *tables)]
+
+        sql = statement_key.to_offline_string(
+            self._statement_cache, statement, state.parameters or {}
+        )
+
+        digest = hashlib.sha1(usedforsecurity=False)
+        digest.update(sql.encode())
+        for version in versions:
+            digest.update(version)
+
+        return f"{self.prefix}result:{digest.hexdigest()}"
+
+    def _get_version(self, table: str) -> bytes:
+        key = self._version_key(table)
+        if (version := await_only(self.store.get(key))) is None:
+            # a missing version, for example evicted from the store, must not
+            # match the results cached with a previous version
+            version = _new_version()
+            await_only(self.store.set(key, version))
+
+        return version
+
+    def _version_key(self, table: str) -> str:
+        return f"{self.prefix}version:{table}"
+
+
+def _is_textual_select(statement: TextClause) -> bool:
+    words = statement.text.lstrip(" \t\r\n(").split(maxsplit=1)
+    return bool(words) and words[0].upper() == "SELECT"
+
+
+def _new_version() -> bytes:
+    return uuid.uuid4().hex.encode()
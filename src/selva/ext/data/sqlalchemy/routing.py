@@ -0,0 +1,96 @@
+import itertools
+from typing import Literal
+
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ClauseElement
+
+__all__ = ("ReplicaRouter", "RoutingSession")
+
+
+class ReplicaRouter:
+    """Choose the engines used by a `RoutingSession`
+
+    :param primary: Engine that receives writes
+    :param replicas: Engines that receive reads
+    :param strategy: How replicas are chosen, either in turns ('round_robin') or
+    the one with fewest connections in use ('least_connections')
+    :param sticky: Whether a session keeps reading from the primary after it
+    commits a write, so it can read its own writes
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: list[AsyncEngine],
+        strategy: Literal["round_robin", "least_connections"] = "round_robin",
+        sticky: bool = True,
+    ):
+        self.primary = primary.sync_engine
+        self.replicas = [replica.sync_engine for replica in replicas] or [self.primary]
+        self.strategy = strategy
+        self.sticky = sticky
+        self._cycle = itertools.cycle(self.replicas)
+
+    def get_replica(self) -> Engine:
+        if self.strategy == "least_connections":
+            return min(self.replicas, key=_connections_in_use)
+
+        return next(self._cycle)
+
+
+def _connections_in_use(engine: Engine) -> int:
+    checkedout = getattr(engine.pool, "checkedout", None)
+    return checkedout() if checkedout else 0
+
+
+def _is_read(clause: ClauseElement | None) -> bool:
+    return (
+        clause is not None
+        and getattr(clause, "is_select", False)
+        and getattr(clause, "_for_update_arg", None) is None
+    )
+
+
+class RoutingSession(Session):
+    """Session that sends reads to replicas and writes to the primary
+
+    Reads are statements that select without locking rows. Once the session
+    writes, every statement goes to the primary until the transaction ends, or
+    until the session is closed if the router is sticky.
+    """
+
+    def __init__(self, *args, router: ReplicaRouter, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.router = router
+        self._write_transaction = False
+        self._use_primary = False
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        if (
+            self._write_transaction
+            or self._use_primary
+            or self._flushing
+            or not _is_read(clause)
+        ):
+            self._write_transaction = True
+            return self.router.primary
+
+        return self.router.get_replica()
+
+    def commit(self):
+        super().commit()
+
+        if self._write_transaction and self.router.sticky:
+            self._use_primary = True
+        self._write_transaction = False
+
+    def rollback(self):
+        super().rollback()
+        self._write_transaction = False
+
+    def close(self):
+        super().close()
+        self._write_transaction = False
+        self._use_primary = False
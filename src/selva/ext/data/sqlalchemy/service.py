@@ -1,12 +1,25 @@
+import asyncio
+
 import structlog
-from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
 
 from selva.configuration.settings import Settings
 from selva.di.container import Container
 from selva.di.decorator import service
+from selva.ext.data.cache.store import CacheStore
+from selva.ext.data.sqlalchemy.query_cache import QueryCache
+from selva.ext.data.sqlalchemy.routing import ReplicaRouter, RoutingSession
 from selva.ext.data.sqlalchemy.settings import (
     SqlAlchemyEngineSettings,
     SqlAlchemySettings,
+    SqlAlchemyWarmupSettings,
 )
 
 logger = structlog.get_logger()
@@ -26,12 +39,58 @@ def make_engine_service(name: str):
             options = {}
 
         engine = create_async_engine(url, **options)
+
+        if warmup := sa_settings.warmup:
+            try:
+                await warmup_engine(engine, warmup)
+            except BaseException:
+                await engine.dispose()
+                raise
+
         yield engine
         await engine.dispose()
 
     return engine_service
 
 
+async def warmup_engine(engine: AsyncEngine, warmup: SqlAlchemyWarmupSettings):
+    """Open pool connections concurrently, so they are ready for the first requests
+
+    The number of connections defaults to the size of the pool and each one runs
+    the validation query, if given, before being returned to the pool.
+    """
+
+    count = warmup.connections
+    if count is None:
+        pool_size = getattr(engine.pool, "size", None)
+        count = pool_size() if pool_size else 1
+
+    async def connect() -> AsyncConnection:
+        conn = await engine.connect()
+        if warmup.query:
+            try:
+                await conn.execute(text(warmup.query))
+            except BaseException:
+                await conn.close()
+                raise
+        return conn
+
+    # connections are held until all are open, so each one is a distinct connection
+    results = await asyncio.gather(
+        *[connect() for _ in range(count)], return_exceptions=True
+    )
+
+    errors = [result for result in results if isinstance(result, BaseException)]
+    for result in results:
+        if isinstance(result, AsyncConnection):
+            await result.close()
+
+    if errors:
+        raise errors[0]
+
+    logger.info("sqlalchemy pool warmed up", engine=str(engine.url), connections=count)
+
+
 @service
 async def engine_dict_service(
     settings: Settings, di: Container
@@ -42,9 +101,25 @@ async def engine_dict_service(
     }
 
 
+@service
+async def query_cache_service(settings: Settings, di: Container) -> QueryCache:
+    query_cache_settings = SqlAlchemySettings.model_validate(
+        settings.data.sqlalchemy
+    ).query_cache
+
+    store_name = query_cache_settings.store
+    store = await di.get(
+        CacheStore, name=store_name if store_name != "default" else None
+    )
+
+    return QueryCache(store, query_cache_settings.ttl, query_cache_settings.prefix)
+
+
 @service
 async def sessionmaker_service(
-    settings: Settings, engines_map: dict[str, AsyncEngine]
+    settings: Settings,
+    engines_map: dict[str, AsyncEngine],
+    query_cache: QueryCache = None,
 ) -> async_sessionmaker:
     sqlalchemy_settings = SqlAlchemySettings.model_validate(settings.data.sqlalchemy)
 
@@ -64,6 +139,19 @@ async def sessionmaker_service(
                 raise ValueError(f"No engine with name '{engine_name}'")
 
         kwargs["binds"] = binds_config
+    elif routing := sqlalchemy_settings.session.routing:
+        engines = []
+        for engine_name in [routing.primary, *routing.replicas]:
+            if engine := engines_map.get(engine_name):
+                engines.append(engine)
+            else:
+                raise ValueError(f"No engine with name '{engine_name}'")
+
+        primary, *replicas = engines
+        kwargs["sync_session_class"] = RoutingSession
+        kwargs["router"] = ReplicaRouter(
+            primary, replicas, routing.strategy, routing.sticky
+        )
     else:
         engine = engines_map.get("default")
         if not engine:
@@ -71,4 +159,9 @@ async def sessionmaker_service(
             logger.warning("connection for sqlalchemy session", connection=name)
         args.append(engine)
 
+    if query_cache:
+        kwargs["sync_session_class"] = query_cache.session_class(
+            kwargs.get("sync_session_class", Session)
+        )
+
     return async_sessionmaker(*args, **kwargs)
@@ -0,0 +1,61 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_scoped_session,
+    async_sessionmaker,
+)
+
+from selva.di.decorator import service
+
+__all__ = ("scoped_session_service", "session_scope")
+
+_current_scope: ContextVar[object | None] = ContextVar(
+    "selva_sqlalchemy_session_scope", default=None
+)
+
+
+def current_session_scope() -> object:
+    if (scope := _current_scope.get()) is None:
+        raise RuntimeError(
+            "AsyncSession used outside a session scope,"
+            " add 'sqlalchemy_session_middleware' or use 'session_scope'"
+        )
+
+    return scope
+
+
+@asynccontextmanager
+async def session_scope(session: async_scoped_session) -> AsyncIterator[None]:
+    """Scope in which the injected `AsyncSession` refers to the same session
+
+    The session is only created if it is used within the scope. At the end of
+    the scope, the session is committed, or rolled back if an exception is raised,
+    and then closed, returning its connection to the pool.
+    """
+
+    token = _current_scope.set(object())
+    try:
+        try:
+            yield
+        except BaseException:
+            if session.registry.has():
+                await session.rollback()
+            raise
+
+        if session.registry.has():
+            await session.commit()
+    finally:
+        try:
+            await session.remove()
+        finally:
+            _current_scope.reset(token)
+
+
+@service
+async def scoped_session_service(sessionmaker: async_sessionmaker) -> AsyncSession:
+    """Session proxy that refers to a distinct session in each session scope"""
+
+    return async_scoped_session(sessionmaker, scopefunc=current_session_scope)
@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.query import Query
 from sqlalchemy.orm.session import JoinTransactionMode
 
-from selva._util.pydantic import DottedPath
+from selva._util.pydantic import DottedPath, enable_with_bool
 
 
 class SqlAlchemyExecutionOptions(BaseModel):
@@ -66,6 +66,15 @@ class SqlAlchemyOptions(BaseModel):
     use_insertmanyvalues: bool = None
 
 
+class SqlAlchemyWarmupSettings(BaseModel):
+    """Settings for opening pool connections when the application starts."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    connections: int = Field(default=None, gt=0)
+    query: str = None
+
+
 class SqlAlchemyEngineSettings(BaseModel):
     """Settings for a SQLAlchemy connection defined in a settings file."""
 
@@ -80,6 +89,9 @@ class SqlAlchemyEngineSettings(BaseModel):
     database: str = None
     query: dict[str, str] = None
     options: SqlAlchemyOptions = None
+    warmup: SqlAlchemyWarmupSettings | None = None
+
+    enable_warmup = enable_with_bool("warmup")
 
     @model_validator(mode="after")
     def verify_either_url_or_components(self) -> Self:
@@ -126,6 +138,17 @@ class SqlAlchemySessionOptions(BaseModel):
     close_resets_only: bool = None
 
 
+class SqlAlchemyRoutingSettings(BaseModel):
+    """Settings for routing session statements to primary and replica connections."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    primary: str = "default"
+    replicas: list[str]
+    strategy: Literal["round_robin", "least_connections"] = "round_robin"
+    sticky: bool = True
+
+
 class SqlAlchemySessionSettings(BaseModel):
     """Settings for the SQLAlchemy session defined in a settings file."""
 
@@ -133,6 +156,33 @@ class SqlAlchemySessionSettings(BaseModel):
 
     options: SqlAlchemySessionOptions = None
     binds: dict[DottedPath, str] = None
+    routing: SqlAlchemyRoutingSettings = None
+
+    @model_validator(mode="after")
+    def verify_either_binds_or_routing(self) -> Self:
+        if self.binds and self.routing:
+            raise ValueError("Either 'binds' or 'routing' should be provided")
+
+        return self
+
+
+class SqlAlchemyInstrumentationSettings(BaseModel):
+    """Settings for the query instrumentation middleware."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    headers: bool = True
+    n_plus_one_threshold: int = Field(default=10, gt=1)
+
+
+class SqlAlchemyQueryCacheSettings(BaseModel):
+    """Settings for caching query results in a cache store."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    store: str = "default"
+    ttl: float = None
+    prefix: str = "sqlalchemy:"
 
 
 class SqlAlchemySettings(BaseModel):
@@ -144,3 +194,9 @@ class SqlAlchemySettings(BaseModel):
     session: SqlAlchemySessionSettings = Field(
         default_factory=SqlAlchemySessionSettings
     )
+    instrumentation: SqlAlchemyInstrumentationSettings = Field(
+        default_factory=SqlAlchemyInstrumentationSettings
+    )
+    query_cache: SqlAlchemyQueryCacheSettings | None = None
+
+    enable_query_cache = enable_with_bool("query_cache")
@@ -0,0 +1,126 @@
+import functools
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Mapping
+from typing import Any
+
+from asgikit.responses import Response, respond_stream
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncMappingResult, AsyncResult, AsyncScalarResult
+
+__all__ = ("respond_json_stream", "respond_ndjson_stream")
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+StreamResult = AsyncResult | AsyncScalarResult | AsyncMappingResult
+
+_default_encoder = functools.partial(json.dumps, default=str)
+
+
+def _to_json(item) -> Any:
+    if isinstance(item, Row):
+        return item._asdict()
+    if isinstance(item, Mapping):
+        return dict(item)
+    return item
+
+
+async def _encode_rows(
+    result: StreamResult,
+    serializer: Callable[[Any], Any] | None,
+    encoder: Callable[[Any], str | bytes],
+) -> AsyncIterator[bytes]:
+    serializer = serializer or _to_json
+
+    # partitions are fetched from the cursor 'yield_per' rows at a time
+    async for partition in result.partitions():
+        for item in partition:
+            data = encoder(serializer(item))
+            yield data.encode() if isinstance(data, str) else data
+
+
+async def _coalesce(
+    parts: AsyncIterable[bytes], chunk_size: int
+) -> AsyncIterator[bytes]:
+    buffer = bytearray()
+    async for part in parts:
+        buffer += part
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+
+    if buffer:
+        yield bytes(buffer)
+
+
+async def _json_array(rows: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    yield b"["
+
+    separator = b""
+    async for row in rows:
+        yield separator + row
+        separator = b","
+
+    yield b"]"
+
+
+async def _ndjson_lines(rows: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    async for row in rows:
+        yield row + b"\n"
+
+
+async def _respond(
+    response: Response,
+    result: StreamResult,
+    body: AsyncIterable[bytes],
+    chunk_size: int,
+):
+    try:
+        await respond_stream(response, _coalesce(body, chunk_size))
+    finally:
+        # release the cursor even if the client disconnected
+        await result.close()
+
+
+async def respond_json_stream(
+    response: Response,
+    result: StreamResult,
+    *,
+    serializer: Callable[[Any], Any] = None,
+    encoder: Callable[[Any], str | bytes] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+):
+    """Respond with the rows of a streaming result as a JSON array
+
+    Rows are written in chunks of about `chunk_size` bytes, and the next rows are
+    only fetched when the previous chunk was sent, so memory usage is bounded
+    regardless of the size of the result.
+
+    :param response: The response to write to
+    :param result: Result of `AsyncSession.stream()` or `AsyncSession.stream_scalars()`
+    :param serializer: Converts each row to a value that can be encoded as JSON.
+    By default, rows are converted to dicts and other values are left as they are
+    :param encoder: Encodes each value as JSON, defaults to `json.dumps`
+    :param chunk_size: Size, in bytes, of the chunks written to the response
+    """
+
+    rows = _encode_rows(result, serializer, encoder or _default_encoder)
+    response.content_type = "application/json"
+    await _respond(response, result, _json_array(rows), chunk_size)
+
+
+async def respond_ndjson_stream(
+    response: Response,
+    result: StreamResult,
+    *,
+    serializer: Callable[[Any], Any] = None,
+    encoder: Callable[[Any], str | bytes] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+):
+    """Respond with the rows of a streaming result as newline delimited JSON
+
+    Accepts the same parameters as `respond_json_stream`.
+    """
+
+    rows = _encode_rows(result, serializer, encoder or _default_encoder)
+    response.content_type = "application/x-ndjson"
+    await _respond(response, result, _ndjson_lines(rows), chunk_size)
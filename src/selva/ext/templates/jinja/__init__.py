@@ -2,15 +2,27 @@ from importlib.util import find_spec
 
 from selva.configuration.settings import Settings
 from selva.di.container import Container
-from selva.ext.templates.jinja.service import JinjaTemplate
+from selva.ext.templates.jinja.fragment_cache import FragmentCache
+from selva.ext.templates.jinja.service import JinjaTemplate, fragment_cache_service
+from selva.ext.templates.jinja.settings import JinjaTemplateSettings
 
-__all__ = ("JinjaTemplate",)
+__all__ = ("FragmentCache", "JinjaTemplate")
 
 
-async def init_extension(container: Container, _settings: Settings):
+async def init_extension(container: Container, settings: Settings):
     if find_spec("jinja2") is None:
         raise ModuleNotFoundError(
             "Missing 'jinja2'. Install 'selva' with 'jinja' extra."
         )
 
     container.register(JinjaTemplate)
+
+    jinja_settings = JinjaTemplateSettings.model_validate(settings.templates.jinja)
+
+    # fragments are stored in a cache store from 'selva.ext.data.cache'
+    if jinja_settings.fragment_cache.store:
+        container.register(fragment_cache_service)
+
+    # templates are compiled when the service is created
+    if jinja_settings.precompile:
+        await container.get(JinjaTemplate)
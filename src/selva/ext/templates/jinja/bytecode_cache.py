@@ -0,0 +1,78 @@
+from jinja2 import BytecodeCache, FileSystemBytecodeCache
+from jinja2.bccache import Bucket
+
+from selva.configuration.settings import Settings
+from selva.ext.templates.jinja.settings import JinjaBytecodeCacheSettings
+from selva.logging import get_logger
+
+__all__ = ("RedisBytecodeCache", "make_bytecode_cache")
+
+logger = get_logger(__name__)
+
+
+class RedisBytecodeCache(BytecodeCache):
+    """Bytecode cache that stores compiled templates in Redis
+
+    Jinja loads templates synchronously, so it requires a synchronous client. Errors
+    from Redis are logged and the template is compiled again.
+
+    :param client: Synchronous Redis client
+    :param prefix: Prefix of the keys in Redis
+    :param timeout: Time, in seconds, compiled templates are kept
+    """
+
+    def __init__(self, client, prefix: str = "jinja2/bytecode/", timeout: int = None):
+        self.client = client
+        self.prefix = prefix
+        self.timeout = timeout
+
+    def load_bytecode(self, bucket: Bucket):
+        key = self.prefix + bucket.key
+
+        try:
+            code = self.client.get(key)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("failed to load template bytecode from redis", key=key)
+            return
+
+        if code is not None:
+            bucket.bytecode_from_string(code)
+
+    def dump_bytecode(self, bucket: Bucket):
+        key = self.prefix + bucket.key
+
+        try:
+            self.client.set(key, bucket.bytecode_to_string(), ex=self.timeout)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("failed to store template bytecode in redis", key=key)
+
+    def close(self):
+        self.client.close()
+
+
+def _make_redis_client(settings: Settings, name: str):
+    # pylint: disable=import-outside-toplevel
+    from redis import Redis
+
+    from selva.ext.data.redis.settings import RedisSettings
+
+    redis_settings = RedisSettings.model_validate(dict(settings.data.redis[name]))
+    kwargs = redis_settings.model_dump(exclude_unset=True)
+
+    # option that only applies to the asyncio client
+    kwargs.pop("auto_close_connection_pool", None)
+
+    if url := kwargs.pop("url", ""):
+        return Redis.from_url(url, **kwargs)
+
+    return Redis(**kwargs)
+
+
+def make_bytecode_cache(
+    cache_settings: JinjaBytecodeCacheSettings, settings: Settings
+) -> BytecodeCache:
+    if cache_settings.backend == "redis":
+        client = _make_redis_client(settings, cache_settings.connection or "default")
+        return RedisBytecodeCache(client, cache_settings.prefix, cache_settings.timeout)
+
+    return FileSystemBytecodeCache(cache_settings.directory)
@@ -0,0 +1,118 @@
+from jinja2 import nodes
+from jinja2.ext import Extension
+from jinja2.parser import Parser
+from markupsafe import Markup
+
+from selva.ext.data.cache.store import CacheStore
+from selva.ext.templates.jinja.streaming import FLUSH_MARKER
+from selva.logging import get_logger
+
+__all__ = ("FragmentCache", "FragmentCacheExtension")
+
+logger = get_logger(__name__)
+
+
+class FragmentCache:
+    """Store for the fragments rendered by the `{% cache %}` tag
+
+    :param store: Store where fragments are cached
+    :param ttl: Default time to live of cached fragments
+    :param prefix: Prefix of the keys in the store
+    """
+
+    def __init__(
+        self, store: CacheStore, ttl: float = None, prefix: str = "jinja:fragment:"
+    ):
+        self.store = store
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, template_name: str | None, key: str) -> str | None:
+        if (data := await self.store.get(self._key(template_name, key))) is None:
+            return None
+        return data.decode()
+
+    async def set(
+        self, template_name: str | None, key: str, fragment: str, ttl: float = None
+    ):
+        await self.store.set(
+            self._key(template_name, key),
+            fragment.encode(),
+            ttl if ttl is not None else self.ttl,
+        )
+
+    async def invalidate(self, template_name: str | None, key: str):
+        """Remove a cached fragment, so it is rendered again on the next request"""
+
+        await self.store.delete(self._key(template_name, key))
+
+    def _key(self, template_name: str | None, key: str) -> str:
+        return f"{self.prefix}{template_name}:{key}"
+
+
+class FragmentCacheExtension(Extension):
+    """Cache the output of a section of a template
+
+    ```
+    {% cache "navigation", 300 %}
+        ...
+    {% endcache %}
+    ```
+
+    The key is combined with the template name, or a hash of the source for
+    templates rendered with `render_str`, and the optional time to live defaults
+    to the one of the fragment cache. Errors from the store are logged and the
+    fragment is rendered.
+    """
+
+    tags = {"cache"}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=None)
+
+    def parse(self, parser: Parser) -> nodes.Node:
+        lineno = next(parser.stream).lineno
+
+        key = parser.parse_expression()
+        if parser.stream.skip_if("comma"):
+            ttl = parser.parse_expression()
+        else:
+            ttl = nodes.Const(None)
+
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+
+        call = self.call_method("_cache", [nodes.Const(parser.name), key, ttl])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    async def _cache(self, template_name: str | None, key, ttl, caller) -> str:
+        fragment_cache: FragmentCache | None = self.environment.fragment_cache
+        if fragment_cache is None:
+            return await caller()
+
+        key = str(key)
+
+        try:
+            fragment = await fragment_cache.get(template_name, key)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception(
+                "failed to read fragment from cache", template=template_name, key=key
+            )
+            fragment = None
+
+        if fragment is not None:
+            return Markup(fragment)
+
+        fragment = await caller()
+
+        try:
+            # flush markers only apply to the streamed render that produced them
+            await fragment_cache.set(
+                template_name, key, fragment.replace(FLUSH_MARKER, ""), ttl
+            )
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception(
+                "failed to store fragment in cache", template=template_name, key=key
+            )
+
+        return fragment
@@ -1,17 +1,38 @@
+import hashlib
+import weakref
+from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import Annotated
 
+import structlog
 from asgikit.responses import Response, respond_stream, respond_text
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, Template, TemplateNotFound, nodes
+from jinja2.runtime import Context
 
 from selva.configuration import Settings
-from selva.di import Inject, service
-from selva.ext.templates.jinja.settings import JinjaTemplateSettings
+from selva.di import Container, Inject, service
+from selva.ext.data.cache.store import CacheStore, MemoryCacheStore
+from selva.ext.templates.jinja.bytecode_cache import (
+    RedisBytecodeCache,
+    make_bytecode_cache,
+)
+from selva.ext.templates.jinja.fragment_cache import (
+    FragmentCache,
+    FragmentCacheExtension,
+)
+from selva.ext.templates.jinja.settings import (
+    JinjaBytecodeCacheSettings,
+    JinjaTemplateSettings,
+)
+from selva.ext.templates.jinja.streaming import coalesce, flush, streaming
+
+logger = structlog.get_logger()
 
 
 @service
 class JinjaTemplate:
     settings: Annotated[Settings, Inject]
+    fragment_cache: Annotated[FragmentCache, Inject] = None
     environment: Environment
 
     def initialize(self):
@@ -19,14 +40,60 @@ class JinjaTemplate:
             self.settings.templates.jinja
         )
 
-        kwargs = jinja_settings.model_dump(exclude_none=True)
+        kwargs = jinja_settings.model_dump(
+            exclude={"precompile", "streaming", "fragment_cache"}, exclude_none=True
+        )
+        kwargs["extensions"] = [*kwargs.get("extensions", []), FragmentCacheExtension]
 
         if "loader" not in kwargs:
             paths = kwargs.pop("paths")
             templates_path = [Path(p).absolute() for p in paths]
             kwargs["loader"] = FileSystemLoader(templates_path)
 
+        # bytecode cache created from settings, closed with the service
+        self.bytecode_cache = None
+        if isinstance(jinja_settings.bytecode_cache, JinjaBytecodeCacheSettings):
+            self.bytecode_cache = make_bytecode_cache(
+                jinja_settings.bytecode_cache, self.settings
+            )
+            kwargs["bytecode_cache"] = self.bytecode_cache
+
         self.environment = Environment(enable_async=True, **kwargs)
+        self.environment.globals["flush"] = flush
+        self.streaming_settings = jinja_settings.streaming
+
+        if self.fragment_cache is None:
+            # without a configured store, fragments are cached in process
+            fragment_cache_settings = jinja_settings.fragment_cache
+            self.fragment_cache = FragmentCache(
+                MemoryCacheStore(fragment_cache_settings.max_size),
+                fragment_cache_settings.ttl,
+                fragment_cache_settings.prefix,
+            )
+
+        self.environment.fragment_cache = self.fragment_cache
+
+        if precompile := jinja_settings.precompile:
+            self.precompile(precompile if isinstance(precompile, list) else None)
+
+    def finalize(self):
+        if isinstance(self.bytecode_cache, RedisBytecodeCache):
+            self.bytecode_cache.close()
+
+    def precompile(self, extensions: list[str] = None):
+        """Compile the templates found by the loader
+
+        Compiled templates are kept in the environment cache and in the bytecode
+        cache, if configured, so they are not compiled when first rendered.
+
+        :param extensions: Only compile templates with these file extensions
+        """
+
+        names = self.environment.list_templates(extensions=extensions)
+        for name in names:
+            self.environment.get_template(name)
+
+        logger.info("jinja templates compiled", count=len(names))
 
     # pylint: disable=too-many-arguments
     async def respond(
@@ -37,7 +104,13 @@ class JinjaTemplate:
         *,
         content_type: str | None = None,
         stream: bool = False,
+        block: str | None = None,
     ):
+        """Render a template to the response
+
+        :param block: Render only the block with this name, for partial updates
+        """
+
         if content_type:
             response.content_type = content_type
         elif not response.content_type:
@@ -46,16 +119,146 @@ class JinjaTemplate:
         template = self.environment.get_template(template_name)
 
         if stream:
-            render_stream = template.generate_async(context)
-            await respond_stream(response, render_stream)
+            if block:
+                fragments = _generate_block(template, block, context)
+            else:
+                fragments = template.generate_async(context)
+
+            # jinja yields many small fragments, which are merged into larger
+            # chunks so each one is not sent in its own message
+            with streaming():
+                render_stream = coalesce(
+                    fragments,
+                    self.streaming_settings.chunk_size,
+                    self.streaming_settings.flush_timeout,
+                )
+                await respond_stream(response, render_stream)
         else:
-            rendered = await template.render_async(context)
+            if block:
+                rendered = await _render_block(template, block, context)
+            else:
+                rendered = await template.render_async(context)
             await respond_text(response, rendered)
 
     async def render(self, template_name: str, context: dict) -> str:
         template = self.environment.get_template(template_name)
         return await template.render_async(context)
 
+    async def render_block(self, template_name: str, block: str, context: dict) -> str:
+        """Render a single block of a template
+
+        Block functions are compiled with the template, so rendering a block
+        only costs the block itself, not the whole template.
+        """
+
+        template = self.environment.get_template(template_name)
+        return await _render_block(template, block, context)
+
     async def render_str(self, source: str, context: dict) -> str:
-        template = self.environment.from_string(source)
+        # naming the template after its source keeps the fragments cached by
+        # different strings apart
+        name = "string:" + hashlib.sha256(source.encode()).hexdigest()
+        environment = self.environment
+        template = environment.template_class.from_code(
+            environment,
+            environment.compile(source, name),
+            environment.make_globals(None),
+            None,
+        )
         return await template.render_async(context)
+
+
+_parent_names: weakref.WeakKeyDictionary[Template, str | None] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _parent_name(template: Template) -> str | None:
+    """Name of the template extended by `template`, if it is a constant"""
+
+    try:
+        return _parent_names[template]
+    except KeyError:
+        pass
+
+    parent_name = None
+    environment = template.environment
+    if template.name is not None and environment.loader is not None:
+        try:
+            source, filename, _ = environment.loader.get_source(
+                environment, template.name
+            )
+        except TemplateNotFound:
+            pass
+        else:
+            tree = environment.parse(source, template.name, filename)
+            for node in tree.find_all(nodes.Extends):
+                if isinstance(node.template, nodes.Const):
+                    parent_name = node.template.value
+                break
+
+    _parent_names[template] = parent_name
+    return parent_name
+
+
+def _block_context(template: Template, context: dict) -> Context:
+    """Context with the blocks of the templates extended by `template`
+
+    When a template is rendered, `{% extends %}` adds the blocks of the parent
+    templates to the context. That does not happen when a single block is
+    rendered, so they are added here, making inherited blocks and `super()`
+    available.
+    """
+
+    block_context = template.new_context(context)
+
+    current = template
+    while (parent_name := _parent_name(current)) is not None:
+        parent = template.environment.get_template(parent_name, parent=current.name)
+        for name, block_function in parent.blocks.items():
+            block_context.blocks.setdefault(name, []).append(block_function)
+        current = parent
+
+    return block_context
+
+
+async def _generate_block(
+    template: Template, block: str, context: dict
+) -> AsyncIterator[str]:
+    block_context = _block_context(template, context)
+
+    try:
+        block_function = block_context.blocks[block][0]
+    except KeyError:
+        raise ValueError(
+            f"block '{block}' not found in template '{template.name}'"
+        ) from None
+
+    try:
+        async for fragment in block_function(block_context):
+            yield fragment
+    except Exception:  # pylint: disable=broad-exception-caught
+        # rewrite the traceback to point to the template source
+        template.environment.handle_exception()
+
+
+async def _render_block(template: Template, block: str, context: dict) -> str:
+    return "".join(
+        [fragment async for fragment in _generate_block(template, block, context)]
+    )
+
+
+@service
+async def fragment_cache_service(settings: Settings, di: Container) -> FragmentCache:
+    fragment_cache_settings = JinjaTemplateSettings.model_validate(
+        settings.templates.jinja
+    ).fragment_cache
+
+    store_name = fragment_cache_settings.store
+    store = await di.get(
+        CacheStore, name=store_name if store_name != "default" else None
+    )
+
+    return FragmentCache(
+        store, fragment_cache_settings.ttl, fragment_cache_settings.prefix
+    )
@@ -1,12 +1,50 @@
 from collections.abc import Callable
-from typing import Annotated, Literal
+from typing import Annotated, Literal, Self
 
 from jinja2 import BaseLoader, BytecodeCache, Undefined, select_autoescape
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from selva._util.pydantic import DottedPath
 
 
+class JinjaBytecodeCacheSettings(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    backend: Literal["filesystem", "redis"] = "filesystem"
+    directory: str = None
+    connection: str = None
+    prefix: str = "jinja2/bytecode/"
+    timeout: int = None
+
+    @model_validator(mode="after")
+    def verify_backend_options(self) -> Self:
+        if self.backend == "filesystem" and (self.connection or self.timeout):
+            raise ValueError(
+                "'connection' and 'timeout' cannot be used with 'filesystem' backend"
+            )
+
+        if self.backend == "redis" and self.directory:
+            raise ValueError("'directory' cannot be used with 'redis' backend")
+
+        return self
+
+
+class JinjaFragmentCacheSettings(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    store: str = None
+    max_size: int = Field(1024, gt=0)
+    ttl: float = Field(None, gt=0)
+    prefix: str = "jinja:fragment:"
+
+
+class JinjaStreamingSettings(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    chunk_size: int = Field(4096, gt=0)
+    flush_timeout: float = Field(None, gt=0)
+
+
 class JinjaTemplateSettings(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -34,4 +72,9 @@ class JinjaTemplateSettings(BaseModel):
     loader: DottedPath[BaseLoader] = None
     cache_size: int = None
     auto_reload: bool = None
-    bytecode_cache: DottedPath[BytecodeCache] = None
+    bytecode_cache: DottedPath[BytecodeCache] | JinjaBytecodeCacheSettings = None
+    precompile: bool | list[str] = None
+    streaming: JinjaStreamingSettings = Field(default_factory=JinjaStreamingSettings)
+    fragment_cache: JinjaFragmentCacheSettings = Field(
+        default_factory=JinjaFragmentCacheSettings
+    )
@@ -0,0 +1,140 @@
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from contextvars import ContextVar
+
+from markupsafe import Markup
+
+__all__ = ("coalesce", "flush")
+
+FLUSH_MARKER = Markup("\x00selva:flush\x00")
+
+_streaming: ContextVar[bool] = ContextVar("selva_jinja_streaming", default=False)
+
+
+def flush() -> Markup:
+    """Mark a point in a template where streamed output is sent to the client
+
+    Available in templates as `{{ flush() }}`. Outside streamed responses it
+    renders nothing.
+    """
+
+    return FLUSH_MARKER if _streaming.get() else Markup()
+
+
+@contextlib.contextmanager
+def streaming():
+    token = _streaming.set(True)
+    try:
+        yield
+    finally:
+        _streaming.reset(token)
+
+
+class _Buffer:
+    def __init__(self):
+        self.parts: list[str] = []
+        self.size = 0
+
+    def append(self, text: str):
+        if text:
+            self.parts.append(text)
+            self.size += len(text)
+
+    def take(self) -> str:
+        data = "".join(self.parts)
+        self.parts.clear()
+        self.size = 0
+        return data
+
+
+async def _split(fragments: AsyncIterator[str]) -> AsyncIterator[tuple[str, bool]]:
+    async for fragment in fragments:
+        if FLUSH_MARKER not in fragment:
+            yield fragment, False
+            continue
+
+        *parts, rest = fragment.split(FLUSH_MARKER)
+        for part in parts:
+            yield part, True
+        yield rest, False
+
+
+async def coalesce(
+    fragments: AsyncIterator[str], chunk_size: int, flush_timeout: float = None
+) -> AsyncIterator[str]:
+    """Merge the fragments of a template stream into chunks of `chunk_size`
+
+    Chunks are also sent at `{{ flush() }}` points and, if `flush_timeout` is
+    given, when the buffer has been waiting for more than `flush_timeout` seconds,
+    for example while the template awaits a slow call.
+    """
+
+    if flush_timeout is None:
+        buffer = _Buffer()
+        async for text, flush_point in _split(fragments):
+            buffer.append(text)
+            if (flush_point and buffer.size) or buffer.size >= chunk_size:
+                yield buffer.take()
+
+        if buffer.size:
+            yield buffer.take()
+    else:
+        async for chunk in _coalesce_with_timeout(fragments, chunk_size, flush_timeout):
+            yield chunk
+
+
+_DONE = object()
+
+
+async def _coalesce_with_timeout(
+    fragments: AsyncIterator[str], chunk_size: int, flush_timeout: float
+) -> AsyncIterator[str]:
+    buffer = _Buffer()
+    chunks = asyncio.Queue(maxsize=1)
+
+    async def produce():
+        try:
+            async for text, flush_point in _split(fragments):
+                buffer.append(text)
+                if (flush_point and buffer.size) or buffer.size >= chunk_size:
+                    await chunks.put(buffer.take())
+
+            if buffer.size:
+                await chunks.put(buffer.take())
+            await chunks.put(_DONE)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            await chunks.put(err)
+
+    producer = asyncio.create_task(produce())
+    getter = None
+
+    try:
+        while True:
+            if getter is None:
+                getter = asyncio.ensure_future(chunks.get())
+
+            # the getter is kept between timeouts, so no chunk is lost
+            done, _ = await asyncio.wait((getter,), timeout=flush_timeout)
+            if not done:
+                # chunks in the queue always precede the contents of the buffer,
+                # and the queue is empty here
+                if buffer.size:
+                    yield buffer.take()
+                continue
+
+            chunk = getter.result()
+            getter = None
+
+            if chunk is _DONE:
+                break
+            if isinstance(chunk, Exception):
+                raise chunk
+
+            yield chunk
+    finally:
+        for task in (getter, producer):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
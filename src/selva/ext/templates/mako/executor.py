@@ -0,0 +1,38 @@
+from mako.lookup import TemplateLookup
+
+from selva.ext.templates.mako.string_templates import StringTemplateCache
+
+__all__ = ("init_process", "render_in_process")
+
+# template lookup of a rendering worker process
+_lookup: TemplateLookup | None = None
+_string_templates: StringTemplateCache | None = None
+
+
+def init_process(lookup_options: dict, string_cache_size: int):
+    global _lookup, _string_templates  # pylint: disable=global-statement
+    _lookup = TemplateLookup(**lookup_options)
+    _string_templates = StringTemplateCache(_lookup, string_cache_size)
+
+
+def render_in_process(
+    template_name: str | None,
+    source: str | None,
+    context: dict,
+    def_name: str | None = None,
+):
+    """Render a template in a worker process
+
+    Templates are looked up by name, or compiled from `source` if given, since
+    compiled templates cannot be sent between processes.
+    """
+
+    if source is not None:
+        template = _string_templates.get_template(source)
+    else:
+        template = _lookup.get_template(template_name)
+
+    if def_name:
+        template = template.get_def(def_name)
+
+    return template.render(**context)
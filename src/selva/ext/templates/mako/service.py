@@ -1,11 +1,18 @@
+import asyncio
+import functools
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Annotated
 
 from asgikit.responses import Response, respond_text
 from mako.lookup import TemplateLookup
+from mako.template import DefTemplate, Template
 
 from selva.configuration import Settings
 from selva.di import Inject, service
+from selva.ext.templates.mako.executor import init_process, render_in_process
 from selva.ext.templates.mako.settings import MakoTemplateSettings
+from selva.ext.templates.mako.string_templates import StringTemplateCache
 
 
 @service
@@ -13,14 +20,36 @@ class MakoTemplate:
     settings: Annotated[Settings, Inject]
 
     lookup: TemplateLookup = None
+    executor: Executor | None = None
 
     def initialize(self):
         mako_settings = MakoTemplateSettings.model_validate(
             self.settings.templates.mako
         )
 
-        kwargs = mako_settings.model_dump(exclude_none=True)
+        kwargs = mako_settings.model_dump(
+            exclude={"executor", "string_cache_size"}, exclude_none=True
+        )
         self.lookup = TemplateLookup(**kwargs)
+        self.string_templates = StringTemplateCache(
+            self.lookup, mako_settings.string_cache_size
+        )
+
+        self.executor_settings = mako_settings.executor
+        self.executor = _make_executor(mako_settings, kwargs)
+
+        # size of the last output of each template, to decide if it is rendered inline,
+        # dropped along with evicted templates
+        self._output_sizes: weakref.WeakKeyDictionary[Template, int] = (
+            weakref.WeakKeyDictionary()
+        )
+
+        # defs of file templates, replaced when the template is reloaded
+        self._defs: dict[tuple[str, str], DefTemplate] = {}
+
+    def finalize(self):
+        if self.executor:
+            self.executor.shutdown(cancel_futures=True)
 
     # pylint: disable=too-many-arguments
     async def respond(
@@ -30,24 +59,107 @@ class MakoTemplate:
         context: dict,
         *,
         content_type: str | None = None,
+        def_name: str | None = None,
     ):
+        """Render a template to the response
+
+        :param def_name: Render only the def with this name, for partial updates
+        """
+
         if content_type:
             response.content_type = content_type
         elif not response.content_type:
             response.content_type = "text/html"
 
-        template = self.lookup.get_template(template_name)
-        rendered = template.render(**context)
+        if def_name:
+            rendered = await self.render_def(template_name, def_name, context)
+        else:
+            rendered = await self.render(template_name, context)
         await respond_text(response, rendered)
 
     async def render(self, template_name: str, context: dict) -> str:
         template = self.lookup.get_template(template_name)
-        return template.render(**context)
+        return await self._render(template, template_name, None, context)
+
+    async def render_def(self, template_name: str, def_name: str, context: dict) -> str:
+        """Render a single def of a template
+
+        Defs are compiled with the template, so rendering a def only costs the
+        def itself, not the whole template.
+        """
+
+        template = self.lookup.get_template(template_name)
+        def_template = self._get_def(template, def_name)
+        return await self._render(def_template, template_name, None, context, def_name)
 
     async def render_str(self, source: str, context: dict) -> str:
-        template_hash = str(hash(source))
-        if not self.lookup.has_template(template_hash):
-            self.lookup.put_string(template_hash, source)
+        template = self.string_templates.get_template(source)
+        return await self._render(template, None, source, context)
+
+    def _get_def(self, template: Template, def_name: str) -> DefTemplate:
+        key = (template.uri, def_name)
+        def_template = self._defs.get(key)
+
+        if def_template is None or def_template.parent is not template:
+            if not template.has_def(def_name):
+                raise ValueError(
+                    f"def '{def_name}' not found in template '{template.uri}'"
+                )
+
+            def_template = self._defs[key] = template.get_def(def_name)
+
+        return def_template
+
+    async def _render(
+        self,
+        template: Template,
+        template_name: str | None,
+        source: str | None,
+        context: dict,
+        def_name: str | None = None,
+    ) -> str:
+        if not self.executor or self._render_inline(template):
+            rendered = template.render(**context)
+        elif isinstance(self.executor, ProcessPoolExecutor):
+            rendered = await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                render_in_process,
+                template_name,
+                source,
+                context,
+                def_name,
+            )
+        else:
+            rendered = await asyncio.get_running_loop().run_in_executor(
+                self.executor, functools.partial(template.render, **context)
+            )
+
+        self._output_sizes[template] = len(rendered)
+        return rendered
+
+    def _render_inline(self, template: Template) -> bool:
+        threshold = self.executor_settings.inline_threshold
+        if threshold is None:
+            return False
+
+        size = self._output_sizes.get(template)
+        return size is not None and size < threshold
+
 
-        template = self.lookup.get_template(template_hash)
-        return template.render(**context)
+def _make_executor(
+    mako_settings: MakoTemplateSettings, lookup_options: dict
+) -> Executor | None:
+    executor_settings = mako_settings.executor
+    match executor_settings.type:
+        case "thread":
+            return ThreadPoolExecutor(
+                executor_settings.max_workers, thread_name_prefix="selva-mako"
+            )
+        case "process":
+            return ProcessPoolExecutor(
+                executor_settings.max_workers,
+                initializer=init_process,
+                initargs=(lookup_options, mako_settings.string_cache_size),
+            )
+        case _:
+            return None
@@ -6,6 +6,14 @@ from pydantic import BaseModel, ConfigDict, Field
 from selva._util.pydantic import DottedPath
 
 
+class MakoExecutorSettings(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    type: Literal["inline", "thread", "process"] = "inline"
+    max_workers: int = None
+    inline_threshold: int = None
+
+
 class MakoTemplateSettings(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -35,3 +43,5 @@ class MakoTemplateSettings(BaseModel):
     preprocessor: DottedPath[Callable] = None
     lexer_cls: DottedPath[type] = None
     include_error_handler: DottedPath[Callable] = None
+    string_cache_size: int = Field(100, gt=0)
+    executor: MakoExecutorSettings = Field(default_factory=MakoExecutorSettings)
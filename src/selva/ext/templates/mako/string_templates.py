@@ -0,0 +1,44 @@
+import hashlib
+from collections import OrderedDict
+
+from mako.lookup import TemplateLookup
+from mako.template import Template
+
+__all__ = ("StringTemplateCache",)
+
+
+class StringTemplateCache:
+    """Bounded cache of templates compiled from strings
+
+    Templates are looked up by their whole source, so different sources never
+    share a compiled template. When the cache is full, the least recently used
+    template is evicted.
+
+    :param lookup: Lookup used by the templates to resolve includes and inheritance
+    :param size: Maximum number of compiled templates
+    """
+
+    def __init__(self, lookup: TemplateLookup, size: int):
+        self.lookup = lookup
+        self.size = size
+        self._templates: OrderedDict[str, Template] = OrderedDict()
+
+    def __len__(self):
+        return len(self._templates)
+
+    def get_template(self, source: str) -> Template:
+        if (template := self._templates.get(source)) is not None:
+            self._templates.move_to_end(source)
+            return template
+
+        # templates are not added to the lookup collection, which is never evicted
+        uri = "string:" + hashlib.sha256(source.encode()).hexdigest()
+        template = Template(
+            source, lookup=self.lookup, uri=uri, **self.lookup.template_args
+        )
+
+        self._templates[source] = template
+        if len(self._templates) > self.size:
+            self._templates.popitem(last=False)
+
+        return template
@@ -1,18 +1,33 @@
+import datetime
+import fnmatch
 import logging
 import logging.config
+import math
+import queue
+import random
 import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Callable
 
 import structlog
 
 from selva.configuration.settings import Settings
 
+__all__ = (
+    "BatchStreamHandler",
+    "BoundedQueueHandler",
+    "Logger",
+    "SamplingProcessor",
+    "SamplingRule",
+    "flush_handlers",
+    "get_logger",
+    "setup",
+)
 
-def setup(settings: Settings):
-    structlog.configure(
-        processors=[structlog.stdlib.ProcessorFormatter.wrap_for_formatter],
-        logger_factory=structlog.stdlib.LoggerFactory(),
-    )
 
+def setup(settings: Settings):
     log_format = settings.logging.get("format")
     if not log_format:
         log_format = "console" if sys.stderr.isatty() else "json"
@@ -28,21 +43,79 @@ def setup(settings: Settings):
     else:
         raise ValueError("Unknown log format")
 
-    processors = [
-        structlog.stdlib.filter_by_level,
-        structlog.contextvars.merge_contextvars,
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.stdlib.add_logger_name,
-        structlog.processors.add_log_level,
-        structlog.processors.StackInfoRenderer(),
-        structlog.stdlib.ProcessorFormatter.remove_processors_meta,
-    ]
+    queue_settings = settings.logging.get("queue")
+    if queue_settings is True:
+        queue_settings = {}
+    elif queue_settings is False:
+        queue_settings = None
+
+    if queue_settings is None:
+        pre_processors = []
+        foreign_pre_chain = None
+        processors = [
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.stdlib.add_logger_name,
+            structlog.processors.add_log_level,
+            structlog.processors.StackInfoRenderer(),
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+        ]
+    else:
+        # context, timestamp and stack must be captured in the thread that logs,
+        # before the record is sent to the thread that renders it
+        pre_processors = [
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.StackInfoRenderer(),
+            _resolve_exc_info,
+        ]
+        foreign_pre_chain = [_merge_record_contextvars, _record_timestamp]
+        processors = [
+            structlog.stdlib.add_logger_name,
+            structlog.processors.add_log_level,
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+        ]
+
+    if sampling_settings := settings.logging.get("sampling"):
+        # events are sampled before any other work is done on them
+        pre_processors.insert(
+            0,
+            SamplingProcessor(
+                [SamplingRule(**rule) for rule in sampling_settings.get("rules", [])],
+                report_interval=sampling_settings.get("report_interval", 60),
+            ),
+        )
+
+    # records from the standard library are already filtered by their loggers
+    structlog.configure(
+        processors=[
+            structlog.stdlib.filter_by_level,
+            *pre_processors,
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+    )
 
     if not isinstance(renderer, structlog.dev.ConsoleRenderer):
         processors.append(structlog.processors.dict_tracebacks)
 
     processors.append(renderer)
 
+    if queue_settings is None:
+        handler = {
+            "class": "logging.StreamHandler",
+            "formatter": "structlog",
+        }
+    else:
+        handler = {
+            "()": BoundedQueueHandler,
+            "handler": BatchStreamHandler(),
+            "max_size": queue_settings.get("max_size", 10000),
+            "overflow": queue_settings.get("overflow", "drop"),
+            "batch_size": queue_settings.get("batch_size", 100),
+            "formatter": "structlog",
+        }
+
     logging_config = {
         "version": 1,
         "disable_existing_loggers": False,
@@ -50,13 +123,11 @@ def setup(settings: Settings):
             "structlog": {
                 "()": structlog.stdlib.ProcessorFormatter,
                 "processors": processors,
+                "foreign_pre_chain": foreign_pre_chain,
             },
         },
         "handlers": {
-            "console": {
-                "class": "logging.StreamHandler",
-                "formatter": "structlog",
-            }
+            "console": handler,
         },
         "root": {
             "handlers": ["console"],
@@ -69,3 +140,449 @@ def setup(settings: Settings):
     }
 
     logging.config.dictConfig(logging_config)
+
+
+def flush_handlers():
+    """Flush the handlers of the root logger
+
+    The counts of events suppressed by sampling are reported first, and, with
+    the queue handler, wait until the queued records are written.
+    """
+
+    for processor in structlog.get_config()["processors"]:
+        if isinstance(processor, SamplingProcessor):
+            processor.report()
+
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
+class Logger:
+    """Structlog logger that checks if the level is enabled before logging
+
+    The check uses the standard library logger of the same name, which caches
+    the result until the logging configuration changes, so disabled calls skip
+    the processor chain. Arguments that are costly to build should be guarded
+    with `is_enabled_for`.
+    """
+
+    def __init__(self, name: str, logger=None):
+        self.name = name
+        self._stdlib_logger = logging.getLogger(name)
+        self._logger = logger if logger is not None else structlog.get_logger(name)
+
+    def is_enabled_for(self, level: int) -> bool:
+        return self._stdlib_logger.isEnabledFor(level)
+
+    def bind(self, **kwargs) -> "Logger":
+        """Logger of the same name that adds `kwargs` to its events"""
+
+        return Logger(self.name, self._logger.bind(**kwargs))
+
+    def log(self, level: int, event, *args, **kwargs):
+        if self._stdlib_logger.isEnabledFor(level):
+            self._logger.log(level, event, *args, **kwargs)
+
+    def debug(self, event, *args, **kwargs):
+        if self._stdlib_logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(event, *args, **kwargs)
+
+    def info(self, event, *args, **kwargs):
+        if self._stdlib_logger.isEnabledFor(logging.INFO):
+            self._logger.info(event, *args, **kwargs)
+
+    def warning(self, event, *args, **kwargs):
+        if self._stdlib_logger.isEnabledFor(logging.WARNING):
+            self._logger.warning(event, *args, **kwargs)
+
+    def error(self, event, *args, **kwargs):
+        if self._stdlib_logger.isEnabledFor(logging.ERROR):
+            self._logger.error(event, *args, **kwargs)
+
+    def exception(self, event, *args, **kwargs):
+        if self._stdlib_logger.isEnabledFor(logging.ERROR):
+            self._logger.exception(event, *args, **kwargs)
+
+    def critical(self, event, *args, **kwargs):
+        if self._stdlib_logger.isEnabledFor(logging.CRITICAL):
+            self._logger.critical(event, *args, **kwargs)
+
+
+def get_logger(name: str) -> Logger:
+    """Get a logger that skips disabled levels
+
+    Giving the name also avoids inspecting the stack to find the caller module.
+    """
+
+    return Logger(name)
+
+
+_CONTEXTVARS_ATTR = "selva_contextvars"
+
+
+def _merge_record_contextvars(_logger, _method_name, event_dict):
+    if record := event_dict.get("_record"):
+        for key, value in getattr(record, _CONTEXTVARS_ATTR, {}).items():
+            event_dict.setdefault(key, value)
+    return event_dict
+
+
+def _resolve_exc_info(_logger, _method_name, event_dict):
+    # 'sys.exc_info()' is empty in the thread that renders the record
+    if event_dict.get("exc_info") is True:
+        event_dict["exc_info"] = sys.exc_info()
+    return event_dict
+
+
+def _record_timestamp(_logger, _method_name, event_dict):
+    if record := event_dict.get("_record"):
+        timestamp = datetime.datetime.fromtimestamp(record.created, datetime.UTC)
+        event_dict["timestamp"] = timestamp.isoformat().replace("+00:00", "Z")
+    return event_dict
+
+
+class BatchStreamHandler(logging.StreamHandler):
+    """Stream handler that writes a batch of records at once"""
+
+    def emit(self, record: logging.LogRecord):
+        self.emit_batch([record])
+
+    def emit_batch(self, records: list[logging.LogRecord]):
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.format(record) + self.terminator)
+            except RecursionError:
+                raise
+            except Exception:  # pylint: disable=broad-exception-caught
+                self.handleError(record)
+
+        if not lines:
+            return
+
+        # a single write, so the stream is flushed once for the whole batch
+        with self.lock:
+            self.stream.write("".join(lines))
+            self.flush()
+
+
+_STOP = object()
+
+
+class BoundedQueueHandler(logging.Handler):
+    """Send log records to a background thread that formats and writes them
+
+    Logging only puts the record in a queue, so rendering and writing the logs
+    does not block the event loop. When the queue is full, records are handled
+    according to the `overflow` policy:
+
+    - `drop`: the new record is dropped
+    - `drop_oldest`: the oldest record in the queue is dropped
+    - `block`: wait until there is room in the queue
+
+    The number of dropped records is kept in `dropped`, and reported in the log
+    when the queue has room again.
+
+    :param handler: Handler that writes the records in the background thread
+    :param max_size: Maximum number of records in the queue
+    :param overflow: What to do when the queue is full
+    :param batch_size: Maximum number of records written at once
+    """
+
+    def __init__(
+        self,
+        handler: BatchStreamHandler,
+        max_size: int = 10000,
+        overflow: str = "drop",
+        batch_size: int = 100,
+    ):
+        if overflow not in ("drop", "drop_oldest", "block"):
+            raise ValueError(f"invalid overflow policy: {overflow}")
+
+        super().__init__()
+        self.handler = handler
+        self.queue: queue.Queue = queue.Queue(max_size)
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._reported_dropped = 0
+
+        self._thread = threading.Thread(
+            target=self._run, name="selva-logging", daemon=True
+        )
+        self._thread.start()
+
+    def setFormatter(self, fmt: logging.Formatter | None):
+        # records are formatted by the handler in the background thread
+        self.handler.setFormatter(fmt)
+
+    def emit(self, record: logging.LogRecord):
+        if record.args:
+            # the arguments may change before the record is formatted in the
+            # background thread, so the message is resolved now
+            try:
+                record.msg = record.getMessage()
+            except Exception:  # pylint: disable=broad-exception-caught
+                self.handleError(record)
+                return
+            record.args = None
+
+        setattr(record, _CONTEXTVARS_ATTR, structlog.contextvars.get_contextvars())
+
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        match self.overflow:
+            case "block":
+                self.queue.put(record)
+            case "drop_oldest":
+                try:
+                    self.queue.get_nowait()
+                    self.queue.task_done()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+                try:
+                    self.queue.put_nowait(record)
+                except queue.Full:
+                    self.dropped += 1
+            case _:
+                self.dropped += 1
+
+    def flush(self):
+        """Wait until all queued records are written"""
+
+        if self._thread.is_alive():
+            self.queue.join()
+
+    def close(self):
+        if self._thread.is_alive():
+            # the stop marker must not be dropped, so wait for room in the queue
+            self.queue.put(_STOP)
+            self._thread.join()
+
+        self.handler.close()
+        super().close()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = [record for record in batch if record is not _STOP]
+
+            try:
+                self._write(records)
+            except Exception:  # pylint: disable=broad-exception-caught
+                # the thread must keep running, or the queue would never be emptied
+                self.handleError(records[0])
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+            if len(records) < len(batch):
+                return
+
+    def _write(self, records: list[logging.LogRecord]):
+        if (dropped := self.dropped - self._reported_dropped) > 0:
+            self._reported_dropped += dropped
+            records.append(
+                logging.LogRecord(
+                    __name__,
+                    logging.WARNING,
+                    __file__,
+                    0,
+                    "logging queue full, %d records dropped",
+                    (dropped,),
+                    None,
+                )
+            )
+
+        if records:
+            self.handler.emit_batch(records)
+
+
+_ERROR_METHODS = frozenset(("error", "exception", "critical", "fatal"))
+
+
+class SamplingRule:
+    """Events a sampling rule applies to and how they are sampled
+
+    :param logger: Name of the logger, also matches its children
+    :param event: The event message
+    :param path: Pattern, as in `fnmatch`, of the `path` of the event or bound
+    to the context
+    :param rate: Fraction of the events that are kept
+    :param slow: Events with a `duration` of at least this many seconds are
+    kept regardless of `rate`
+    :param rate_limit: Maximum number of identical events per second
+    :param burst: Number of identical events allowed at once, defaults to
+    `rate_limit`
+    """
+
+    def __init__(
+        self,
+        logger: str = None,
+        event: str = None,
+        path: str = None,
+        rate: float = 1.0,
+        slow: float = None,
+        rate_limit: float = None,
+        burst: int = None,
+    ):
+        if not 0 <= rate <= 1:
+            raise ValueError(f"invalid sampling rate: {rate}")
+
+        if rate_limit is not None and rate_limit <= 0:
+            raise ValueError(f"invalid rate limit: {rate_limit}")
+
+        if burst is None and rate_limit is not None:
+            burst = max(1, math.ceil(rate_limit))
+
+        self.logger = logger
+        self.event = event
+        self.path = path
+        self.rate = rate
+        self.slow = slow
+        self.rate_limit = rate_limit
+        self.burst = burst
+
+    def matches(self, logger_name: str, event_dict: dict) -> bool:
+        if self.event is not None and str(event_dict.get("event")) != self.event:
+            return False
+
+        if self.logger is not None and not (
+            logger_name == self.logger or logger_name.startswith(self.logger + ".")
+        ):
+            return False
+
+        if self.path is not None:
+            path = event_dict.get("path")
+            if path is None:
+                path = structlog.contextvars.get_contextvars().get("path")
+            if path is None or not fnmatch.fnmatchcase(path, self.path):
+                return False
+
+        return True
+
+    def is_slow(self, event_dict: dict) -> bool:
+        if self.slow is None:
+            return False
+
+        duration = event_dict.get("duration")
+        return isinstance(duration, int | float) and duration >= self.slow
+
+
+class SamplingProcessor:
+    """Structlog processor that drops part of the events matched by sampling rules
+
+    Each event is checked against the rules in order, and the first rule that
+    matches decides if it is kept:
+
+    - only a `rate` fraction of the events is kept, but errors and slow events
+      are always kept
+    - identical events, with the same logger, level and message, are limited to
+      `rate_limit` per second with a token bucket
+
+    Events that do not match any rule are kept. The number of suppressed events
+    is reported in the log every `report_interval` seconds, on the next event.
+
+    :param rules: Rules checked for each event
+    :param report_interval: Seconds between reports of suppressed events
+    :param max_buckets: Maximum number of rate limited events tracked at once
+    :param clock: Function that returns the current time, in seconds
+    """
+
+    def __init__(
+        self,
+        rules: list[SamplingRule],
+        report_interval: float = 60,
+        max_buckets: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rules = rules
+        self.report_interval = report_interval
+        self.max_buckets = max_buckets
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: OrderedDict[tuple, tuple[float, float]] = OrderedDict()
+        self._suppressed: Counter[tuple[str, str]] = Counter()
+        self._last_report = clock()
+
+    def __call__(self, logger, method_name: str, event_dict: dict) -> dict:
+        now = self._clock()
+        if now - self._last_report >= self.report_interval:
+            self.report()
+
+        logger_name = getattr(logger, "name", None) or ""
+
+        for rule in self.rules:
+            if rule.matches(logger_name, event_dict):
+                if not self._keep(rule, logger_name, method_name, event_dict, now):
+                    with self._lock:
+                        self._suppressed[logger_name, str(event_dict["event"])] += 1
+                    raise structlog.DropEvent
+                break
+
+        return event_dict
+
+    def report(self):
+        """Log the number of events suppressed since the last report"""
+
+        with self._lock:
+            self._last_report = self._clock()
+            suppressed, self._suppressed = self._suppressed, Counter()
+
+        reporter = logging.getLogger(__name__)
+        for (logger_name, event), count in suppressed.items():
+            reporter.warning(
+                "%d '%s' events from %s suppressed", count, event, logger_name
+            )
+
+    def _keep(
+        self,
+        rule: SamplingRule,
+        logger_name: str,
+        method_name: str,
+        event_dict: dict,
+        now: float,
+    ) -> bool:
+        if (
+            rule.rate < 1
+            and method_name not in _ERROR_METHODS
+            and not event_dict.get("exc_info")
+            and not rule.is_slow(event_dict)
+            and random.random() >= rule.rate
+        ):
+            return False
+
+        if rule.rate_limit is None:
+            return True
+
+        key = (logger_name, method_name, str(event_dict["event"]))
+
+        with self._lock:
+            if bucket := self._buckets.get(key):
+                tokens, last = bucket
+                tokens = min(rule.burst, tokens + (now - last) * rule.rate_limit)
+                self._buckets.move_to_end(key)
+            else:
+                tokens = rule.burst
+
+            keep = tokens >= 1
+            if keep:
+                tokens -= 1
+
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+
+        return keep
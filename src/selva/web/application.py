@@ -1,4 +1,6 @@
 import asyncio
+import logging
+import time
 import traceback
 from http import HTTPStatus
 
@@ -14,6 +16,7 @@ from selva.configuration.settings import Settings, get_settings
 from selva.di.call import call_with_dependencies
 from selva.di.container import Container
 from selva.ext.error import ExtensionMissingInitFunctionError, ExtensionNotFoundError
+from selva.logging import flush_handlers, get_logger
 from selva.web.exception import HTTPException, HTTPNotFoundException, WebSocketException
 from selva.web.exception_handler.discover import find_exception_handlers
 from selva.web.handler.call import call_handler
@@ -21,7 +24,7 @@ from selva.web.lifecycle.discover import find_background_services, find_startup_
 from selva.web.middleware.exception_handler import exception_handler_middleware
 from selva.web.routing.router import Router
 
-logger = structlog.get_logger()
+logger = get_logger(__name__)
 
 
 def _init_settings(settings: Settings | None) -> Settings:
@@ -129,6 +132,9 @@ class Selva:
 
         await self.di.run_finalizers()
 
+        # write the log records still queued, if logging uses a queue
+        await asyncio.to_thread(flush_handlers)
+
     async def _handle_lifespan(self, _scope, receive, send):
         while True:
             message = await receive()
@@ -155,6 +161,32 @@ class Selva:
                 break
 
     async def _handle_request(self, scope, receive, send):
+        # events logged while handling the request, including by middleware and
+        # the handler, can be matched by path in the sampling rules
+        with structlog.contextvars.bound_contextvars(path=scope["path"]):
+            if scope["type"] != "http" or not logger.is_enabled_for(logging.INFO):
+                await self._process_request(scope, receive, send)
+                return
+
+            status = None
+
+            async def send_wrapper(message: dict):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                await send(message)
+
+            start = time.perf_counter()
+            await self._process_request(scope, receive, send_wrapper)
+
+            logger.info(
+                "request handled",
+                method=scope["method"],
+                status=status,
+                duration=time.perf_counter() - start,
+            )
+
+    async def _process_request(self, scope, receive, send):
         request = Request(scope, receive, send)
 
         try:
@@ -202,12 +234,13 @@ class Selva:
         request = Request(scope, receive, send)
         path = request.path
 
-        logger.debug(
-            "handling request",
-            method=str(request.method),
-            path=path,
-            query=request.query,
-        )
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                "handling request",
+                method=str(request.method),
+                path=path,
+                query=request.query,
+            )
 
         match = self.router.match(request.method, path)
 
@@ -0,0 +1,105 @@
+from collections.abc import AsyncIterable, Iterator
+from http import HTTPStatus
+
+from asgikit.requests import Body, Request
+
+from selva._util.compression import (
+    DecompressionError,
+    Decompressor,
+    make_decompressor,
+)
+from selva.web.exception import HTTPBadRequestException, HTTPException
+
+__all__ = ("DecodedBody", "decode_body")
+
+# size of the chunks produced by each decompression step
+DECOMPRESS_CHUNK_SIZE = 64 * 1024
+
+
+class DecodedBody(Body):
+    """Request body that decompresses its data according to 'content-encoding'
+
+    Data is decompressed incrementally as it is received, so the compressed body
+    is never buffered, and reading fails with 'HTTP 413 Content Too Large' once
+    the decompressed data exceeds `max_size`.
+    """
+
+    __slots__ = ("_encodings", "_max_size")
+
+    def __init__(self, request: Request, encodings: list[str], max_size: int):
+        super().__init__(request.scope, request.asgi_receive, request.headers)
+        self._encodings = encodings
+        self._max_size = max_size
+
+    @property
+    def content_length(self) -> int | None:
+        # length of the decompressed body is not known in advance
+        return None
+
+    @property
+    def encodings(self) -> list[str]:
+        return self._encodings
+
+    async def __aiter__(self) -> AsyncIterable[bytes]:
+        # content codings are listed in the order they were applied
+        decompressors = [make_decompressor(e) for e in reversed(self._encodings)]
+        size = 0
+
+        try:
+            async for data in super().__aiter__():
+                for chunk in _decompress(decompressors, data):
+                    size += len(chunk)
+                    if size > self._max_size:
+                        raise HTTPException(status=HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+                    yield chunk
+
+            for chunk in _flush(decompressors):
+                size += len(chunk)
+                if size > self._max_size:
+                    raise HTTPException(status=HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+                yield chunk
+        except DecompressionError as err:
+            raise HTTPBadRequestException() from err
+
+
+def _decompress(decompressors: list[Decompressor], data: bytes) -> Iterator[bytes]:
+    first, *rest = decompressors
+    for chunk in first.decompress(data, DECOMPRESS_CHUNK_SIZE):
+        if rest:
+            yield from _decompress(rest, chunk)
+        else:
+            yield chunk
+
+
+def _flush(decompressors: list[Decompressor]) -> Iterator[bytes]:
+    first, *rest = decompressors
+    for chunk in first.flush():
+        if rest:
+            yield from _decompress(rest, chunk)
+        else:
+            yield chunk
+
+    if rest:
+        yield from _flush(rest)
+
+
+def decode_body(request: Request, max_size: int) -> Body:
+    """Get the request body, decompressing it if it has a 'content-encoding'
+
+    :raise HTTPException: With status 'HTTP 415 Unsupported Media Type' if the
+    content coding is not supported
+    """
+
+    encodings = [
+        encoding.lower()
+        for encoding in request.headers.get_all("content-encoding", [])
+        if encoding and encoding.lower() != "identity"
+    ]
+
+    if not encodings:
+        return request.body
+
+    if any(make_decompressor(encoding) is None for encoding in encodings):
+        raise HTTPException(status=HTTPStatus.UNSUPPORTED_MEDIA_TYPE)
+
+    return DecodedBody(request, encodings, max_size)
@@ -7,9 +7,11 @@ from asgikit.requests import Body, Request
 
 from selva._util.base_types import get_base_types
 from selva._util.maybe_async import maybe_async
+from selva.configuration.settings import Settings
 from selva.di.container import Container
 from selva.di.error import ServiceNotFoundError
 from selva.di.inject import Inject
+from selva.web.converter.body import decode_body
 from selva.web.converter.converter import Converter
 from selva.web.converter.decorator import register_from_request
 from selva.web.converter.error import (
@@ -31,6 +33,7 @@ from selva.web.exception import HTTPBadRequestException
 @register_from_request(FromBody)
 class BodyFromRequest(FromBody):
     di: Annotated[Container, Inject]
+    settings: Annotated[Settings, Inject]
 
     async def from_request(
         self,
@@ -57,10 +60,19 @@ class BodyFromRequest(FromBody):
             if converter := await self.di.get(
                 Converter[Body, base_type], optional=True
             ):
-                return await maybe_async(converter.convert(request.body, original_type))
+                body = self._get_body(request)
+                return await maybe_async(converter.convert(body, original_type))
 
         raise MissingConverterImplError(original_type)
 
+    def _get_body(self, request: Request) -> Body:
+        decompression = self.settings.request.decompression
+
+        if not decompression["enabled"]:
+            return request.body
+
+        return decode_body(request, int(decompression["max_size"]))
+
 
 T_EXTRACTOR = TypeVar("T_EXTRACTOR")
 
@@ -0,0 +1,239 @@
+import asyncio
+from collections.abc import Callable
+
+from selva._util.compression import Compressor, make_compressor, supported_encodings
+from selva.configuration.settings import Settings
+from selva.di.container import Container
+
+__all__ = ("CompressionMiddleware", "compression_middleware")
+
+
+def parse_accept_encoding(value: str) -> dict[str, float]:
+    """Parse the 'accept-encoding' header into a mapping of coding to q-value"""
+
+    result = {}
+    for item in value.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+
+        quality = 1.0
+        for param in params:
+            name, _, param_value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(param_value)
+                except ValueError:
+                    quality = 0.0
+
+        result[coding.lower()] = quality
+
+    return result
+
+
+def select_encoding(accept_encoding: str, encodings: list[str]) -> str | None:
+    """Select the content coding to use from the ones accepted by the client
+
+    Codings accepted with the same q-value are chosen in the order of `encodings`
+    """
+
+    accepted = parse_accept_encoding(accept_encoding)
+    default_quality = accepted.get("*", 0.0)
+
+    selected, selected_quality = None, 0.0
+    for encoding in encodings:
+        quality = accepted.get(encoding, default_quality)
+        if quality > selected_quality:
+            selected, selected_quality = encoding, quality
+
+    return selected
+
+
+class CompressionMiddleware:
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        app: Callable,
+        encodings: list[str],
+        minimum_size: int,
+        content_types: list[str],
+        levels: dict[str, int],
+        thread_threshold: int,
+    ):
+        self.app = app
+        self.encodings = encodings
+        self.minimum_size = minimum_size
+        self.content_types = tuple(content_types)
+        self.levels = levels
+        self.thread_threshold = thread_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = b", ".join(
+            value
+            for name, value in scope["headers"]
+            if name.lower() == b"accept-encoding"
+        )
+
+        encoding = select_encoding(accept_encoding.decode("latin-1"), self.encodings)
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+
+        responder = CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder)
+
+    def is_compressible(self, content_type: str) -> bool:
+        return content_type.lower().startswith(self.content_types)
+
+
+class CompressionResponder:
+    """Wraps the asgi 'send' callable to compress the response body
+
+    The 'http.response.start' message is held until the first body message, so
+    the decision whether to compress can take the body size into account.
+    Bodies sent in a single message are compressed at once, while streamed bodies
+    are compressed incrementally and flushed on each message, so clients receive
+    data as soon as it is produced.
+    """
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start_message: dict | None = None
+        self.compressor: Compressor | None = None
+        self.passthrough = False
+
+    async def __call__(self, message: dict):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.start_message = message
+            self.passthrough = not self._should_compress(message)
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self._send_start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self._send_start()
+                await self.send(message)
+                return
+
+            self.compressor = make_compressor(
+                self.encoding, self.middleware.levels.get(self.encoding)
+            )
+
+            if not more_body:
+                data = await self._compress(body, finish=True)
+                self._set_compression_headers(len(data))
+                await self._send_start()
+                await self.send({**message, "body": data})
+                return
+
+            self._set_compression_headers(None)
+            await self._send_start()
+
+        data = await self._compress(body, finish=not more_body)
+        await self.send({**message, "body": data, "more_body": more_body})
+
+    def _should_compress(self, message: dict) -> bool:
+        # compressing a byte range would corrupt it
+        if message.get("status", 200) in (204, 206, 304):
+            return False
+
+        content_type = None
+        content_length = None
+
+        for name, value in message.get("headers", []):
+            match name.lower():
+                case b"content-encoding" | b"content-range":
+                    return False
+                case b"cache-control" if b"no-transform" in value.lower():
+                    return False
+                case b"content-type":
+                    content_type = value.decode("latin-1")
+                case b"content-length":
+                    content_length = int(value)
+
+        if not content_type or not self.middleware.is_compressible(content_type):
+            return False
+
+        if content_length is not None:
+            return content_length >= self.middleware.minimum_size
+
+        return True
+
+    def _set_compression_headers(self, content_length: int | None):
+        headers = []
+        vary = []
+
+        for name, value in self.start_message.get("headers", []):
+            match name.lower():
+                case b"content-length":
+                    continue
+                case b"vary":
+                    vary.append(value)
+                    continue
+                case b"etag" if value[:2].upper() != b"W/":
+                    # compressed content is not byte-for-byte the same
+                    value = b"W/" + value
+
+            headers.append((name, value))
+
+        if not any(b"accept-encoding" in v.lower() or v == b"*" for v in vary):
+            vary.append(b"accept-encoding")
+
+        headers.append((b"vary", b", ".join(vary)))
+        headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode("latin-1")))
+
+        self.start_message = {**self.start_message, "headers": headers}
+
+    async def _send_start(self):
+        if self.start_message is not None:
+            message, self.start_message = self.start_message, None
+            await self.send(message)
+
+    async def _compress(self, data: bytes, finish: bool) -> bytes:
+        if len(data) >= self.middleware.thread_threshold:
+            return await asyncio.to_thread(self._compress_sync, data, finish)
+
+        return self._compress_sync(data, finish)
+
+    def _compress_sync(self, data: bytes, finish: bool) -> bytes:
+        compressed = self.compressor.compress(data) if data else b""
+        if finish:
+            return compressed + self.compressor.finish()
+        return compressed + self.compressor.flush()
+
+
+def compression_middleware(app, settings: Settings, di: Container):
+    settings = settings.compression
+    available = supported_encodings()
+
+    encodings = [e for e in settings.encodings if e in available]
+    if not encodings:
+        raise ValueError("No supported compression encoding defined")
+
+    return CompressionMiddleware(
+        app,
+        encodings=encodings,
+        minimum_size=int(settings.minimum_size),
+        content_types=list(settings.content_types),
+        levels=dict(settings.get("levels", {})),
+        thread_threshold=int(settings.thread_threshold),
+    )
@@ -1,17 +1,18 @@
 import functools
+import logging
 from functools import cache
 
-import structlog
 from asgikit.requests import Request
 
 from selva._util.base_types import get_base_types
 from selva.configuration.settings import Settings
 from selva.di.container import Container
+from selva.logging import get_logger
 from selva.web.exception_handler.decorator import ExceptionHandlerType
 from selva.web.exception_handler.discover import find_exception_handlers
 from selva.web.handler.call import call_handler
 
-logger = structlog.get_logger()
+logger = get_logger(__name__)
 
 
 def exception_handler_middleware(app, settings: Settings, di: Container):
@@ -30,11 +31,12 @@ class ExceptionHandlerMiddleware:
             await self.app(scope, receive, send)
         except Exception as err:
             if handler := self._get_exception_handler(err):
-                logger.debug(
-                    "Handling exception with handler",
-                    module=handler.__module__,
-                    handler=handler.__qualname__,
-                )
+                if logger.is_enabled_for(logging.DEBUG):
+                    logger.debug(
+                        "Handling exception with handler",
+                        module=handler.__module__,
+                        handler=handler.__qualname__,
+                    )
 
                 request = Request(scope, receive, send)
                 await call_handler(
@@ -0,0 +1,36 @@
+from asgikit.requests import Request
+from asgikit.responses import respond_text
+
+from selva.ext.data.cache.decorator import cache_response
+from selva.web import get
+
+COUNTER = {"value": 0}
+
+
+def _next_value() -> str:
+    COUNTER["value"] += 1
+    return str(COUNTER["value"])
+
+
+@get("cached")
+@cache_response(60)
+async def cached(request: Request):
+    await respond_text(request.response, _next_value())
+
+
+@get("vary")
+@cache_response(60, vary=["accept-language"])
+async def vary(request: Request):
+    await respond_text(request.response, _next_value())
+
+
+@get("no_store")
+@cache_response(60)
+async def no_store(request: Request):
+    request.response.header("cache-control", "no-store")
+    await respond_text(request.response, _next_value())
+
+
+@get("not_cached")
+async def not_cached(request: Request):
+    await respond_text(request.response, _next_value())
@@ -0,0 +1,237 @@
+import asyncio
+from typing import Annotated
+
+import pytest
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.di.container import Container
+from selva.di.decorator import service
+from selva.di.inject import Inject
+from selva.ext.data.cache import CacheStore, cached, init_extension
+from selva.ext.data.cache.store import MemoryCacheStore
+
+
+@service
+class Repository:
+    def __init__(self):
+        self.calls = 0
+
+    async def load(self, item_id: int) -> dict | None:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"id": item_id} if item_id > 0 else None
+
+
+@service
+class CachedService:
+    repository: Annotated[Repository, Inject]
+
+    @cached(ttl=60, negative_ttl=60)
+    async def get_item(self, item_id: int):
+        return await self.repository.load(item_id)
+
+    @cached(ttl=60, key="item:{item_id}")
+    async def get_item_with_key(self, item_id: int):
+        return await self.repository.load(item_id)
+
+    @cached(ttl=60)
+    async def get_item_not_negative(self, item_id: int):
+        return await self.repository.load(item_id)
+
+    @cached(ttl=0.01, stale_ttl=60)
+    async def get_item_stale(self, item_id: int):
+        return {"id": item_id, "calls": await self._count()}
+
+    async def _count(self):
+        await self.repository.load(1)
+        return self.repository.calls
+
+
+async def _make_container() -> Container:
+    settings = Settings(
+        default_settings | {"data": {"cache": {"default": {"backend": "memory"}}}}
+    )
+
+    container = Container()
+    container.define(Container, container)
+    container.define(Settings, settings)
+    init_extension(container, settings)
+    container.register(Repository)
+    container.register(CachedService)
+
+    return container
+
+
+async def test_cached_method():
+    container = await _make_container()
+    cached_service = await container.get(CachedService)
+
+    first = await cached_service.get_item(1)
+    second = await cached_service.get_item(1)
+
+    assert first == second == {"id": 1}
+    assert cached_service.repository.calls == 1
+
+
+async def test_cached_method_store_is_bound_per_instance():
+    first_container = await _make_container()
+    second_container = await _make_container()
+
+    first = await first_container.get(CachedService)
+    second = await second_container.get(CachedService)
+
+    first_store = await first_container.get(CacheStore)
+    second_store = await second_container.get(CacheStore)
+
+    await first.get_item(1)
+    await second.get_item(2)
+
+    assert len(first_store) == 1
+    assert len(second_store) == 1
+    assert CachedService.get_item.store is None
+
+
+@service
+class SlottedCachedService:
+    __slots__ = ("calls",)
+
+    def __init__(self):
+        self.calls = 0
+
+    @cached(ttl=60)
+    async def get_item(self, item_id: int):
+        self.calls += 1
+        return {"id": item_id}
+
+
+async def test_cached_method_on_service_with_slots():
+    container = await _make_container()
+    container.register(SlottedCachedService)
+    cached_service = await container.get(SlottedCachedService)
+
+    await cached_service.get_item(1)
+    await cached_service.get_item(1)
+
+    assert cached_service.calls == 1
+
+
+async def test_argument_with_default_repr_should_fail():
+    @cached(ttl=60)
+    async def function(value):
+        return value
+
+    function.bind(MemoryCacheStore())
+
+    with pytest.raises(TypeError, match="argument 'value'"):
+        await function(object())
+
+
+async def test_empty_memory_store_should_be_resolved_from_cache():
+    container = Container()
+    store = MemoryCacheStore()
+    container.define(MemoryCacheStore, store)
+
+    assert await container.get(MemoryCacheStore) is store
+
+
+async def test_cached_method_distinct_arguments():
+    container = await _make_container()
+    cached_service = await container.get(CachedService)
+
+    await cached_service.get_item(1)
+    await cached_service.get_item(item_id=2)
+    await cached_service.get_item(item_id=1)
+
+    assert cached_service.repository.calls == 2
+
+
+async def test_concurrent_calls_should_share_single_call():
+    container = await _make_container()
+    cached_service = await container.get(CachedService)
+
+    results = await asyncio.gather(*[cached_service.get_item(3) for _ in range(10)])
+
+    assert all(result == {"id": 3} for result in results)
+    assert cached_service.repository.calls == 1
+
+
+async def test_negative_cache():
+    container = await _make_container()
+    cached_service = await container.get(CachedService)
+
+    assert await cached_service.get_item(-1) is None
+    assert await cached_service.get_item(-1) is None
+    assert cached_service.repository.calls == 1
+
+    assert await cached_service.get_item_not_negative(-1) is None
+    assert await cached_service.get_item_not_negative(-1) is None
+    assert cached_service.repository.calls == 3
+
+
+async def test_key_template():
+    container = await _make_container()
+    cached_service = await container.get(CachedService)
+    store = await container.get(CacheStore)
+
+    await cached_service.get_item_with_key(5)
+
+    assert f"{CachedService.get_item_with_key.prefix}:item:5" in store
+
+
+async def test_invalidate():
+    container = await _make_container()
+    cached_service = await container.get(CachedService)
+
+    await cached_service.get_item(1)
+    await cached_service.get_item.invalidate(1)
+    await cached_service.get_item(1)
+
+    assert cached_service.repository.calls == 2
+
+
+async def test_stale_while_revalidate():
+    container = await _make_container()
+    cached_service = await container.get(CachedService)
+
+    first = await cached_service.get_item_stale(1)
+    await asyncio.sleep(0.02)
+
+    stale = await cached_service.get_item_stale(1)
+    assert stale == first
+
+    await asyncio.sleep(0.05)
+    refreshed = await cached_service.get_item_stale(1)
+    assert refreshed["calls"] > first["calls"]
+
+
+async def test_cached_function_with_bound_store():
+    calls = []
+
+    @cached(ttl=60)
+    async def function(value: int):
+        calls.append(value)
+        return value * 2
+
+    function.bind(MemoryCacheStore())
+
+    assert await function(2) == 4
+    assert await function(2) == 4
+    assert calls == [2]
+
+
+async def test_unbound_cached_function_should_fail():
+    @cached(ttl=60)
+    async def function():
+        pass
+
+    with pytest.raises(RuntimeError):
+        await function()
+
+
+def test_cached_sync_function_should_fail():
+    with pytest.raises(TypeError):
+
+        @cached(ttl=60)
+        def function():
+            pass
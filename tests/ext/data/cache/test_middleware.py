@@ -0,0 +1,114 @@
+from httpx import ASGITransport, AsyncClient
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.ext.data.cache.middleware import decode_entry, encode_entry
+from selva.web.application import Selva
+
+
+async def _make_client() -> AsyncClient:
+    settings = Settings(
+        default_settings
+        | {
+            "application": f"{__package__}.application",
+            "extensions": ["selva.ext.data.cache"],
+            "middleware": ["selva.ext.data.cache.middleware:response_cache_middleware"],
+            "data": {"cache": {"default": {"backend": "memory"}}},
+        }
+    )
+
+    app = Selva(settings)
+    await app._lifespan_startup()
+
+    return AsyncClient(transport=ASGITransport(app=app))
+
+
+def test_encode_decode_entry():
+    headers = [(b"content-type", b"text/plain"), (b"content-length", b"5")]
+    entry = encode_entry(200, headers, b"value", 1000.0)
+
+    assert decode_entry(entry) == (200, 1000.0, headers, b"value")
+
+
+async def test_cached_response():
+    client = await _make_client()
+
+    first = await client.get("http://localhost:8000/cached")
+    second = await client.get("http://localhost:8000/cached")
+
+    assert first.text == second.text
+    assert "age" not in first.headers
+    assert second.headers["age"] == "0"
+    assert second.headers["content-type"] == first.headers["content-type"]
+
+
+async def test_normalized_query():
+    client = await _make_client()
+
+    first = await client.get("http://localhost:8000/cached?a=1&b=2")
+    second = await client.get("http://localhost:8000/cached?b=2&a=1")
+    third = await client.get("http://localhost:8000/cached?a=2&b=2")
+
+    assert first.text == second.text
+    assert first.text != third.text
+
+
+async def test_vary_header():
+    client = await _make_client()
+
+    en = await client.get(
+        "http://localhost:8000/vary", headers={"accept-language": "en"}
+    )
+    pt = await client.get(
+        "http://localhost:8000/vary", headers={"accept-language": "pt"}
+    )
+    en_again = await client.get(
+        "http://localhost:8000/vary", headers={"accept-language": "en"}
+    )
+
+    assert en.text != pt.text
+    assert en.text == en_again.text
+
+
+async def test_request_no_cache_should_refresh():
+    client = await _make_client()
+
+    first = await client.get("http://localhost:8000/cached?refresh")
+    second = await client.get(
+        "http://localhost:8000/cached?refresh", headers={"cache-control": "no-cache"}
+    )
+    third = await client.get("http://localhost:8000/cached?refresh")
+
+    assert first.text != second.text
+    assert second.text == third.text
+
+
+async def test_authorization_should_not_be_cached():
+    client = await _make_client()
+
+    first = await client.get(
+        "http://localhost:8000/cached?auth", headers={"authorization": "token"}
+    )
+    second = await client.get(
+        "http://localhost:8000/cached?auth", headers={"authorization": "token"}
+    )
+
+    assert first.text != second.text
+
+
+async def test_response_no_store_should_not_be_cached():
+    client = await _make_client()
+
+    first = await client.get("http://localhost:8000/no_store")
+    second = await client.get("http://localhost:8000/no_store")
+
+    assert first.text != second.text
+
+
+async def test_handler_without_decorator_should_not_be_cached():
+    client = await _make_client()
+
+    first = await client.get("http://localhost:8000/not_cached")
+    second = await client.get("http://localhost:8000/not_cached")
+
+    assert first.text != second.text
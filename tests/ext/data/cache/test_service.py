@@ -0,0 +1,82 @@
+import os
+from importlib.util import find_spec
+
+import pytest
+from pydantic import ValidationError
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.di.container import Container
+from selva.ext.data.cache.service import make_service
+from selva.ext.data.cache.settings import CacheSettings
+from selva.ext.data.cache.store import MemoryCacheStore
+
+REDIS_URL = os.getenv("REDIS_URL")
+MEMCACHED_ADDR = os.getenv("MEMCACHED_ADDR")
+
+
+def _settings(cache_settings: dict, **data) -> Settings:
+    return Settings(
+        default_settings | {"data": {"cache": {"default": cache_settings}} | data},
+    )
+
+
+async def test_memory_cache_store_service():
+    settings = _settings({"backend": "memory", "max_size": 10})
+    store = await anext(make_service("default")(settings, Container()))
+
+    assert isinstance(store, MemoryCacheStore)
+    assert store.max_size == 10
+
+
+def test_memory_backend_with_connection_should_fail():
+    with pytest.raises(ValidationError):
+        CacheSettings.model_validate({"backend": "memory", "connection": "default"})
+
+
+@pytest.mark.skipif(REDIS_URL is None, reason="REDIS_URL not defined")
+@pytest.mark.skipif(find_spec("redis") is None, reason="redis not present")
+async def test_redis_cache_store_service():
+    from selva.ext.data.redis import make_service as make_redis_service
+
+    settings = _settings(
+        {"backend": "redis", "prefix": "test:"},
+        redis={"default": {"url": REDIS_URL}},
+    )
+
+    container = Container()
+    container.define(Settings, settings)
+    container.register(make_redis_service("default"))
+
+    store = await anext(make_service("default")(settings, container))
+
+    await store.set("key", b"value", ttl=10)
+    assert await store.get("key") == b"value"
+    await store.delete("key")
+    assert await store.get("key") is None
+
+    await container.run_finalizers()
+
+
+@pytest.mark.skipif(MEMCACHED_ADDR is None, reason="MEMCACHED_ADDR not defined")
+@pytest.mark.skipif(find_spec("aiomcache") is None, reason="aiomcache not present")
+async def test_memcached_cache_store_service():
+    from selva.ext.data.memcached import make_service as make_memcached_service
+
+    settings = _settings(
+        {"backend": "memcached", "prefix": "test:"},
+        memcached={"default": {"address": MEMCACHED_ADDR}},
+    )
+
+    container = Container()
+    container.define(Settings, settings)
+    container.register(make_memcached_service("default"))
+
+    store = await anext(make_service("default")(settings, container))
+
+    await store.set("key with spaces", b"value", ttl=10)
+    assert await store.get("key with spaces") == b"value"
+    await store.delete("key with spaces")
+    assert await store.get("key with spaces") is None
+
+    await container.run_finalizers()
@@ -0,0 +1,43 @@
+import time
+
+from selva.ext.data.cache.store import CacheStore, MemoryCacheStore
+
+
+async def test_memory_store_is_cache_store():
+    assert isinstance(MemoryCacheStore(), CacheStore)
+
+
+async def test_memory_store_get_set_delete():
+    store = MemoryCacheStore()
+
+    assert await store.get("key") is None
+
+    await store.set("key", b"value")
+    assert await store.get("key") == b"value"
+
+    await store.delete("key")
+    assert await store.get("key") is None
+
+
+async def test_memory_store_expire(monkeypatch):
+    store = MemoryCacheStore()
+    await store.set("key", b"value", ttl=10)
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+
+    assert await store.get("key") is None
+    assert len(store) == 0
+
+
+async def test_memory_store_evict_least_recently_used():
+    store = MemoryCacheStore(max_size=2)
+
+    await store.set("a", b"a")
+    await store.set("b", b"b")
+    await store.get("a")
+    await store.set("c", b"c")
+
+    assert "a" in store
+    assert "b" not in store
+    assert "c" in store
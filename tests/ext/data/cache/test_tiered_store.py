@@ -0,0 +1,188 @@
+import asyncio
+import os
+from importlib.util import find_spec
+
+import pytest
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.di.container import Container
+from selva.ext.data.cache import init_extension
+from selva.ext.data.cache.store import CacheStore, MemoryCacheStore
+from selva.ext.data.cache.tiered_store import TieredCacheStore
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+
+async def test_get_should_populate_local_store():
+    local, remote = MemoryCacheStore(), MemoryCacheStore()
+    store = TieredCacheStore(local, remote)
+
+    await remote.set("key", b"value")
+
+    assert await store.get("key") == b"value"
+    assert local.get_nowait("key") == b"value"
+
+
+async def test_entry_read_from_remote_should_expire_locally():
+    local, remote = MemoryCacheStore(), MemoryCacheStore()
+    store = TieredCacheStore(local, remote, local_ttl=0.05)
+
+    await remote.set("key", b"value", ttl=0.05)
+    assert await store.get("key") == b"value"
+
+    await asyncio.sleep(0.1)
+
+    assert local.get_nowait("key") is None
+    assert await store.get("key") is None
+
+
+@pytest.mark.parametrize("local_ttl", [None, 0, -1])
+def test_invalid_local_ttl_should_fail(local_ttl):
+    with pytest.raises(ValueError, match="local_ttl"):
+        TieredCacheStore(MemoryCacheStore(), MemoryCacheStore(), local_ttl=local_ttl)
+
+
+async def test_set_should_write_both_stores():
+    local, remote = MemoryCacheStore(), MemoryCacheStore()
+    store = TieredCacheStore(local, remote, local_ttl=5)
+
+    await store.set("key", b"value", ttl=10)
+
+    assert local.get_nowait("key") == b"value"
+    assert remote.get_nowait("key") == b"value"
+
+
+async def test_delete_should_remove_from_both_stores():
+    local, remote = MemoryCacheStore(), MemoryCacheStore()
+    store = TieredCacheStore(local, remote)
+
+    await store.set("key", b"value")
+    await store.delete("key")
+
+    assert "key" not in local
+    assert "key" not in remote
+
+
+async def test_invalidate_should_remove_local_entry():
+    local, remote = MemoryCacheStore(), MemoryCacheStore()
+    store = TieredCacheStore(local, remote)
+
+    await store.set("key", b"value")
+    store.invalidate(b"other-worker:key")
+
+    assert "key" not in local
+    assert "key" in remote
+
+
+async def test_invalidate_from_same_worker_should_be_ignored():
+    local, remote = MemoryCacheStore(), MemoryCacheStore()
+    store = TieredCacheStore(local, remote)
+
+    await store.set("key", b"value")
+    store.invalidate(store.worker_id + b":key")
+
+    assert "key" in local
+
+
+async def test_value_read_during_invalidation_should_not_be_kept_locally():
+    local = MemoryCacheStore()
+    store = None
+
+    class SlowStore(MemoryCacheStore):
+        async def get(self, key: str) -> bytes | None:
+            value = self.get_nowait(key)
+            store.invalidate(b"other-worker:" + key.encode())
+            return value
+
+    remote = SlowStore()
+    store = TieredCacheStore(local, remote)
+
+    await remote.set("key", b"value")
+
+    assert await store.get("key") == b"value"
+    assert "key" not in local
+
+
+async def test_value_read_during_local_write_should_not_be_kept_locally():
+    local = MemoryCacheStore()
+    read_started = asyncio.Event()
+    write_done = asyncio.Event()
+
+    class SlowStore(MemoryCacheStore):
+        async def get(self, key: str) -> bytes | None:
+            value = self.get_nowait(key)
+            read_started.set()
+            await write_done.wait()
+            return value
+
+    remote = SlowStore()
+    store = TieredCacheStore(local, remote)
+    await remote.set("key", b"old")
+
+    read = asyncio.create_task(store.get("key"))
+    await read_started.wait()
+
+    await store.set("key", b"new")
+    write_done.set()
+
+    assert await read == b"old"
+    assert local.get_nowait("key") == b"new"
+
+
+async def test_tiered_service():
+    settings = Settings(
+        default_settings
+        | {
+            "data": {
+                "cache": {
+                    "remote": {"backend": "memory"},
+                    "default": {"backend": "tiered", "store": "remote"},
+                }
+            }
+        }
+    )
+
+    container = Container()
+    container.define(Container, container)
+    container.define(Settings, settings)
+    init_extension(container, settings)
+
+    store = await container.get(CacheStore)
+    remote = await container.get(CacheStore, name="remote")
+
+    assert isinstance(store, TieredCacheStore)
+    assert store.remote is remote
+
+    await container.run_finalizers()
+
+
+@pytest.mark.skipif(REDIS_URL is None, reason="REDIS_URL not defined")
+@pytest.mark.skipif(find_spec("redis") is None, reason="redis not present")
+async def test_invalidation_broadcast():
+    from redis.asyncio import Redis
+
+    redis = Redis.from_url(REDIS_URL)
+    remote = MemoryCacheStore()
+
+    worker1 = TieredCacheStore(MemoryCacheStore(), remote, redis, channel="test")
+    worker2 = TieredCacheStore(MemoryCacheStore(), remote, redis, channel="test")
+
+    await worker1.start()
+    await worker2.start()
+
+    try:
+        while not (worker1.listening and worker2.listening):
+            await asyncio.sleep(0.01)
+
+        await worker1.set("key", b"value")
+        assert await worker2.get("key") == b"value"
+
+        await worker1.set("key", b"new value")
+        await asyncio.sleep(0.1)
+
+        assert await worker2.get("key") == b"new value"
+    finally:
+        await worker1.stop()
+        await worker2.stop()
+        await redis.aclose()
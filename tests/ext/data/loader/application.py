@@ -0,0 +1,31 @@
+import asyncio
+from typing import Annotated
+
+from asgikit.responses import respond_json
+
+from selva.di import Inject, service
+from selva.ext.data.loader import BatchLoader
+from selva.web import get
+
+
+@service
+class UserLoader(BatchLoader[int, dict]):
+    def __init__(self):
+        self.batches = []
+
+    async def load_many(self, keys: list[int]) -> list[dict]:
+        self.batches.append(keys)
+        return [{"id": key} for key in keys]
+
+
+@get("users")
+async def users(request, loader: Annotated[UserLoader, Inject]):
+    loader.batches.clear()
+
+    result = await asyncio.gather(*[loader.load(i % 3) for i in range(6)])
+    again = await loader.load(0)
+
+    await respond_json(
+        request.response,
+        {"users": result, "again": again, "batches": loader.batches},
+    )
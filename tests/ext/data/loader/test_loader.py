@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.ext.data.loader import BatchLoader, loader_scope
+from selva.web.application import Selva
+
+
+class Loader(BatchLoader[int, str]):
+    def __init__(self, max_batch_size: int = None):
+        self.max_batch_size = max_batch_size
+        self.batches = []
+
+    async def load_many(self, keys: list[int]) -> list[str]:
+        self.batches.append(keys)
+        return [str(key) for key in keys]
+
+
+async def test_concurrent_loads_should_be_batched():
+    loader = Loader()
+
+    result = await asyncio.gather(loader.load(1), loader.load(2), loader.load(3))
+
+    assert result == ["1", "2", "3"]
+    assert loader.batches == [[1, 2, 3]]
+
+
+async def test_duplicated_keys_should_be_loaded_once():
+    loader = Loader()
+
+    result = await loader.load_all([1, 2, 1, 2])
+
+    assert result == ["1", "2", "1", "2"]
+    assert loader.batches == [[1, 2]]
+
+
+async def test_values_should_not_be_memoized_outside_scope():
+    loader = Loader()
+
+    await loader.load(1)
+    await loader.load(1)
+
+    assert loader.batches == [[1], [1]]
+
+
+async def test_values_should_be_memoized_within_scope():
+    loader = Loader()
+
+    with loader_scope():
+        await loader.load(1)
+        await loader.load_all([1, 2])
+
+    assert loader.batches == [[1], [2]]
+
+
+async def test_scopes_should_not_share_values():
+    loader = Loader()
+
+    with loader_scope():
+        await loader.load(1)
+
+    with loader_scope():
+        await loader.load(1)
+
+    assert loader.batches == [[1], [1]]
+
+
+async def test_clear_and_prime():
+    loader = Loader()
+
+    with loader_scope():
+        loader.prime(1, "primed")
+        assert await loader.load(1) == "primed"
+
+        loader.clear(1)
+        assert await loader.load(1) == "1"
+
+    assert loader.batches == [[1]]
+
+
+async def test_max_batch_size():
+    loader = Loader(max_batch_size=2)
+
+    await loader.load_all(range(5))
+
+    assert loader.batches == [[0, 1], [2, 3], [4]]
+
+
+async def test_mapping_result():
+    class MappingLoader(BatchLoader[int, str]):
+        async def load_many(self, keys: list[int]) -> dict[int, str]:
+            return {key: str(key) for key in keys if key > 0}
+
+    loader = MappingLoader()
+
+    assert await loader.load_all([0, 1]) == [None, "1"]
+
+
+async def test_exception_value_should_be_raised_to_caller():
+    class ErrorLoader(BatchLoader[int, str]):
+        async def load_many(self, keys: list[int]) -> list[str | Exception]:
+            return [KeyError(key) if key < 0 else str(key) for key in keys]
+
+    loader = ErrorLoader()
+    result = await asyncio.gather(
+        loader.load(1), loader.load(-1), return_exceptions=True
+    )
+
+    assert result[0] == "1"
+    assert isinstance(result[1], KeyError)
+
+
+async def test_failed_load_should_not_be_memoized():
+    class FailingLoader(BatchLoader[int, str]):
+        def __init__(self):
+            self.calls = 0
+
+        async def load_many(self, keys: list[int]) -> list[str]:
+            self.calls += 1
+            if self.calls == 1:
+                raise ValueError()
+            return [str(key) for key in keys]
+
+    loader = FailingLoader()
+
+    with loader_scope():
+        with pytest.raises(ValueError):
+            await loader.load(1)
+
+        assert await loader.load(1) == "1"
+
+
+async def test_wrong_number_of_values_should_fail():
+    class WrongLoader(BatchLoader[int, str]):
+        async def load_many(self, keys: list[int]) -> list[str]:
+            return []
+
+    with pytest.raises(ValueError):
+        await WrongLoader().load(1)
+
+
+async def test_batch_loader_middleware():
+    settings = Settings(
+        default_settings
+        | {
+            "application": f"{__package__}.application",
+            "middleware": ["selva.ext.data.loader.middleware:batch_loader_middleware"],
+        }
+    )
+
+    app = Selva(settings)
+    await app._lifespan_startup()
+
+    client = AsyncClient(transport=ASGITransport(app=app))
+    response = await client.get("http://localhost:8000/users")
+
+    assert response.json() == {
+        "users": [{"id": i % 3} for i in range(6)],
+        "again": {"id": 0},
+        "batches": [[0, 1, 2]],
+    }
+
+
+def test_loader_without_load_many_should_fail():
+    class IncompleteLoader(BatchLoader[int, int]):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteLoader()
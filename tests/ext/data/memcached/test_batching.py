@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from selva.configuration import Settings
+from selva.configuration.defaults import default_settings
+from selva.ext.data.memcached.batching import BatchingClient
+from selva.ext.data.memcached.service import make_service
+
+
+class FakeClient:
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.data = {}
+        self.calls = []
+
+    async def get(self, key: bytes, default=None):
+        self.calls.append(("get", key))
+        await asyncio.sleep(self.delay)
+        return self.data.get(key, default)
+
+    async def set(self, key: bytes, value: bytes, exptime: int = 0) -> bool:
+        await asyncio.sleep(self.delay)
+        self.data[key] = value
+        return True
+
+    async def multi_get(self, *keys: bytes) -> tuple:
+        self.calls.append(("multi_get", keys))
+        await asyncio.sleep(self.delay)
+        return tuple(self.data.get(key) for key in keys)
+
+    async def close(self):
+        pass
+
+
+async def test_concurrent_gets_should_be_coalesced():
+    client = FakeClient()
+    client.data = {b"a": b"1", b"b": b"2"}
+    batching = BatchingClient(client)
+
+    result = await asyncio.gather(
+        batching.get(b"a"), batching.get(b"b"), batching.get(b"c", b"default")
+    )
+
+    assert result == [b"1", b"2", b"default"]
+    assert client.calls == [("multi_get", (b"a", b"b", b"c"))]
+
+
+async def test_duplicated_keys_should_be_fetched_once():
+    client = FakeClient()
+    client.data = {b"a": b"1"}
+    batching = BatchingClient(client)
+
+    result = await asyncio.gather(batching.get(b"a"), batching.get(b"a"))
+
+    assert result == [b"1", b"1"]
+    assert client.calls == [("get", b"a")]
+
+
+async def test_multi_get_should_be_chunked():
+    client = FakeClient()
+    batching = BatchingClient(client, max_keys=2)
+
+    keys = [str(i).encode() for i in range(5)]
+    result = await batching.multi_get(*keys)
+
+    assert result == (None,) * 5
+    assert [len(keys) for _, keys in client.calls] == [2, 2, 1]
+
+
+async def test_without_coalesce_gets_should_be_sent_directly():
+    client = FakeClient()
+    batching = BatchingClient(client, coalesce=False)
+
+    await asyncio.gather(batching.get(b"a"), batching.get(b"b"))
+
+    assert client.calls == [("get", b"a"), ("get", b"b")]
+
+
+async def test_timeout():
+    batching = BatchingClient(FakeClient(delay=1), timeout=0.01)
+
+    with pytest.raises(TimeoutError):
+        await batching.get(b"a")
+
+    with pytest.raises(TimeoutError):
+        await batching.set(b"a", b"1")
+
+
+async def test_make_service_with_batching():
+    settings = Settings(
+        default_settings
+        | {
+            "data": {
+                "memcached": {
+                    "default": {
+                        "address": "localhost:11211",
+                        "batching": {"max_keys": 50, "window": 0.001},
+                        "timeout": 1,
+                    },
+                },
+            },
+        }
+    )
+
+    service = make_service("default")(settings)
+    client = await anext(service)
+
+    assert isinstance(client, BatchingClient)
+    assert client.max_keys == 50
+    assert client.window == 0.001
+    assert client.timeout == 1
+
+    await anext(service, None)
@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from selva.configuration import Settings
+from selva.configuration.defaults import default_settings
+from selva.ext.data.memcached.hashring import HashRing, HashRingClient
+from selva.ext.data.memcached.service import make_service
+from selva.ext.data.memcached.settings import MemcachedNodeSettings
+
+KEYS = [f"key{i}".encode() for i in range(1000)]
+
+
+class FakeClient:
+    def __init__(self):
+        self.data = {}
+        self.multi_get_calls = []
+
+    async def get(self, key: bytes, default=None):
+        return self.data.get(key, default)
+
+    async def set(self, key: bytes, value: bytes, exptime: int = 0) -> bool:
+        self.data[key] = value
+        return True
+
+    async def delete(self, key: bytes) -> bool:
+        return self.data.pop(key, None) is not None
+
+    async def multi_get(self, *keys: bytes) -> tuple:
+        self.multi_get_calls.append(keys)
+        await asyncio.sleep(0)
+        return tuple(self.data.get(key) for key in keys)
+
+
+def test_ring_should_be_deterministic():
+    ring1 = HashRing(["a:11211", "b:11211", "c:11211"])
+    ring2 = HashRing(["c:11211", "a:11211", "b:11211"])
+
+    assert all(ring1.get_node(key) == ring2.get_node(key) for key in KEYS)
+
+
+def test_ring_should_distribute_keys():
+    ring = HashRing(["a:11211", "b:11211", "c:11211"])
+    counts = {}
+    for key in KEYS:
+        node = ring.get_node(key)
+        counts[node] = counts.get(node, 0) + 1
+
+    assert len(counts) == 3
+    assert all(count > 200 for count in counts.values())
+
+
+def test_adding_node_should_remap_only_its_keys():
+    ring1 = HashRing(["a:11211", "b:11211", "c:11211"])
+    ring2 = HashRing(["a:11211", "b:11211", "c:11211", "d:11211"])
+
+    for key in KEYS:
+        node = ring2.get_node(key)
+        assert node == "d:11211" or node == ring1.get_node(key)
+
+
+def test_weight_should_increase_share_of_keys():
+    ring = HashRing(["a:11211", "b:11211"], [3, 1])
+    count = sum(1 for key in KEYS if ring.get_node(key) == "a:11211")
+
+    assert count > 600
+
+
+def test_empty_ring_should_fail():
+    with pytest.raises(ValueError):
+        HashRing([])
+
+
+@pytest.mark.parametrize("weight", [0, -1])
+def test_invalid_node_weight_should_fail(weight):
+    with pytest.raises(ValidationError):
+        MemcachedNodeSettings(address="localhost:11211", weight=weight)
+
+
+async def test_client_should_route_keys_to_nodes():
+    clients = {"a:11211": FakeClient(), "b:11211": FakeClient()}
+    client = HashRingClient(clients)
+
+    for key in KEYS[:100]:
+        await client.set(key, key)
+
+    for key in KEYS[:100]:
+        node = client.ring.get_node(key)
+        assert clients[node].data[key] == key
+        assert await client.get(key) == key
+
+
+async def test_multi_get_should_group_keys_per_node():
+    clients = {"a:11211": FakeClient(), "b:11211": FakeClient()}
+    client = HashRingClient(clients)
+
+    keys = KEYS[:20]
+    for key in keys[::2]:
+        await client.set(key, key)
+
+    result = await client.multi_get(*keys)
+
+    assert result == tuple(key if i % 2 == 0 else None for i, key in enumerate(keys))
+    assert all(len(c.multi_get_calls) == 1 for c in clients.values())
+
+
+async def test_make_service_with_address_list():
+    settings = Settings(
+        default_settings
+        | {
+            "data": {
+                "memcached": {
+                    "default": {
+                        "address": [
+                            "localhost:11211",
+                            {"address": "localhost:11212", "pool_size": 4},
+                        ],
+                        "options": {"pool_size": 3},
+                    },
+                },
+            },
+        }
+    )
+
+    service = make_service("default")(settings)
+    client = await anext(service)
+
+    assert isinstance(client, HashRingClient)
+    assert client.clients["localhost:11211"]._pool._maxsize == 3
+    assert client.clients["localhost:11212"]._pool._maxsize == 4
+
+    await anext(service, None)
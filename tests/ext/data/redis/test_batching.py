@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.ext.data.redis.batching import BatchingRedis
+from selva.ext.data.redis.service import make_service
+
+
+class FakePipeline:
+    def __init__(self, responses: dict, pipelines: list):
+        self.responses = responses
+        self.commands = []
+        pipelines.append(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def execute_command(self, *args, **options):
+        self.commands.append(args)
+        return self
+
+    async def execute(self, raise_on_error: bool = True):
+        assert not raise_on_error
+        return [self.responses[args[1]] for args in self.commands]
+
+
+@pytest.fixture
+def pipelines() -> list[FakePipeline]:
+    return []
+
+
+@pytest.fixture
+def direct_commands(monkeypatch) -> list[tuple]:
+    commands = []
+
+    async def execute_command(_self, *args, **_options):
+        commands.append(args)
+        return b"direct"
+
+    monkeypatch.setattr(Redis, "execute_command", execute_command)
+    return commands
+
+
+def _make_redis(pipelines: list, responses: dict, **kwargs) -> BatchingRedis:
+    redis = BatchingRedis(**kwargs)
+    redis.pipeline = lambda transaction: FakePipeline(responses, pipelines)
+    return redis
+
+
+async def test_concurrent_commands_should_be_batched(pipelines):
+    responses = {"a": b"1", "b": b"2", "c": b"3"}
+    redis = _make_redis(pipelines, responses)
+
+    results = await asyncio.gather(redis.get("a"), redis.get("b"), redis.hget("c", "f"))
+
+    assert results == [b"1", b"2", b"3"]
+    assert len(pipelines) == 1
+    assert pipelines[0].commands == [("GET", "a"), ("GET", "b"), ("HGET", "c", "f")]
+
+
+async def test_single_command_should_not_use_pipeline(pipelines, direct_commands):
+    redis = _make_redis(pipelines, {})
+
+    assert await redis.get("a") == b"direct"
+    assert not pipelines
+    assert direct_commands == [("GET", "a")]
+
+
+async def test_command_error_should_be_raised_to_its_caller(pipelines):
+    responses = {"a": b"1", "b": ResponseError("WRONGTYPE")}
+    redis = _make_redis(pipelines, responses)
+
+    results = await asyncio.gather(
+        redis.get("a"), redis.get("b"), return_exceptions=True
+    )
+
+    assert results[0] == b"1"
+    assert isinstance(results[1], ResponseError)
+
+
+async def test_blocking_command_should_not_be_batched(pipelines, direct_commands):
+    redis = _make_redis(pipelines, {"a": b"1"})
+
+    await asyncio.gather(redis.get("a"), redis.blpop(["list"], timeout=1))
+
+    assert ("BLPOP", "list", 1) in direct_commands
+    assert not pipelines
+
+
+async def test_batch_size_should_flush_batch(pipelines):
+    responses = {str(i): str(i).encode() for i in range(6)}
+    redis = _make_redis(pipelines, responses, batch_size=2)
+
+    results = await asyncio.gather(*[redis.get(str(i)) for i in range(6)])
+
+    assert results == [str(i).encode() for i in range(6)]
+    assert [len(p.commands) for p in pipelines] == [2, 2, 2]
+
+
+async def test_batch_window(pipelines):
+    responses = {"a": b"1", "b": b"2"}
+    redis = _make_redis(pipelines, responses, batch_window=0.01)
+
+    async def delayed_get():
+        await asyncio.sleep(0.001)
+        return await redis.get("b")
+
+    results = await asyncio.gather(redis.get("a"), delayed_get())
+
+    assert results == [b"1", b"2"]
+    assert len(pipelines) == 1
+
+
+async def test_make_service_with_batching():
+    settings = Settings(
+        default_settings
+        | {
+            "data": {
+                "redis": {
+                    "default": {
+                        "url": "redis://localhost:6379/0",
+                        "batching": {"window": 0.001, "max_size": 50},
+                    },
+                },
+            },
+        }
+    )
+
+    redis = await anext(make_service("default")(settings))
+
+    assert isinstance(redis, BatchingRedis)
+    assert redis.batch_window == 0.001
+    assert redis.batch_size == 50
@@ -88,3 +88,23 @@ def test_mutually_exclusive_retry_properties(values: dict):
 def test_invalid_encode_errors_property():
     with pytest.raises(ValueError):
         RedisOptions.model_validate({"encoding_errors": "invalid"})
+
+
+@pytest.mark.parametrize(
+    "batching, expected",
+    [
+        (True, {"window": 0, "max_size": 100}),
+        ({"window": 0.001}, {"window": 0.001, "max_size": 100}),
+    ],
+    ids=["bool", "dict"],
+)
+def test_batching(batching, expected):
+    settings = RedisSettings.model_validate({"batching": batching})
+
+    assert settings.batching.model_dump() == expected
+    assert "batching" not in settings.model_dump(exclude_unset=True)
+
+
+def test_batching_disabled():
+    settings = RedisSettings.model_validate({"batching": False})
+    assert settings.batching is None
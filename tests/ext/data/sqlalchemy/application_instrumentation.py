@@ -0,0 +1,17 @@
+from typing import Annotated
+
+from asgikit.responses import respond_text
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from selva.di import Inject
+from selva.web import get
+
+
+@get("queries")
+async def queries(request, engine: Annotated[AsyncEngine, Inject]):
+    async with engine.connect() as conn:
+        for i in range(3):
+            await conn.execute(text("select :value"), {"value": i})
+
+    await respond_text(request.response, "ok")
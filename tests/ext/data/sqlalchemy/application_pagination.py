@@ -0,0 +1,40 @@
+from typing import Annotated
+
+from asgikit.responses import respond_json
+from sqlalchemy import String, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from selva.di import Inject
+from selva.ext.data.sqlalchemy.pagination import Cursor, paginate
+from selva.web import FromQuery, get
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "item"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(100))
+
+
+@get("items")
+async def items(
+    request,
+    sessionmaker: Annotated[async_sessionmaker, Inject],
+    cursor: Annotated[Cursor, FromQuery] = None,
+):
+    async with sessionmaker() as session:
+        page = await paginate(
+            session, select(Item), [Item.name.desc(), Item.id], cursor=cursor, limit=2
+        )
+
+    await respond_json(
+        request.response,
+        {
+            "items": [item.id for item in page.items],
+            "next": page.next_cursor.encode() if page.next_cursor else None,
+        },
+    )
@@ -0,0 +1,61 @@
+from typing import Annotated
+
+from asgikit.responses import respond_status, respond_text
+from sqlalchemy import String, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from selva.di import Inject
+from selva.ext.data.sqlalchemy.streaming import respond_json_stream
+from selva.web import get, post
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "item"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(100))
+
+
+@post("items")
+async def create(request, session: Annotated[AsyncSession, Inject]):
+    session.add(Item(name="item"))
+    await respond_status(request.response, 201)
+
+
+@post("items/error")
+async def create_error(request, session: Annotated[AsyncSession, Inject]):
+    session.add(Item(name="item"))
+    await session.flush()
+    raise ValueError()
+
+
+@post("items/server_error")
+async def create_server_error(request, session: Annotated[AsyncSession, Inject]):
+    session.add(Item(name="item"))
+    await session.flush()
+    await respond_status(request.response, 503)
+
+
+@get("items/count")
+async def count(request, session: Annotated[AsyncSession, Inject]):
+    result = await session.scalar(select(func.count()).select_from(Item))
+    await respond_text(request.response, str(result))
+
+
+@post("items/commit_error")
+async def create_commit_error(request, session: Annotated[AsyncSession, Inject]):
+    # the missing name only fails when the session is flushed on commit
+    session.add(Item(name=None))
+    await respond_status(request.response, 201)
+
+
+@get("items/stream")
+async def stream(request, session: Annotated[AsyncSession, Inject]):
+    result = await session.stream(
+        select(Item.id, Item.name).order_by(Item.id).execution_options(yield_per=1)
+    )
+    await respond_json_stream(request.response, result, chunk_size=1)
@@ -0,0 +1,44 @@
+from typing import Annotated
+
+from sqlalchemy import Integer, String, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from selva.di import Inject
+from selva.ext.data.sqlalchemy.streaming import (
+    respond_json_stream,
+    respond_ndjson_stream,
+)
+from selva.web import get
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "item"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(100))
+
+
+@get("items.json")
+async def items_json(request, sessionmaker: Annotated[async_sessionmaker, Inject]):
+    async with sessionmaker() as session:
+        result = await session.stream(
+            select(Item.id, Item.name).order_by(Item.id).execution_options(yield_per=2)
+        )
+        await respond_json_stream(request.response, result, chunk_size=16)
+
+
+@get("items.ndjson")
+async def items_ndjson(request, sessionmaker: Annotated[async_sessionmaker, Inject]):
+    async with sessionmaker() as session:
+        result = await session.stream_scalars(
+            select(Item).order_by(Item.id).execution_options(yield_per=2)
+        )
+        await respond_ndjson_stream(
+            request.response,
+            result,
+            serializer=lambda item: {"id": item.id, "name": item.name},
+        )
@@ -0,0 +1,24 @@
+import pytest
+from sqlalchemy import MetaData
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+
+@pytest.fixture(name="create_engine")
+async def fixture_create_engine(tmp_path):
+    """Create sqlite engines in the test directory with the tables of a metadata"""
+
+    engines = []
+
+    async def create_engine(metadata: MetaData, name: str = "db") -> AsyncEngine:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.sqlite3")
+        engines.append(engine)
+
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+
+        return engine
+
+    yield create_engine
+
+    for engine in engines:
+        await engine.dispose()
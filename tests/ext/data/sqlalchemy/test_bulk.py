@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import String, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from selva.ext.data.sqlalchemy.bulk import bulk_insert, bulk_upsert
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "item"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(100))
+    code: Mapped[str] = mapped_column(String(10), unique=True)
+
+
+@pytest.fixture(name="sessionmaker")
+async def fixture_sessionmaker(create_engine) -> async_sessionmaker:
+    return async_sessionmaker(await create_engine(Base.metadata))
+
+
+def _rows(ids, name="item") -> list[dict]:
+    return [{"id": i, "name": f"{name}{i}", "code": f"c{i}"} for i in ids]
+
+
+async def _all(session) -> list[tuple]:
+    result = await session.execute(select(Item.id, Item.name).order_by(Item.id))
+    return [tuple(row) for row in result]
+
+
+async def test_bulk_insert(sessionmaker):
+    async with sessionmaker() as session:
+        result = await bulk_insert(session, Item, _rows(range(10)), batch_size=3)
+        await session.commit()
+
+        assert result is None
+        assert await _all(session) == [(i, f"item{i}") for i in range(10)]
+
+
+async def test_bulk_insert_returning(sessionmaker):
+    async with sessionmaker() as session:
+        rows = [{"name": f"item{i}", "code": f"c{i}"} for i in range(5)]
+        result = await bulk_insert(
+            session, Item, rows, returning=[Item.id, Item.code], batch_size=2
+        )
+
+    assert [row.code for row in result] == [f"c{i}" for i in range(5)]
+    assert len({row.id for row in result}) == 5
+
+
+async def test_bulk_insert_with_connection_and_generator(sessionmaker):
+    engine = sessionmaker.kw["bind"]
+
+    async with engine.begin() as conn:
+        rows = ({"id": i, "name": "item", "code": f"c{i}"} for i in range(5))
+        await bulk_insert(conn, Item.__table__, rows, batch_size=2)
+
+    async with sessionmaker() as session:
+        assert len(await _all(session)) == 5
+
+
+async def test_bulk_upsert(sessionmaker):
+    async with sessionmaker() as session:
+        await bulk_insert(session, Item, _rows(range(3)))
+        await bulk_upsert(session, Item, _rows(range(1, 5), "new"), batch_size=2)
+        await session.commit()
+
+        assert await _all(session) == [
+            (0, "item0"),
+            (1, "new1"),
+            (2, "new2"),
+            (3, "new3"),
+            (4, "new4"),
+        ]
+
+
+async def test_bulk_upsert_on_unique_column(sessionmaker):
+    async with sessionmaker() as session:
+        await bulk_insert(session, Item, _rows(range(2)))
+        await bulk_upsert(
+            session,
+            Item,
+            [{"id": 10, "name": "new", "code": "c1"}],
+            index_elements=["code"],
+            update=["name"],
+        )
+
+        assert await _all(session) == [(0, "item0"), (1, "new")]
+
+
+async def test_bulk_upsert_do_nothing(sessionmaker):
+    async with sessionmaker() as session:
+        await bulk_insert(session, Item, _rows(range(2)))
+        await bulk_upsert(session, Item, _rows(range(3), "new"), update=[])
+
+        assert await _all(session) == [(0, "item0"), (1, "item1"), (2, "new2")]
+
+
+async def test_bulk_upsert_unsupported_dialect_should_fail():
+    connection = SimpleNamespace(dialect=SimpleNamespace(name="oracle"))
+
+    with pytest.raises(ValueError, match="upsert is not supported on 'oracle'"):
+        await bulk_upsert(connection, Item, [{"id": 1, "name": "item"}])
@@ -0,0 +1,113 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from structlog.testing import capture_logs
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.ext.data.sqlalchemy.instrumentation import (
+    current_query_stats,
+    instrument_engine,
+    query_stats_scope,
+)
+from selva.web.application import Selva
+
+
+async def test_query_stats_scope():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_engine(engine)
+    instrument_engine(engine)  # should not register the listeners twice
+
+    async with engine.connect() as conn:
+        with query_stats_scope() as stats:
+            assert current_query_stats() is stats
+
+            await conn.execute(text("select 1"))
+            await conn.execute(text("select  :value"), {"value": 1})
+            await conn.execute(text("select :value"), {"value": 2})
+
+        # outside of the scope
+        await conn.execute(text("select 1"))
+
+    assert current_query_stats() is None
+    assert stats.count == 3
+    assert stats.duration > 0
+    assert stats.statements == {"select 1": 1, "select ?": 2}
+    assert stats.repeated(2) == [("select ?", 2)]
+
+    await engine.dispose()
+
+
+async def test_failed_statement_should_not_be_recorded():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_engine(engine)
+
+    async with engine.connect() as conn:
+        with query_stats_scope() as stats:
+            with pytest.raises(OperationalError):
+                await conn.execute(text("select * from missing"))
+
+            await conn.execute(text("select 1"))
+
+    assert stats.count == 1
+    assert stats.statements == {"select 1": 1}
+
+    await engine.dispose()
+
+
+async def _make_app(instrumentation: dict) -> Selva:
+    settings = Settings(
+        default_settings
+        | {
+            "application": f"{__package__}.application_instrumentation",
+            "extensions": ["selva.ext.data.sqlalchemy"],
+            "middleware": [
+                "selva.ext.data.sqlalchemy.middleware:sqlalchemy_instrumentation_middleware"
+            ],
+            "data": {
+                "sqlalchemy": {
+                    "connections": {
+                        "default": {"url": "sqlite+aiosqlite://"},
+                    },
+                    "instrumentation": instrumentation,
+                },
+            },
+        }
+    )
+
+    app = Selva(settings)
+    await app._lifespan_startup()
+    return app
+
+
+async def test_instrumentation_middleware():
+    app = await _make_app({"n_plus_one_threshold": 3})
+    client = AsyncClient(transport=ASGITransport(app=app))
+
+    with capture_logs() as logs:
+        response = await client.get("http://localhost:8000/queries")
+
+    assert response.headers["x-query-count"] == "3"
+    assert response.headers["server-timing"].startswith("db;dur=")
+
+    assert {
+        "event": "possible n+1 query",
+        "log_level": "warning",
+        "path": "/queries",
+        "statement": "select ?",
+        "count": 3,
+    } in logs
+
+
+async def test_instrumentation_middleware_without_headers():
+    app = await _make_app({"headers": False})
+    client = AsyncClient(transport=ASGITransport(app=app))
+
+    with capture_logs() as logs:
+        response = await client.get("http://localhost:8000/queries")
+
+    assert "x-query-count" not in response.headers
+    assert "server-timing" not in response.headers
+    assert not [log for log in logs if log["event"] == "possible n+1 query"]
@@ -0,0 +1,212 @@
+import datetime
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import DateTime, String, select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy.orm import Mapped, mapped_column
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.ext.data.sqlalchemy.pagination import Cursor, CursorParamConverter, paginate
+from selva.web.application import Selva
+from selva.web.exception import HTTPBadRequestException
+
+from .application_pagination import Base, Item
+
+NAMES = ["b", "a", "c", "b", "a", "c", "b"]
+
+
+class Event(Base):
+    __tablename__ = "event"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    created_at: Mapped[datetime.datetime] = mapped_column(DateTime)
+
+
+class Task(Base):
+    __tablename__ = "task"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    due_at: Mapped[datetime.datetime | None] = mapped_column(DateTime)
+
+
+class User(Base):
+    __tablename__ = "user"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column("user_name", String(100))
+
+
+@pytest.fixture(name="sessionmaker")
+async def fixture_sessionmaker(create_engine) -> async_sessionmaker:
+    engine = await create_engine(Base.metadata)
+    async with engine.begin() as conn:
+        await conn.execute(
+            Item.__table__.insert(),
+            [{"id": i, "name": name} for i, name in enumerate(NAMES)],
+        )
+
+    return async_sessionmaker(engine)
+
+
+async def _collect(sessionmaker, statement, order_by, limit) -> list:
+    pages = []
+    cursor = None
+    async with sessionmaker() as session:
+        while True:
+            page = await paginate(
+                session, statement, order_by, cursor=cursor, limit=limit
+            )
+            pages.append(page.items)
+            if not page.has_next:
+                return pages
+
+            # cursors go through their string form, as they would with clients
+            cursor = Cursor.decode(page.next_cursor.encode())
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 10])
+async def test_paginate_entities(sessionmaker, limit):
+    pages = await _collect(sessionmaker, select(Item), [Item.name, Item.id], limit)
+
+    assert all(len(page) <= limit for page in pages)
+    assert [item.id for page in pages for item in page] == [1, 4, 0, 3, 6, 2, 5]
+
+
+async def test_paginate_mixed_directions(sessionmaker):
+    pages = await _collect(
+        sessionmaker, select(Item), [Item.name.desc(), Item.id], limit=2
+    )
+
+    assert [item.id for page in pages for item in page] == [2, 5, 0, 3, 6, 1, 4]
+
+
+async def test_paginate_descending_rows(sessionmaker):
+    pages = await _collect(
+        sessionmaker,
+        select(Item.id, Item.name),
+        [Item.name.desc(), Item.id.desc()],
+        limit=3,
+    )
+
+    assert [row.id for page in pages for row in page] == [5, 2, 6, 3, 0, 4, 1]
+
+
+async def test_paginate_with_filter(sessionmaker):
+    pages = await _collect(
+        sessionmaker, select(Item).where(Item.name != "b"), [Item.id], limit=2
+    )
+
+    assert [[item.id for item in page] for page in pages] == [[1, 2], [4, 5]]
+
+
+async def test_paginate_datetime_cursor(create_engine):
+    engine = await create_engine(Base.metadata)
+    async with engine.begin() as conn:
+        await conn.execute(
+            Event.__table__.insert(),
+            [
+                {"id": i, "created_at": datetime.datetime(2024, 1, 1 + i % 3)}
+                for i in range(5)
+            ],
+        )
+
+    pages = await _collect(
+        async_sessionmaker(engine), select(Event), [Event.created_at, Event.id], 2
+    )
+
+    assert [event.id for page in pages for event in page] == [0, 3, 1, 4, 2]
+
+
+async def test_paginate_column_with_different_attribute_name(create_engine):
+    engine = await create_engine(Base.metadata)
+    async with engine.begin() as conn:
+        await conn.execute(
+            User.__table__.insert(),
+            [{"id": i, "user_name": name} for i, name in enumerate(NAMES)],
+        )
+
+    pages = await _collect(
+        async_sessionmaker(engine),
+        select(User),
+        [User.name.desc(), User.id],
+        limit=2,
+    )
+
+    assert [user.id for page in pages for user in page] == [2, 5, 0, 3, 6, 1, 4]
+
+
+@pytest.mark.parametrize(
+    "order_by",
+    [
+        [Task.due_at, Task.id],
+        [Task.due_at.desc(), Task.id],
+        [Task.__table__.c.due_at, Task.id],
+    ],
+)
+async def test_paginate_nullable_column_should_fail(sessionmaker, order_by):
+    async with sessionmaker() as session:
+        with pytest.raises(ValueError, match="cannot paginate by nullable column"):
+            await paginate(session, select(Task), order_by)
+
+
+def test_cursor_encode_decode():
+    cursor = Cursor(["name", 1, None])
+    assert Cursor.decode(cursor.encode()) == cursor
+
+
+def test_cursor_decode_not_list_should_fail():
+    # "MQ" is the json number 1
+    with pytest.raises(TypeError, match="invalid cursor"):
+        Cursor.decode("MQ")
+
+
+@pytest.mark.parametrize("value", ["!!!", "bm90IGpzb24", "MQ"])
+def test_invalid_cursor(value):
+    with pytest.raises(HTTPBadRequestException):
+        CursorParamConverter.convert(value, Cursor)
+
+
+async def test_cursor_from_query(tmp_path):
+    settings = Settings(
+        default_settings
+        | {
+            "application": f"{__package__}.application_pagination",
+            "extensions": ["selva.ext.data.sqlalchemy"],
+            "data": {
+                "sqlalchemy": {
+                    "connections": {
+                        "default": {
+                            "url": f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}",
+                        },
+                    },
+                },
+            },
+        }
+    )
+
+    app = Selva(settings)
+    await app._lifespan_startup()
+
+    engine = await app.di.get(AsyncEngine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            Item.__table__.insert(),
+            [{"id": i, "name": name} for i, name in enumerate(NAMES)],
+        )
+
+    client = AsyncClient(transport=ASGITransport(app=app))
+
+    ids = []
+    url = "http://localhost:8000/items"
+    while True:
+        response = await client.get(url)
+        data = response.json()
+        ids.extend(data["items"])
+        if not data["next"]:
+            break
+        url = f"http://localhost:8000/items?cursor={data['next']}"
+
+    assert ids == [2, 5, 0, 3, 6, 1, 4]
+
+    response = await client.get("http://localhost:8000/items?cursor=invalid!")
+    assert response.status_code == 400
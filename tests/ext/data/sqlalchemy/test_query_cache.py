@@ -0,0 +1,220 @@
+import pytest
+from sqlalchemy import String, event, select, text, update
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.ext.data.cache.store import MemoryCacheStore
+from selva.ext.data.sqlalchemy.query_cache import QueryCache
+from selva.web.application import Selva
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "item"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(100))
+
+
+@pytest.fixture(name="engine")
+async def fixture_engine(create_engine) -> AsyncEngine:
+    engine = await create_engine(Base.metadata)
+    async with engine.begin() as conn:
+        await conn.execute(Item.__table__.insert(), [{"id": 1, "name": "item1"}])
+
+    return engine
+
+
+@pytest.fixture(name="statements")
+def fixture_statements(engine) -> list[str]:
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, *args):
+        if statement.startswith("SELECT"):
+            statements.append(statement)
+
+    return statements
+
+
+@pytest.fixture(name="query_cache")
+def fixture_query_cache() -> QueryCache:
+    return QueryCache(MemoryCacheStore())
+
+
+@pytest.fixture(name="sessionmaker")
+def fixture_sessionmaker(engine, query_cache) -> async_sessionmaker:
+    return async_sessionmaker(engine, sync_session_class=query_cache.session_class())
+
+
+CACHED_NAMES = select(Item.name).order_by(Item.id).execution_options(query_cache=True)
+
+
+async def test_cached_select_should_not_hit_database(sessionmaker, statements):
+    async with sessionmaker() as session:
+        assert (await session.scalars(CACHED_NAMES)).all() == ["item1"]
+        assert (await session.scalars(CACHED_NAMES)).all() == ["item1"]
+
+    async with sessionmaker() as session:
+        assert (await session.scalars(CACHED_NAMES)).all() == ["item1"]
+
+    assert len(statements) == 1
+
+
+async def test_select_without_option_should_not_be_cached(sessionmaker, statements):
+    async with sessionmaker() as session:
+        await session.scalars(select(Item.name))
+        await session.scalars(select(Item.name))
+
+    assert len(statements) == 2
+
+
+async def test_parameters_should_be_part_of_key(sessionmaker, statements):
+    async with sessionmaker() as session:
+        for item_id in (1, 2, 1):
+            stmt = select(Item.name).where(Item.id == item_id)
+            await session.scalar(stmt.execution_options(query_cache=True))
+
+    assert len(statements) == 2
+
+
+async def test_cached_entities_should_be_merged_into_session(sessionmaker, statements):
+    stmt = select(Item).execution_options(query_cache=True)
+
+    async with sessionmaker() as session:
+        await session.scalars(stmt)
+
+    async with sessionmaker() as session:
+        item = (await session.scalars(stmt)).one()
+        assert item.name == "item1"
+        assert item in session
+
+    assert len(statements) == 1
+
+
+async def test_commit_should_invalidate_cached_results(sessionmaker):
+    async with sessionmaker() as session:
+        await session.scalars(CACHED_NAMES)
+
+    async with sessionmaker() as session:
+        session.add(Item(id=2, name="item2"))
+        await session.commit()
+
+    async with sessionmaker() as session:
+        assert (await session.scalars(CACHED_NAMES)).all() == ["item1", "item2"]
+
+
+async def test_bulk_update_should_invalidate_cached_results(sessionmaker):
+    async with sessionmaker() as session:
+        await session.scalars(CACHED_NAMES)
+
+    async with sessionmaker() as session:
+        await session.execute(update(Item).values(name="changed"))
+        await session.commit()
+
+    async with sessionmaker() as session:
+        assert (await session.scalars(CACHED_NAMES)).all() == ["changed"]
+
+
+async def test_textual_update_should_invalidate_all_cached_results(
+    sessionmaker, statements
+):
+    async with sessionmaker() as session:
+        await session.scalars(CACHED_NAMES)
+
+    async with sessionmaker() as session:
+        await session.execute(text("UPDATE item SET name = 'changed'"))
+        assert (await session.scalars(CACHED_NAMES)).all() == ["changed"]
+        await session.commit()
+
+    async with sessionmaker() as session:
+        assert (await session.scalars(CACHED_NAMES)).all() == ["changed"]
+
+    assert len(statements) == 3
+
+
+async def test_textual_select_should_not_invalidate_cached_results(
+    sessionmaker, statements
+):
+    async with sessionmaker() as session:
+        await session.scalars(CACHED_NAMES)
+        await session.execute(text("SELECT name FROM item"))
+        await session.commit()
+
+    async with sessionmaker() as session:
+        await session.scalars(CACHED_NAMES)
+
+    assert len(statements) == 2
+
+
+async def test_session_with_pending_writes_should_bypass_cache(
+    sessionmaker, statements
+):
+    async with sessionmaker() as session:
+        await session.scalars(CACHED_NAMES)
+
+        session.add(Item(id=2, name="item2"))
+        await session.flush()
+
+        assert (await session.scalars(CACHED_NAMES)).all() == ["item1", "item2"]
+
+        await session.rollback()
+
+        # rolled back writes do not invalidate the cache
+        assert (await session.scalars(CACHED_NAMES)).all() == ["item1"]
+
+    assert len(statements) == 2
+
+
+async def test_invalidate(sessionmaker, statements, query_cache):
+    async with sessionmaker() as session:
+        await session.scalars(CACHED_NAMES)
+        await query_cache.invalidate("item")
+        await session.scalars(CACHED_NAMES)
+
+    assert len(statements) == 2
+
+
+async def test_invalidate_all(sessionmaker, statements, query_cache):
+    async with sessionmaker() as session:
+        await session.scalars(CACHED_NAMES)
+        await query_cache.invalidate_all()
+        await session.scalars(CACHED_NAMES)
+
+    assert len(statements) == 2
+
+
+async def test_query_cache_settings(tmp_path):
+    settings = Settings(
+        default_settings
+        | {
+            "application": f"{__package__}.application_streaming",
+            "extensions": ["selva.ext.data.cache", "selva.ext.data.sqlalchemy"],
+            "data": {
+                "cache": {"default": {}},
+                "sqlalchemy": {
+                    "connections": {
+                        "default": {
+                            "url": f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}",
+                        },
+                    },
+                    "query_cache": {"ttl": 60},
+                },
+            },
+        }
+    )
+
+    app = Selva(settings)
+    await app._lifespan_startup()
+
+    query_cache = await app.di.get(QueryCache)
+    assert query_cache.ttl == 60
+    assert isinstance(query_cache.store, MemoryCacheStore)
+
+    sessionmaker = await app.di.get(async_sessionmaker)
+    async with sessionmaker() as session:
+        assert type(session.sync_session).__name__ == "QueryCacheSession"
@@ -0,0 +1,129 @@
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import String, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.ext.data.sqlalchemy.routing import ReplicaRouter, RoutingSession
+from selva.ext.data.sqlalchemy.service import sessionmaker_service
+from selva.ext.data.sqlalchemy.settings import SqlAlchemySessionSettings
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Source(Base):
+    __tablename__ = "source"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(100))
+
+
+@pytest.fixture(name="engines")
+async def fixture_engines(create_engine) -> dict[str, AsyncEngine]:
+    engines = {}
+    for name in ("default", "replica1", "replica2"):
+        engine = await create_engine(Base.metadata, name)
+        async with engine.begin() as conn:
+            await conn.execute(Source.__table__.insert().values(id=1, name=name))
+        engines[name] = engine
+
+    return engines
+
+
+async def _make_sessionmaker(engines: dict[str, AsyncEngine], **routing):
+    settings = Settings(
+        default_settings
+        | {
+            "data": {
+                "sqlalchemy": {
+                    "connections": {
+                        name: {"url": "sqlite+aiosqlite://"} for name in engines
+                    },
+                    "session": {
+                        "routing": {"replicas": ["replica1", "replica2"]} | routing
+                    },
+                },
+            },
+        }
+    )
+
+    return await sessionmaker_service(settings, engines)
+
+
+async def _read_source(session: AsyncSession) -> str:
+    return await session.scalar(select(Source.name))
+
+
+async def test_reads_should_go_to_replicas_round_robin(engines):
+    sessionmaker = await _make_sessionmaker(engines)
+
+    async with sessionmaker() as session:
+        assert isinstance(session.sync_session, RoutingSession)
+        assert await _read_source(session) == "replica1"
+        assert await _read_source(session) == "replica2"
+        assert await _read_source(session) == "replica1"
+
+
+async def test_reads_after_write_should_go_to_primary(engines):
+    sessionmaker = await _make_sessionmaker(engines)
+
+    async with sessionmaker() as session:
+        session.add(Source(id=2, name="new"))
+        await session.flush()
+
+        assert await _read_source(session) == "default"
+
+        await session.commit()
+
+        # sticky by default
+        assert await _read_source(session) == "default"
+
+
+async def test_not_sticky_should_read_from_replica_after_commit(engines):
+    sessionmaker = await _make_sessionmaker(engines, sticky=False)
+
+    async with sessionmaker() as session:
+        session.add(Source(id=2, name="new"))
+        await session.commit()
+
+        assert await _read_source(session) == "replica1"
+
+
+async def test_locking_reads_should_go_to_primary(engines):
+    sessionmaker = await _make_sessionmaker(engines)
+
+    async with sessionmaker() as session:
+        name = await session.scalar(select(Source.name).with_for_update())
+        assert name == "default"
+
+
+async def test_least_connections(engines):
+    router = ReplicaRouter(
+        engines["default"],
+        [engines["replica1"], engines["replica2"]],
+        strategy="least_connections",
+    )
+
+    async with engines["replica1"].connect():
+        assert router.get_replica() is engines["replica2"].sync_engine
+
+    async with engines["replica2"].connect():
+        assert router.get_replica() is engines["replica1"].sync_engine
+
+
+async def test_unknown_replica_should_fail(engines):
+    with pytest.raises(ValueError, match="No engine with name 'missing'"):
+        await _make_sessionmaker(engines, replicas=["missing"])
+
+
+def test_binds_and_routing_should_fail():
+    with pytest.raises(ValidationError):
+        SqlAlchemySessionSettings.model_validate(
+            {
+                "binds": {"package.module.Base": "default"},
+                "routing": {"replicas": ["replica"]},
+            }
+        )
@@ -1,9 +1,12 @@
+import pytest
 from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from selva.configuration.defaults import default_settings
 from selva.configuration.settings import Settings
 from selva.di.container import Container
+from selva.ext.data.sqlalchemy import init_extension
 from selva.ext.data.sqlalchemy.service import (
     engine_dict_service,
     make_engine_service,
@@ -199,3 +202,66 @@ async def test_engine_dict_service():
     engines = await engine_dict_service(settings, ioc)
 
     assert set(engines.keys()) == {"default", "other"}
+
+
+def _warmup_settings(tmp_path, warmup) -> Settings:
+    return Settings(
+        default_settings
+        | {
+            "data": {
+                "sqlalchemy": {
+                    "connections": {
+                        "default": {
+                            "url": f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}",
+                            "warmup": warmup,
+                        },
+                    },
+                },
+            },
+        }
+    )
+
+
+async def test_warmup_should_fill_pool(tmp_path):
+    settings = _warmup_settings(tmp_path, True)
+
+    engine_service = make_engine_service("default")(settings)
+    engine = await anext(engine_service)
+
+    assert engine.pool.checkedin() == engine.pool.size()
+    assert engine.pool.checkedout() == 0
+
+    await engine.dispose()
+
+
+async def test_warmup_with_connections_and_query(tmp_path):
+    settings = _warmup_settings(tmp_path, {"connections": 2, "query": "select 1"})
+
+    engine_service = make_engine_service("default")(settings)
+    engine = await anext(engine_service)
+
+    assert engine.pool.checkedin() == 2
+
+    await engine.dispose()
+
+
+async def test_warmup_with_failing_query_should_fail(tmp_path):
+    settings = _warmup_settings(tmp_path, {"query": "select * from missing"})
+
+    engine_service = make_engine_service("default")(settings)
+    with pytest.raises(OperationalError):
+        await anext(engine_service)
+
+
+async def test_init_extension_should_warm_up_engine(tmp_path):
+    settings = _warmup_settings(tmp_path, {})
+
+    ioc = Container()
+    ioc.define(Settings, settings)
+    await init_extension(ioc, settings)
+
+    engine = ioc._get_from_cache(AsyncEngine, None)
+    assert engine is not None
+    assert engine.pool.checkedin() == engine.pool.size()
+
+    await ioc.run_finalizers()
@@ -0,0 +1,192 @@
+import asyncio
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.ext.data.sqlalchemy.session import session_scope
+from selva.web.application import Selva
+
+from .application_session import Base, Item
+
+
+async def _make_app(tmp_path) -> Selva:
+    settings = Settings(
+        default_settings
+        | {
+            "application": f"{__package__}.application_session",
+            "extensions": ["selva.ext.data.sqlalchemy"],
+            "middleware": [
+                "selva.ext.data.sqlalchemy.middleware:sqlalchemy_session_middleware"
+            ],
+            "data": {
+                "sqlalchemy": {
+                    "connections": {
+                        "default": {
+                            "url": f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}",
+                        },
+                    },
+                },
+            },
+        }
+    )
+
+    app = Selva(settings)
+    await app._lifespan_startup()
+
+    engine = await app.di.get(AsyncEngine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    return app
+
+
+async def test_session_should_commit(tmp_path):
+    app = await _make_app(tmp_path)
+    client = AsyncClient(transport=ASGITransport(app=app))
+
+    response = await client.post("http://localhost:8000/items")
+    assert response.status_code == 201
+
+    response = await client.get("http://localhost:8000/items/count")
+    assert response.text == "1"
+
+
+async def test_session_should_rollback_on_error(tmp_path):
+    app = await _make_app(tmp_path)
+    client = AsyncClient(transport=ASGITransport(app=app))
+
+    response = await client.post("http://localhost:8000/items/error")
+    assert response.status_code == 500
+
+    response = await client.post("http://localhost:8000/items/server_error")
+    assert response.status_code == 503
+
+    response = await client.get("http://localhost:8000/items/count")
+    assert response.text == "0"
+
+
+async def test_session_should_commit_before_response_is_sent(tmp_path):
+    app = await _make_app(tmp_path)
+    engine = await app.di.get(AsyncEngine)
+    counts = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            async with engine.connect() as conn:
+                counts.append(await conn.scalar(select(func.count()).select_from(Item)))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/items",
+        "raw_path": b"/items",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+    }
+
+    await app(scope, receive, send)
+    assert counts == [1]
+
+    await app._lifespan_shutdown()
+
+
+async def test_session_should_keep_connection_while_streaming(tmp_path):
+    app = await _make_app(tmp_path)
+    engine = await app.di.get(AsyncEngine)
+
+    async with engine.begin() as conn:
+        await conn.execute(
+            Item.__table__.insert(), [{"name": "item1"}, {"name": "item2"}]
+        )
+
+    checked_out = []
+    body = b""
+    request_received = False
+
+    async def receive():
+        nonlocal request_received
+        if request_received:
+            # the client stays connected until the response is sent
+            await asyncio.Event().wait()
+        request_received = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal body
+        if message["type"] == "http.response.body":
+            body += message.get("body", b"")
+            if message.get("more_body", False):
+                checked_out.append(engine.pool.checkedout())
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/items/stream",
+        "raw_path": b"/items/stream",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+    }
+
+    await app(scope, receive, send)
+
+    assert checked_out
+    assert all(count == 1 for count in checked_out)
+    assert json.loads(body) == [
+        {"id": 1, "name": "item1"},
+        {"id": 2, "name": "item2"},
+    ]
+    assert engine.pool.checkedout() == 0
+
+    await app._lifespan_shutdown()
+
+
+async def test_session_commit_error_should_respond_server_error(tmp_path):
+    app = await _make_app(tmp_path)
+    client = AsyncClient(transport=ASGITransport(app=app))
+
+    response = await client.post("http://localhost:8000/items/commit_error")
+    assert response.status_code == 500
+
+    response = await client.get("http://localhost:8000/items/count")
+    assert response.text == "0"
+
+
+async def test_session_scope(tmp_path):
+    app = await _make_app(tmp_path)
+    session = await app.di.get(AsyncSession)
+
+    async with session_scope(session):
+        session.add(Item(name="item"))
+        first = session()
+
+    async with session_scope(session):
+        assert session() is not first
+        assert len((await session.scalars(Item.__table__.select())).all()) == 1
+
+    await app._lifespan_shutdown()
+
+
+async def test_session_outside_scope_should_fail(tmp_path):
+    app = await _make_app(tmp_path)
+    session = await app.di.get(AsyncSession)
+
+    with pytest.raises(RuntimeError):
+        session()
+
+    await app._lifespan_shutdown()
@@ -1,6 +1,9 @@
 import pytest
 
-from selva.ext.data.sqlalchemy.settings import SqlAlchemyEngineSettings
+from selva.ext.data.sqlalchemy.settings import (
+    SqlAlchemyEngineSettings,
+    SqlAlchemyWarmupSettings,
+)
 
 
 @pytest.mark.parametrize(
@@ -23,3 +26,17 @@ from selva.ext.data.sqlalchemy.settings import SqlAlchemyEngineSettings
 def test_sqlalchemy_settings_mutually_exclusive_properties(values: dict):
     with pytest.raises(ValueError):
         SqlAlchemyEngineSettings.model_validate({"url": "url"} | values)
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (True, SqlAlchemyWarmupSettings()),
+        (False, None),
+        ({"connections": 2}, SqlAlchemyWarmupSettings(connections=2)),
+    ],
+    ids=["true", "false", "dict"],
+)
+def test_sqlalchemy_warmup_settings(value, expected):
+    result = SqlAlchemyEngineSettings.model_validate({"url": "url", "warmup": value})
+    assert result.warmup == expected
@@ -0,0 +1,86 @@
+import json
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.ext.data.sqlalchemy.streaming import _coalesce
+from selva.web.application import Selva
+
+from .application_streaming import Base, Item
+
+
+async def _make_app(tmp_path, count: int) -> Selva:
+    settings = Settings(
+        default_settings
+        | {
+            "application": f"{__package__}.application_streaming",
+            "extensions": ["selva.ext.data.sqlalchemy"],
+            "data": {
+                "sqlalchemy": {
+                    "connections": {
+                        "default": {
+                            "url": f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}",
+                        },
+                    },
+                },
+            },
+        }
+    )
+
+    app = Selva(settings)
+    await app._lifespan_startup()
+
+    engine = await app.di.get(AsyncEngine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        if count:
+            await conn.execute(
+                Item.__table__.insert(),
+                [{"id": i, "name": f"item{i}"} for i in range(count)],
+            )
+
+    return app
+
+
+async def test_respond_json_stream(tmp_path):
+    app = await _make_app(tmp_path, 5)
+    client = AsyncClient(transport=ASGITransport(app=app))
+
+    response = await client.get("http://localhost:8000/items.json")
+
+    assert response.headers["content-type"].startswith("application/json")
+    assert response.json() == [{"id": i, "name": f"item{i}"} for i in range(5)]
+
+
+async def test_respond_json_stream_empty_result(tmp_path):
+    app = await _make_app(tmp_path, 0)
+    client = AsyncClient(transport=ASGITransport(app=app))
+
+    response = await client.get("http://localhost:8000/items.json")
+
+    assert response.json() == []
+
+
+async def test_respond_ndjson_stream(tmp_path):
+    app = await _make_app(tmp_path, 5)
+    client = AsyncClient(transport=ASGITransport(app=app))
+
+    response = await client.get("http://localhost:8000/items.ndjson")
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"id": i, "name": f"item{i}"} for i in range(5)
+    ]
+    assert response.text.endswith("\n")
+
+
+async def test_coalesce_should_group_parts_in_chunks():
+    async def parts():
+        for part in [b"aa", b"bb", b"cc", b"d"]:
+            yield part
+
+    chunks = [chunk async for chunk in _coalesce(parts(), 4)]
+    assert chunks == [b"aabb", b"ccd"]
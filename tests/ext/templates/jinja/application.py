@@ -24,6 +24,27 @@ async def stream(request, template: Annotated[JinjaTemplate, Inject]):
     )
 
 
+@get("/block")
+async def block(request, template: Annotated[JinjaTemplate, Inject]):
+    await template.respond(
+        request.response,
+        "blocks.html",
+        {"variable": "Jinja"},
+        block="content",
+    )
+
+
+@get("/stream_block")
+async def stream_block(request, template: Annotated[JinjaTemplate, Inject]):
+    await template.respond(
+        request.response,
+        "blocks.html",
+        {"variable": "Jinja"},
+        stream=True,
+        block="content",
+    )
+
+
 @get("/define_content_type")
 async def define_content_type(request, template: Annotated[JinjaTemplate, Inject]):
     await template.respond(
@@ -0,0 +1,215 @@
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from pydantic import ValidationError
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.di.container import Container
+from selva.ext.templates.jinja import init_extension
+from selva.ext.templates.jinja.bytecode_cache import RedisBytecodeCache
+from selva.ext.templates.jinja.service import JinjaTemplate
+from selva.ext.templates.jinja.settings import JinjaTemplateSettings
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+class FailingRedis:
+    def get(self, key):
+        raise ConnectionError()
+
+    def set(self, key, value, ex=None):
+        raise ConnectionError()
+
+
+def _write_templates(path: Path):
+    (path / "index.html").write_text("Hello, {{ name }}")
+    (path / "page.txt").write_text("{% for i in items %}{{ i }}{% endfor %}")
+
+
+def _settings(templates: Path, **jinja) -> Settings:
+    return Settings(
+        default_settings | {"templates": {"jinja": {"paths": [str(templates)]} | jinja}}
+    )
+
+
+async def test_filesystem_bytecode_cache(tmp_path):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    _write_templates(templates)
+
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+
+    settings = _settings(templates, bytecode_cache={"directory": str(cache_dir)})
+
+    template = JinjaTemplate(settings)
+    template.initialize()
+    assert await template.render("index.html", {"name": "Jinja"}) == "Hello, Jinja"
+
+    assert len(list(cache_dir.iterdir())) == 1
+
+
+async def test_redis_bytecode_cache(tmp_path):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    _write_templates(templates)
+
+    redis = FakeRedis()
+    settings = _settings(templates)
+
+    template = JinjaTemplate(settings)
+    template.initialize()
+    template.environment.bytecode_cache = RedisBytecodeCache(redis, timeout=60)
+
+    await template.render("index.html", {"name": "Jinja"})
+    assert len(redis.data) == 1
+    assert next(iter(redis.data)).startswith("jinja2/bytecode/")
+
+    # another worker loads the compiled template from redis
+    other = JinjaTemplate(settings)
+    other.initialize()
+    other.environment.bytecode_cache = RedisBytecodeCache(redis)
+    assert await other.render("index.html", {"name": "Redis"}) == "Hello, Redis"
+
+
+async def test_redis_bytecode_cache_error_should_be_logged(tmp_path, log_output):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    _write_templates(templates)
+
+    template = JinjaTemplate(_settings(templates))
+    template.initialize()
+    template.environment.bytecode_cache = RedisBytecodeCache(FailingRedis())
+
+    assert await template.render("index.html", {"name": "Jinja"}) == "Hello, Jinja"
+
+    events = [entry["event"] for entry in log_output.entries]
+    assert events == [
+        "failed to load template bytecode from redis",
+        "failed to store template bytecode in redis",
+    ]
+
+
+@pytest.mark.parametrize(
+    "precompile,expected",
+    [(True, {"index.html", "page.txt"}), (["html"], {"index.html"})],
+    ids=["all", "extensions"],
+)
+async def test_precompile(tmp_path, precompile, expected):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    _write_templates(templates)
+
+    settings = _settings(templates, precompile=precompile)
+
+    container = Container()
+    container.define(Settings, settings)
+    await init_extension(container, settings)
+
+    template = await container.get(JinjaTemplate)
+    cached = {name for _, name in template.environment.cache.keys()}
+    assert cached == expected
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"backend": "filesystem", "connection": "default"},
+        {"backend": "filesystem", "timeout": 10},
+        {"backend": "redis", "directory": "cache"},
+    ],
+)
+def test_invalid_bytecode_cache_settings(value):
+    with pytest.raises(ValidationError):
+        JinjaTemplateSettings.model_validate({"bytecode_cache": value})
+
+
+def test_redis_bytecode_cache_from_settings(tmp_path):
+    settings = Settings(
+        default_settings
+        | {
+            "templates": {
+                "jinja": {
+                    "paths": [str(tmp_path)],
+                    "bytecode_cache": {"backend": "redis", "timeout": 60},
+                }
+            },
+            "data": {"redis": {"default": {"url": "redis://localhost:6379/1"}}},
+        }
+    )
+
+    template = JinjaTemplate(settings)
+    template.initialize()
+
+    bytecode_cache = template.environment.bytecode_cache
+    assert isinstance(bytecode_cache, RedisBytecodeCache)
+    assert bytecode_cache.timeout == 60
+    assert bytecode_cache.client.connection_pool.connection_kwargs["db"] == 1
+
+
+def test_redis_bytecode_cache_client_options(tmp_path):
+    settings = Settings(
+        default_settings
+        | {
+            "templates": {
+                "jinja": {
+                    "paths": [str(tmp_path)],
+                    "bytecode_cache": {"backend": "redis"},
+                }
+            },
+            "data": {
+                "redis": {
+                    "default": {
+                        "url": "redis://localhost:6379/1",
+                        "options": {
+                            "retry": {
+                                "retries": 3,
+                                "backoff": {"constant": {"backoff": 1}},
+                            },
+                        },
+                    }
+                }
+            },
+        }
+    )
+
+    template = JinjaTemplate(settings)
+    template.initialize()
+
+    client = template.environment.bytecode_cache.client
+    assert client.get_retry()._retries == 3
+
+
+def test_redis_bytecode_cache_client_should_be_closed(tmp_path):
+    settings = Settings(
+        default_settings
+        | {
+            "templates": {
+                "jinja": {
+                    "paths": [str(tmp_path)],
+                    "bytecode_cache": {"backend": "redis"},
+                }
+            },
+            "data": {"redis": {"default": {"url": "redis://localhost:6379/1"}}},
+        }
+    )
+
+    template = JinjaTemplate(settings)
+    template.initialize()
+
+    client = template.environment.bytecode_cache.client
+    client.close = Mock(wraps=client.close)
+
+    template.finalize()
+    client.close.assert_called_once()
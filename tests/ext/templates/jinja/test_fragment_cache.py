@@ -0,0 +1,174 @@
+import hashlib
+from pathlib import Path
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.di.container import Container
+from selva.ext.data.cache import init_extension as cache_init_extension
+from selva.ext.data.cache.store import CacheStore, MemoryCacheStore
+from selva.ext.templates.jinja import init_extension
+from selva.ext.templates.jinja.fragment_cache import FragmentCache
+from selva.ext.templates.jinja.service import JinjaTemplate
+from selva.ext.templates.jinja.streaming import FLUSH_MARKER, streaming
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self) -> int:
+        self.calls += 1
+        return self.calls
+
+
+class FailingStore(MemoryCacheStore):
+    async def get(self, key: str) -> bytes | None:
+        raise ConnectionError()
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None):
+        raise ConnectionError()
+
+
+def _make_template(**jinja) -> JinjaTemplate:
+    settings = Settings(default_settings | {"templates": {"jinja": jinja}})
+    template = JinjaTemplate(settings)
+    template.initialize()
+    return template
+
+
+async def test_cache_fragment():
+    template = _make_template()
+    counter = Counter()
+
+    source = "{% cache 'key' %}{{ counter() }}{% endcache %} {{ counter() }}"
+
+    assert await template.render_str(source, {"counter": counter}) == "1 2"
+    assert await template.render_str(source, {"counter": counter}) == "1 3"
+
+
+async def test_cache_error_should_render_fragment(log_output):
+    template = _make_template()
+    template.environment.fragment_cache = FragmentCache(FailingStore())
+    counter = Counter()
+
+    source = "{% cache 'key' %}{{ counter() }}{% endcache %}"
+
+    assert await template.render_str(source, {"counter": counter}) == "1"
+    assert await template.render_str(source, {"counter": counter}) == "2"
+
+    events = [entry["event"] for entry in log_output.entries]
+    assert (
+        events
+        == [
+            "failed to read fragment from cache",
+            "failed to store fragment in cache",
+        ]
+        * 2
+    )
+
+
+async def test_cache_fragment_with_dynamic_key():
+    template = _make_template()
+    counter = Counter()
+
+    source = "{% cache 'user:' ~ user %}{{ user }}{{ counter() }}{% endcache %}"
+
+    assert await template.render_str(source, {"user": 1, "counter": counter}) == "11"
+    assert await template.render_str(source, {"user": 2, "counter": counter}) == "22"
+    assert await template.render_str(source, {"user": 1, "counter": counter}) == "11"
+
+
+async def test_cache_fragment_ttl():
+    template = _make_template()
+    counter = Counter()
+    source = "{% cache 'key', 10 %}{{ counter() }}{% endcache %}"
+
+    await template.render_str(source, {"counter": counter})
+
+    store = template.fragment_cache.store
+    _, expires_at = next(iter(store._data.values()))
+    assert expires_at is not None
+
+
+async def test_cache_fragment_is_not_escaped_again():
+    template = _make_template(autoescape=True)
+    source = "{% cache 'key' %}<b>{{ value }}</b>{% endcache %}"
+
+    first = await template.render_str(source, {"value": "<i>"})
+    second = await template.render_str(source, {"value": "<i>"})
+    assert first == second == "<b>&lt;i&gt;</b>"
+
+
+async def test_cache_keys_include_template_name(tmp_path: Path):
+    (tmp_path / "a.html").write_text("{% cache 'key' %}a{% endcache %}")
+    (tmp_path / "b.html").write_text("{% cache 'key' %}b{% endcache %}")
+
+    template = _make_template(paths=[str(tmp_path)])
+
+    assert await template.render("a.html", {}) == "a"
+    assert await template.render("b.html", {}) == "b"
+
+
+async def test_cache_keys_of_string_templates_do_not_collide():
+    template = _make_template()
+
+    assert await template.render_str("{% cache 'key' %}a{% endcache %}", {}) == "a"
+    assert await template.render_str("{% cache 'key' %}b{% endcache %}", {}) == "b"
+
+
+async def test_flush_marker_is_not_cached():
+    template = _make_template()
+    source = "{% cache 'key' %}a{{ flush() }}b{% endcache %}"
+
+    with streaming():
+        streamed = await template.render_str(source, {})
+
+    assert streamed == f"a{FLUSH_MARKER}b"
+    assert await template.render_str(source, {}) == "ab"
+
+
+async def test_invalidate_fragment():
+    template = _make_template()
+    counter = Counter()
+    source = "{% cache 'key' %}{{ counter() }}{% endcache %}"
+
+    assert await template.render_str(source, {"counter": counter}) == "1"
+    name = "string:" + hashlib.sha256(source.encode()).hexdigest()
+    await template.fragment_cache.invalidate(name, "key")
+    assert await template.render_str(source, {"counter": counter}) == "2"
+
+
+async def test_fragment_cache_with_store_from_settings():
+    settings = Settings(
+        default_settings
+        | {
+            "data": {"cache": {"fragments": {"backend": "memory"}}},
+            "templates": {"jinja": {"fragment_cache": {"store": "fragments"}}},
+        }
+    )
+
+    container = Container()
+    container.define(Container, container)
+    container.define(Settings, settings)
+    cache_init_extension(container, settings)
+    await init_extension(container, settings)
+
+    template = await container.get(JinjaTemplate)
+    store = await container.get(CacheStore, name="fragments")
+
+    assert isinstance(template.fragment_cache, FragmentCache)
+    assert template.fragment_cache.store is store
+
+    source = "{% cache 'key' %}value{% endcache %}"
+    await template.render_str(source, {})
+
+    name = "string:" + hashlib.sha256(source.encode()).hexdigest()
+    assert await store.get(f"jinja:fragment:{name}:key") == b"value"
+
+
+async def test_default_fragment_cache_in_process():
+    template = _make_template(fragment_cache={"max_size": 10, "prefix": "fragment:"})
+
+    assert isinstance(template.fragment_cache.store, MemoryCacheStore)
+    assert template.fragment_cache.store.max_size == 10
+    assert template.fragment_cache.prefix == "fragment:"
@@ -1,6 +1,8 @@
 from copy import deepcopy
 from pathlib import Path
 
+import pytest
+
 from selva.configuration.defaults import default_settings
 from selva.configuration.settings import Settings
 from selva.ext.templates.jinja.service import JinjaTemplate
@@ -22,3 +24,56 @@ async def test_render_str():
     template.initialize()
     result = await template.render_str("{{ variable }}", {"variable": "Jinja"})
     assert result == "Jinja"
+
+
+async def test_render_block():
+    path = str(Path(__file__).parent.absolute())
+    settings = Settings(default_settings | {"templates": {"jinja": {"paths": [path]}}})
+
+    template = JinjaTemplate(settings)
+    template.initialize()
+    result = await template.render_block(
+        "blocks.html", "content", {"title": "Title", "variable": "Jinja"}
+    )
+    assert result == "<p>Jinja</p>"
+
+
+async def test_render_block_from_child_template():
+    path = str(Path(__file__).parent.absolute())
+    settings = Settings(default_settings | {"templates": {"jinja": {"paths": [path]}}})
+
+    template = JinjaTemplate(settings)
+    template.initialize()
+    result = await template.render_block("child.html", "content", {"variable": "Jinja"})
+    assert result == "<p>child Jinja</p>"
+
+
+async def test_render_inherited_block_from_child_template():
+    path = str(Path(__file__).parent.absolute())
+    settings = Settings(default_settings | {"templates": {"jinja": {"paths": [path]}}})
+
+    template = JinjaTemplate(settings)
+    template.initialize()
+    result = await template.render_block("child.html", "other", {})
+    assert result == "other"
+
+
+async def test_render_block_with_super():
+    path = str(Path(__file__).parent.absolute())
+    settings = Settings(default_settings | {"templates": {"jinja": {"paths": [path]}}})
+
+    template = JinjaTemplate(settings)
+    template.initialize()
+    result = await template.render_block("super.html", "content", {"variable": "Jinja"})
+    assert result == "<p>super</p><p>Jinja</p>"
+
+
+async def test_render_missing_block_should_fail():
+    path = str(Path(__file__).parent.absolute())
+    settings = Settings(default_settings | {"templates": {"jinja": {"paths": [path]}}})
+
+    template = JinjaTemplate(settings)
+    template.initialize()
+
+    with pytest.raises(ValueError, match="block 'missing' not found"):
+        await template.render_block("blocks.html", "missing", {})
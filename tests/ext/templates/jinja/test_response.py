@@ -1,5 +1,6 @@
 from pathlib import Path
 
+import pytest
 from httpx import ASGITransport, AsyncClient
 
 from selva.configuration.defaults import default_settings
@@ -42,6 +43,18 @@ async def test_stream():
     assert "Content-Length" not in response.headers
 
 
+@pytest.mark.parametrize("path", ["/block", "/stream_block"])
+async def test_respond_block(path):
+    app = Selva(settings)
+    await app._lifespan_startup()
+
+    client = AsyncClient(transport=ASGITransport(app=app))
+    response = await client.get(f"http://localhost:8000{path}")
+
+    assert response.status_code == 200
+    assert response.text == "<p>Jinja</p>"
+
+
 async def test_define_content_type():
     app = Selva(settings)
     await app._lifespan_startup()
@@ -73,3 +86,31 @@ async def test_content_type_from_response():
 
     assert response.status_code == 200
     assert "text/from_response" in response.headers["Content-Type"]
+
+
+async def test_stream_compressed():
+    app = Selva(
+        Settings(
+            default_settings
+            | {
+                "application": f"{__package__}.application",
+                "extensions": ["selva.ext.templates.jinja"],
+                "middleware": [
+                    "selva.web.middleware.compression:compression_middleware"
+                ],
+                "templates": {"jinja": {"paths": [path]}},
+                "compression": default_settings["compression"]
+                | {"encodings": ["gzip"], "minimum_size": 0},
+            }
+        )
+    )
+    await app._lifespan_startup()
+
+    client = AsyncClient(transport=ASGITransport(app=app))
+    response = await client.get(
+        "http://localhost:8000/stream", headers={"accept-encoding": "gzip"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.text == "Jinja"
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+from jinja2 import Environment
+
+from selva.ext.templates.jinja.streaming import FLUSH_MARKER, coalesce, flush, streaming
+
+
+async def fragments(*items, delay: float = 0):
+    for item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        yield item
+
+
+async def collect(stream) -> list[str]:
+    return [chunk async for chunk in stream]
+
+
+async def test_merge_fragments_into_chunks():
+    result = await collect(coalesce(fragments("a", "b", "c", "d", "e"), 2))
+    assert result == ["ab", "cd", "e"]
+
+
+async def test_flush_marker_sends_buffer():
+    stream = fragments("a", FLUSH_MARKER, "b", f"c{FLUSH_MARKER}d", "e")
+    result = await collect(coalesce(stream, 100))
+    assert result == ["a", "bc", "de"]
+
+
+async def test_empty_flush_does_not_send_chunk():
+    stream = fragments(FLUSH_MARKER, "a", FLUSH_MARKER, FLUSH_MARKER)
+    result = await collect(coalesce(stream, 100))
+    assert result == ["a"]
+
+
+async def test_flush_timeout_sends_buffer():
+    async def slow_fragments():
+        yield "a"
+        yield "b"
+        await asyncio.sleep(0.1)
+        yield "c"
+
+    result = await collect(coalesce(slow_fragments(), 100, flush_timeout=0.01))
+    assert result == ["ab", "c"]
+
+
+async def test_flush_timeout_keeps_order():
+    stream = fragments(*"abcdefgh", delay=0.001)
+    result = await collect(coalesce(stream, 3, flush_timeout=0.0015))
+    assert "".join(result) == "abcdefgh"
+
+
+async def test_flush_timeout_with_flush_marker():
+    stream = fragments("a", FLUSH_MARKER, "b")
+    result = await collect(coalesce(stream, 100, flush_timeout=1))
+    assert result == ["a", "b"]
+
+
+async def test_flush_timeout_raise_error():
+    async def failing_fragments():
+        yield "a"
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        await collect(coalesce(failing_fragments(), 100, flush_timeout=1))
+
+
+async def test_flush_renders_nothing_outside_stream():
+    environment = Environment(enable_async=True)
+    environment.globals["flush"] = flush
+
+    template = environment.from_string("a{{ flush() }}b")
+    assert await template.render_async() == "ab"
+
+    with streaming():
+        result = await collect(coalesce(template.generate_async(), 100))
+    assert result == ["a", "b"]
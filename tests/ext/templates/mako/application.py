@@ -14,6 +14,16 @@ async def render(request, template: Annotated[MakoTemplate, Inject]):
     )
 
 
+@get("/def")
+async def render_def(request, template: Annotated[MakoTemplate, Inject]):
+    await template.respond(
+        request.response,
+        "defs.html",
+        {"variable": "Mako"},
+        def_name="content",
+    )
+
+
 @get("/stream")
 async def stream(request, template: Annotated[MakoTemplate, Inject]):
     await template.respond(
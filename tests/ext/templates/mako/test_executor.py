@@ -0,0 +1,89 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.ext.templates.mako.service import MakoTemplate
+
+PATH = str(Path(__file__).parent.absolute())
+
+
+def _make_template(**executor) -> MakoTemplate:
+    settings = Settings(
+        default_settings
+        | {"templates": {"mako": {"directories": [PATH], "executor": executor}}}
+    )
+
+    template = MakoTemplate(settings)
+    template.initialize()
+    return template
+
+
+def thread_name() -> str:
+    return threading.current_thread().name
+
+
+async def test_inline_executor():
+    template = _make_template()
+    assert template.executor is None
+
+    result = await template.render_str("${thread_name()}", {"thread_name": thread_name})
+    assert result == threading.current_thread().name
+
+
+async def test_thread_executor():
+    template = _make_template(type="thread", max_workers=2)
+
+    result = await template.render_str("${thread_name()}", {"thread_name": thread_name})
+    assert result.startswith("selva-mako")
+
+    result = await template.render("template.html", {"variable": "Mako"})
+    assert result == "Mako"
+
+    template.finalize()
+
+
+async def test_inline_threshold():
+    template = _make_template(type="thread", inline_threshold=20)
+    source = "${thread_name()}"
+
+    # the first render has no previous output size to compare
+    result = await template.render_str(source, {"thread_name": thread_name})
+    assert result.startswith("selva-mako")
+
+    result = await template.render_str(source, {"thread_name": thread_name})
+    assert result == threading.current_thread().name
+
+    # larger outputs are rendered in the executor again
+    result = await template.render_str(
+        source, {"thread_name": lambda: thread_name() * 10}
+    )
+    result = await template.render_str(source, {"thread_name": thread_name})
+    assert result.startswith("selva-mako")
+
+    template.finalize()
+
+
+@pytest.mark.parametrize("method", ["render", "render_str"])
+async def test_process_executor(method):
+    template = _make_template(type="process", max_workers=1)
+
+    if method == "render":
+        result = await template.render("template.html", {"variable": "Mako"})
+    else:
+        result = await template.render_str("${variable}", {"variable": "Mako"})
+
+    assert result == "Mako"
+
+    template.finalize()
+
+
+async def test_process_executor_render_def():
+    template = _make_template(type="process", max_workers=1)
+
+    result = await template.render_def("defs.html", "content", {"variable": "Mako"})
+    assert result == "<p>Mako</p>"
+
+    template.finalize()
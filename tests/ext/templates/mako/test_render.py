@@ -1,6 +1,8 @@
 from copy import deepcopy
 from pathlib import Path
 
+import pytest
+
 from selva.configuration.defaults import default_settings
 from selva.configuration.settings import Settings
 from selva.ext.templates.mako.service import MakoTemplate
@@ -24,3 +26,60 @@ async def test_render_str():
     template.initialize()
     result = await template.render_str("${variable}", {"variable": "Mako"})
     assert result == "Mako"
+
+
+async def test_render_str_cache_size():
+    settings = Settings(
+        default_settings | {"templates": {"mako": {"string_cache_size": 2}}}
+    )
+    template = MakoTemplate(settings)
+    template.initialize()
+
+    for i in range(5):
+        result = await template.render_str(f"{i} ${{variable}}", {"variable": "Mako"})
+        assert result == f"{i} Mako"
+
+    assert len(template.string_templates) == 2
+
+
+async def test_render_template_module_directory(tmp_path):
+    path = str(Path(__file__).parent.absolute())
+    settings = Settings(
+        default_settings
+        | {
+            "templates": {
+                "mako": {"directories": [path], "module_directory": str(tmp_path)}
+            }
+        }
+    )
+
+    template = MakoTemplate(settings)
+    template.initialize()
+    result = await template.render("template.html", {"variable": "Mako"})
+    assert result == "Mako"
+    assert list(tmp_path.glob("**/template.html.py"))
+
+
+async def test_render_def():
+    path = str(Path(__file__).parent.absolute())
+    settings = Settings(
+        default_settings | {"templates": {"mako": {"directories": [path]}}}
+    )
+
+    template = MakoTemplate(settings)
+    template.initialize()
+    result = await template.render_def("defs.html", "content", {"variable": "Mako"})
+    assert result == "<p>Mako</p>"
+
+
+async def test_render_missing_def_should_fail():
+    path = str(Path(__file__).parent.absolute())
+    settings = Settings(
+        default_settings | {"templates": {"mako": {"directories": [path]}}}
+    )
+
+    template = MakoTemplate(settings)
+    template.initialize()
+
+    with pytest.raises(ValueError, match="def 'missing' not found"):
+        await template.render_def("defs.html", "missing", {})
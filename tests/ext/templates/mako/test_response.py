@@ -30,6 +30,17 @@ async def test_render():
     assert "text/html" in response.headers["Content-Type"]
 
 
+async def test_respond_def():
+    app = Selva(settings)
+    await app._lifespan_startup()
+
+    client = AsyncClient(transport=ASGITransport(app=app))
+    response = await client.get("http://localhost:8000/def")
+
+    assert response.status_code == 200
+    assert response.text == "<p>Mako</p>"
+
+
 async def test_define_content_type():
     app = Selva(settings)
     await app._lifespan_startup()
@@ -0,0 +1,44 @@
+from mako.lookup import TemplateLookup
+
+from selva.ext.templates.mako.string_templates import StringTemplateCache
+
+
+def test_same_source_reuses_template():
+    cache = StringTemplateCache(TemplateLookup(), 10)
+
+    template = cache.get_template("${variable}")
+    assert cache.get_template("${variable}") is template
+    assert len(cache) == 1
+
+
+def test_different_sources_do_not_share_templates():
+    cache = StringTemplateCache(TemplateLookup(), 10)
+
+    first = cache.get_template("first ${variable}")
+    second = cache.get_template("second ${variable}")
+
+    assert first is not second
+    assert first.render(variable="Mako") == "first Mako"
+    assert second.render(variable="Mako") == "second Mako"
+
+
+def test_evict_least_recently_used():
+    cache = StringTemplateCache(TemplateLookup(), 2)
+
+    first = cache.get_template("1")
+    cache.get_template("2")
+    assert cache.get_template("1") is first
+
+    cache.get_template("3")
+    assert len(cache) == 2
+    assert cache.get_template("1") is first
+    assert cache.get_template("2") is not None
+    assert len(cache) == 2
+
+
+def test_templates_are_not_added_to_lookup():
+    lookup = TemplateLookup()
+    cache = StringTemplateCache(lookup, 10)
+
+    template = cache.get_template("${variable}")
+    assert not lookup.has_template(template.uri)
@@ -0,0 +1,410 @@
+import io
+import json
+import logging
+import threading
+
+import pytest
+import structlog
+
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
+from selva.logging import (
+    BatchStreamHandler,
+    BoundedQueueHandler,
+    SamplingProcessor,
+    SamplingRule,
+    flush_handlers,
+    get_logger,
+    setup,
+)
+
+
+class BlockingHandler(BatchStreamHandler):
+    """Handler that blocks the background thread until released"""
+
+    def __init__(self):
+        super().__init__(io.StringIO())
+        self.setFormatter(logging.Formatter("%(message)s"))
+        self.started = threading.Event()
+        self.unblock = threading.Event()
+
+    def emit_batch(self, records):
+        self.started.set()
+        self.unblock.wait()
+        super().emit_batch(records)
+
+
+def _record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 0, message, None, None)
+
+
+def _blocked_queue_handler(
+    overflow: str,
+) -> tuple[BoundedQueueHandler, BlockingHandler]:
+    handler = BlockingHandler()
+    queue_handler = BoundedQueueHandler(handler, max_size=2, overflow=overflow)
+
+    # the first record is held by the background thread
+    queue_handler.handle(_record("first"))
+    handler.started.wait()
+
+    return queue_handler, handler
+
+
+def test_write_records_in_background():
+    stream = io.StringIO()
+    handler = BatchStreamHandler(stream)
+    queue_handler = BoundedQueueHandler(handler)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    for i in range(10):
+        queue_handler.handle(_record(f"message {i}"))
+
+    queue_handler.flush()
+    assert stream.getvalue() == "".join(f"message {i}\n" for i in range(10))
+
+    queue_handler.close()
+
+
+def test_message_arguments_are_resolved_when_logged():
+    queue_handler, handler = _blocked_queue_handler("drop")
+
+    logger = logging.getLogger("test.queue")
+    logger.addHandler(queue_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    try:
+        items = [1]
+        logger.info("items=%s", items)
+        items.append(2)
+
+        handler.unblock.set()
+        queue_handler.flush()
+
+        assert handler.stream.getvalue().splitlines() == ["first", "items=[1]"]
+    finally:
+        logger.removeHandler(queue_handler)
+        logger.setLevel(logging.NOTSET)
+        logger.propagate = True
+        queue_handler.close()
+
+
+def test_drop_new_records():
+    queue_handler, handler = _blocked_queue_handler("drop")
+
+    for i in range(4):
+        queue_handler.handle(_record(f"message {i}"))
+
+    assert queue_handler.dropped == 2
+
+    handler.unblock.set()
+    queue_handler.flush()
+
+    lines = handler.stream.getvalue().splitlines()
+    assert lines == [
+        "first",
+        "message 0",
+        "message 1",
+        "logging queue full, 2 records dropped",
+    ]
+
+    queue_handler.close()
+
+
+def test_drop_oldest_records():
+    queue_handler, handler = _blocked_queue_handler("drop_oldest")
+
+    for i in range(4):
+        queue_handler.handle(_record(f"message {i}"))
+
+    assert queue_handler.dropped == 2
+
+    handler.unblock.set()
+    queue_handler.flush()
+
+    lines = handler.stream.getvalue().splitlines()
+    assert lines == [
+        "first",
+        "message 2",
+        "message 3",
+        "logging queue full, 2 records dropped",
+    ]
+
+    queue_handler.close()
+
+
+def test_block_when_queue_is_full():
+    queue_handler, handler = _blocked_queue_handler("block")
+
+    queue_handler.handle(_record("message 0"))
+    queue_handler.handle(_record("message 1"))
+
+    thread = threading.Thread(target=queue_handler.handle, args=(_record("message 2"),))
+    thread.start()
+    thread.join(0.05)
+    assert thread.is_alive()
+
+    handler.unblock.set()
+    thread.join()
+    queue_handler.flush()
+
+    assert queue_handler.dropped == 0
+    assert handler.stream.getvalue().splitlines() == [
+        "first",
+        "message 0",
+        "message 1",
+        "message 2",
+    ]
+
+    queue_handler.close()
+
+
+def test_close_writes_pending_records():
+    stream = io.StringIO()
+    queue_handler = BoundedQueueHandler(BatchStreamHandler(stream))
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    queue_handler.handle(_record("message"))
+    queue_handler.close()
+
+    assert stream.getvalue() == "message\n"
+
+
+def test_invalid_overflow_should_fail():
+    with pytest.raises(ValueError, match="invalid overflow policy"):
+        BoundedQueueHandler(BatchStreamHandler(), overflow="invalid")
+
+
+def test_setup_with_queue(capsys):
+    settings = Settings(
+        default_settings
+        | {
+            "logging": {
+                "setup": "selva.logging:setup",
+                "format": "keyvalue",
+                "root": "info",
+                "queue": {"max_size": 100},
+            }
+        }
+    )
+
+    setup(settings)
+
+    handler = logging.getLogger().handlers[0]
+    assert isinstance(handler, BoundedQueueHandler)
+
+    with structlog.contextvars.bound_contextvars(request_id="1"):
+        structlog.get_logger("test").info("structlog message")
+        logging.getLogger("test").info("stdlib message")
+
+    handler.flush()
+    lines = capsys.readouterr().err.splitlines()
+
+    assert "event='structlog message'" in lines[0]
+    assert "event='stdlib message'" in lines[1]
+    assert all("request_id='1'" in line for line in lines)
+    assert all("timestamp=" in line for line in lines)
+
+
+def test_logger_skips_disabled_levels():
+    stdlib_logger = logging.getLogger("test.facade")
+    logger = get_logger("test.facade")
+
+    try:
+        stdlib_logger.setLevel(logging.INFO)
+        with structlog.testing.capture_logs() as logs:
+            logger.debug("debug message")
+            logger.info("info message")
+
+        assert not logger.is_enabled_for(logging.DEBUG)
+        assert [log["event"] for log in logs] == ["info message"]
+
+        # changing the level invalidates the cached check
+        stdlib_logger.setLevel(logging.DEBUG)
+        with structlog.testing.capture_logs() as logs:
+            logger.debug("debug message")
+
+        assert logger.is_enabled_for(logging.DEBUG)
+        assert [log["event"] for log in logs] == ["debug message"]
+    finally:
+        stdlib_logger.setLevel(logging.NOTSET)
+
+
+def test_logger_log_critical_and_bind():
+    stdlib_logger = logging.getLogger("test.facade")
+    logger = get_logger("test.facade")
+
+    try:
+        stdlib_logger.setLevel(logging.WARNING)
+        with structlog.testing.capture_logs() as logs:
+            logger.log(logging.INFO, "info message")
+            logger.log(logging.WARNING, "warning message")
+            logger.critical("critical message")
+            logger.bind(request_id="1").warning("bound message")
+            logger.warning("unbound message")
+
+        assert logs == [
+            {"event": "warning message", "log_level": "warning"},
+            {"event": "critical message", "log_level": "critical"},
+            {"event": "bound message", "log_level": "warning", "request_id": "1"},
+            {"event": "unbound message", "log_level": "warning"},
+        ]
+    finally:
+        stdlib_logger.setLevel(logging.NOTSET)
+
+
+def test_setup_with_queue_logs_exception(capsys):
+    settings = Settings(
+        default_settings
+        | {
+            "logging": {
+                "setup": "selva.logging:setup",
+                "format": "json",
+                "root": "info",
+                "queue": {"max_size": 100},
+            }
+        }
+    )
+
+    setup(settings)
+
+    try:
+        raise ValueError("error")
+    except ValueError:
+        structlog.get_logger("test").exception("exception message")
+
+    flush_handlers()
+    output = capsys.readouterr().err
+
+    assert "Logging error" not in output
+    log = json.loads(output)
+    assert log["event"] == "exception message"
+    assert log["exception"][0]["exc_type"] == "ValueError"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _sample(processor: SamplingProcessor, event: str, method="info", **kwargs):
+    logger = logging.getLogger("test.sampling")
+    try:
+        processor(logger, method, {"event": event, **kwargs})
+        return True
+    except structlog.DropEvent:
+        return False
+
+
+def test_sampling_rate():
+    processor = SamplingProcessor([SamplingRule(event="sampled", rate=0)])
+
+    assert not _sample(processor, "sampled")
+    assert _sample(processor, "other")
+
+
+def test_sampling_keeps_errors_and_slow_events():
+    processor = SamplingProcessor([SamplingRule(event="sampled", rate=0, slow=1)])
+
+    assert _sample(processor, "sampled", method="error")
+    assert _sample(processor, "sampled", exc_info=True)
+    assert _sample(processor, "sampled", duration=1.5)
+    assert not _sample(processor, "sampled", duration=0.5)
+
+
+@pytest.mark.parametrize(
+    "rule,matches",
+    [
+        (SamplingRule(logger="test"), True),
+        (SamplingRule(logger="test.sampling"), True),
+        (SamplingRule(logger="test.sampling.child"), False),
+        (SamplingRule(logger="tes"), False),
+        (SamplingRule(path="/items/*"), True),
+        (SamplingRule(path="/health"), False),
+    ],
+)
+def test_sampling_rule_matches(rule, matches):
+    event_dict = {"event": "event", "path": "/items/1"}
+    assert rule.matches("test.sampling", event_dict) is matches
+
+
+def test_sampling_rule_matches_path_from_context():
+    rule = SamplingRule(path="/items/*")
+
+    with structlog.contextvars.bound_contextvars(path="/items/1"):
+        assert rule.matches("test", {"event": "event"})
+
+    assert not rule.matches("test", {"event": "event"})
+
+
+def test_rate_limit_identical_events():
+    clock = FakeClock()
+    processor = SamplingProcessor([SamplingRule(rate_limit=1, burst=2)], clock=clock)
+
+    assert [_sample(processor, "event") for _ in range(3)] == [True, True, False]
+    assert _sample(processor, "other event")
+
+    clock.now = 1
+    assert [_sample(processor, "event") for _ in range(2)] == [True, False]
+
+
+def test_report_suppressed_events(caplog):
+    clock = FakeClock()
+    processor = SamplingProcessor(
+        [SamplingRule(event="sampled", rate=0)], report_interval=10, clock=clock
+    )
+
+    for _ in range(3):
+        _sample(processor, "sampled")
+
+    clock.now = 5
+    _sample(processor, "other")
+    assert not caplog.records
+
+    clock.now = 10
+    _sample(processor, "other")
+    assert [record.getMessage() for record in caplog.records] == [
+        "3 'sampled' events from test.sampling suppressed"
+    ]
+
+
+@pytest.mark.parametrize(
+    "options,message",
+    [
+        ({"rate": 1.5}, "invalid sampling rate"),
+        ({"rate_limit": 0}, "invalid rate limit"),
+    ],
+)
+def test_invalid_sampling_rule_should_fail(options, message):
+    with pytest.raises(ValueError, match=message):
+        SamplingRule(**options)
+
+
+def test_setup_with_sampling(capsys):
+    settings = Settings(
+        default_settings
+        | {
+            "logging": {
+                "setup": "selva.logging:setup",
+                "format": "keyvalue",
+                "root": "info",
+                "sampling": {"rules": [{"event": "sampled", "rate": 0}]},
+            }
+        }
+    )
+
+    setup(settings)
+
+    logger = structlog.get_logger("test")
+    logger.info("sampled")
+    logger.info("kept")
+    flush_handlers()
+
+    lines = capsys.readouterr().err.splitlines()
+    assert len(lines) == 2
+    assert "event='kept'" in lines[0]
+    assert "event=\"1 'sampled' events from test suppressed\"" in lines[1]
@@ -1,5 +1,7 @@
+import logging
 from http import HTTPStatus
 
+import structlog
 from httpx import ASGITransport, AsyncClient
 
 from selva.configuration.defaults import default_settings
@@ -27,3 +29,35 @@ async def test_not_found():
     client = AsyncClient(transport=ASGITransport(app=app))
     response = await client.get("http://localhost:8000/not-found")
     assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+async def test_request_should_be_logged_with_path(log_output):
+    settings = Settings(
+        default_settings
+        | {
+            "application": f"{__package__}.application",
+            "logging": {
+                "setup": "selva.logging:setup",
+                "level": {"selva.web.application": "info"},
+            },
+        }
+    )
+    app = Selva(settings)
+
+    structlog.configure(
+        processors=[structlog.contextvars.merge_contextvars, log_output]
+    )
+
+    try:
+        client = AsyncClient(transport=ASGITransport(app=app))
+        await client.get("http://localhost:8000/")
+    finally:
+        logging.getLogger("selva.web.application").setLevel(logging.NOTSET)
+
+    [entry] = [e for e in log_output.entries if e["event"] == "request handled"]
+    assert entry["path"] == "/"
+    assert entry["method"] == "GET"
+    assert entry["status"] == HTTPStatus.OK
+    assert entry["duration"] >= 0
+
+    assert "path" not in structlog.contextvars.get_contextvars()
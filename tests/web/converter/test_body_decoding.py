@@ -0,0 +1,110 @@
+import gzip
+import zlib
+from http import HTTPStatus
+from importlib.util import find_spec
+
+import pytest
+from asgikit.requests import Request, read_body, read_json
+
+from selva.web.converter.body import DecodedBody, decode_body
+from selva.web.exception import HTTPBadRequestException, HTTPException
+
+
+def _make_request(body: bytes, encoding: str, chunk_size: int = 16) -> Request:
+    chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+    messages = iter(enumerate(chunks or [b""]))
+
+    async def receive():
+        index, chunk = next(messages)
+        return {
+            "type": "http.request",
+            "body": chunk,
+            "more_body": index < len(chunks) - 1,
+        }
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-encoding", encoding.encode()),
+        ],
+    }
+
+    return Request(scope, receive, None)
+
+
+async def test_identity_returns_original_body():
+    request = _make_request(b'{"field": "value"}', "identity")
+    body = decode_body(request, 1024)
+    assert body is request.body
+
+
+@pytest.mark.parametrize(
+    "encoding,compress",
+    [
+        ("gzip", gzip.compress),
+        ("x-gzip", gzip.compress),
+        ("deflate", zlib.compress),
+        ("deflate", lambda data: zlib.compress(data, wbits=-zlib.MAX_WBITS)),
+    ],
+    ids=["gzip", "x-gzip", "deflate", "raw deflate"],
+)
+async def test_decode_body(encoding, compress):
+    request = _make_request(compress(b'{"field": "value"}'), encoding)
+    body = decode_body(request, 1024)
+
+    assert isinstance(body, DecodedBody)
+    assert body.content_length is None
+    assert await read_json(body) == {"field": "value"}
+
+
+@pytest.mark.skipif(find_spec("brotli") is None, reason="brotli not present")
+async def test_decode_brotli_body():
+    import brotli
+
+    request = _make_request(brotli.compress(b'{"field": "value"}'), "br")
+    body = decode_body(request, 1024)
+    assert await read_json(body) == {"field": "value"}
+
+
+async def test_decode_multiple_encodings():
+    data = zlib.compress(gzip.compress(b'{"field": "value"}'))
+    request = _make_request(data, "gzip, deflate")
+    body = decode_body(request, 1024)
+    assert await read_json(body) == {"field": "value"}
+
+
+async def test_decompressed_size_over_limit_should_fail():
+    request = _make_request(gzip.compress(b"0" * 1024 * 1024), "gzip")
+    body = decode_body(request, 1024)
+
+    with pytest.raises(HTTPException) as err:
+        await read_body(body)
+
+    assert err.value.status == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+
+async def test_invalid_compressed_data_should_fail():
+    request = _make_request(b"not compressed", "gzip")
+    body = decode_body(request, 1024)
+
+    with pytest.raises(HTTPBadRequestException):
+        await read_body(body)
+
+
+async def test_truncated_compressed_data_should_fail():
+    request = _make_request(gzip.compress(b'{"field": "value"}')[:-8], "gzip")
+    body = decode_body(request, 1024)
+
+    with pytest.raises(HTTPBadRequestException):
+        await read_body(body)
+
+
+async def test_unsupported_encoding_should_fail():
+    request = _make_request(b"", "compress")
+
+    with pytest.raises(HTTPException) as err:
+        decode_body(request, 1024)
+
+    assert err.value.status == HTTPStatus.UNSUPPORTED_MEDIA_TYPE
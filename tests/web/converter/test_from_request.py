@@ -1,7 +1,12 @@
+import gzip
+from copy import deepcopy
+
 import pytest
 from asgikit.requests import Request
 from pydantic import BaseModel
 
+from selva.configuration.defaults import default_settings
+from selva.configuration.settings import Settings
 from selva.di.container import Container
 from selva.web.converter import Form, Json
 from selva.web.converter.converter_impl import (
@@ -40,7 +45,7 @@ from selva.web.converter.param_extractor_impl import (
 
 async def test_body_from_request_wrong_http_method_should_fail(ioc: Container):
     ioc.register(RequestBodyJsonConverter)
-    from_request = BodyFromRequest(ioc)
+    from_request = BodyFromRequest(ioc, Settings(deepcopy(default_settings)))
 
     async def receive():
         return {
@@ -63,7 +68,7 @@ async def test_body_from_request_wrong_http_method_should_fail(ioc: Container):
 
 async def test_body_from_request(ioc: Container):
     ioc.register(RequestBodyJsonConverter)
-    from_request = BodyFromRequest(ioc)
+    from_request = BodyFromRequest(ioc, Settings(deepcopy(default_settings)))
 
     async def receive():
         return {
@@ -85,9 +90,35 @@ async def test_body_from_request(ioc: Container):
     assert result["field"] == "value"
 
 
+async def test_compressed_body_from_request(ioc: Container):
+    ioc.register(RequestBodyJsonConverter)
+    from_request = BodyFromRequest(ioc, Settings(deepcopy(default_settings)))
+
+    async def receive():
+        return {
+            "type": "http.request",
+            "body": gzip.compress(b'{"field": "value"}'),
+            "more_body": False,
+        }
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-encoding", b"gzip"),
+        ],
+    }
+
+    request = Request(scope, receive, None)
+
+    result = await from_request.from_request(request, Json, "parameter", None, False)
+    assert result == {"field": "value"}
+
+
 async def test_body_list_from_request(ioc: Container):
     ioc.register(RequestBodyPydanticListConverter)
-    from_request = BodyFromRequest(ioc)
+    from_request = BodyFromRequest(ioc, Settings(deepcopy(default_settings)))
 
     class MyModel(BaseModel):
         field: str
@@ -119,7 +150,7 @@ async def test_body_list_from_request(ioc: Container):
 
 async def test_form_from_request(ioc: Container):
     ioc.register(RequestBodyFormConverter)
-    from_request = BodyFromRequest(ioc)
+    from_request = BodyFromRequest(ioc, Settings(deepcopy(default_settings)))
 
     async def receive():
         return {
@@ -142,7 +173,7 @@ async def test_form_from_request(ioc: Container):
 
 
 async def test_missing_converter_should_fail(ioc: Container):
-    from_request = BodyFromRequest(ioc)
+    from_request = BodyFromRequest(ioc, Settings(deepcopy(default_settings)))
 
     async def receive():
         return {
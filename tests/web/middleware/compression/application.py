@@ -0,0 +1,51 @@
+from asgikit.requests import Request
+from asgikit.responses import respond_json, respond_stream, respond_text
+
+from selva.web import get
+
+LOREM_IPSUM = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 100
+
+
+@get("text")
+async def text(request: Request):
+    await respond_text(request.response, LOREM_IPSUM)
+
+
+@get("small")
+async def small(request: Request):
+    await respond_text(request.response, "small")
+
+
+@get("json")
+async def json(request: Request):
+    await respond_json(request.response, {"data": LOREM_IPSUM})
+
+
+@get("binary")
+async def binary(request: Request):
+    request.response.content_type = "image/png"
+    await respond_text(request.response, LOREM_IPSUM.encode())
+
+
+@get("encoded")
+async def encoded(request: Request):
+    request.response.header("content-encoding", "custom")
+    await respond_text(request.response, LOREM_IPSUM)
+
+
+@get("stream")
+async def stream(request: Request):
+    async def generator():
+        for i in range(0, len(LOREM_IPSUM), 100):
+            yield LOREM_IPSUM[i : i + 100]
+
+    request.response.content_type = "text/plain"
+    await respond_stream(request.response, generator())
+
+
+@get("range")
+async def byte_range(request: Request):
+    data = LOREM_IPSUM[:1000]
+    request.response.status = 206
+    request.response.header("content-range", f"bytes 0-999/{len(LOREM_IPSUM)}")
+    await respond_text(request.response, data)
@@ -0,0 +1,148 @@
+import gzip
+from importlib.util import find_spec
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from selva.configuration import Settings
+from selva.configuration.defaults import default_settings
+from selva.web.application import Selva
+from selva.web.middleware.compression import (
+    compression_middleware,
+    parse_accept_encoding,
+    select_encoding,
+)
+
+from .application import LOREM_IPSUM
+
+MIDDLEWARE = f"{compression_middleware.__module__}:{compression_middleware.__name__}"
+
+
+async def _make_client(**compression_settings) -> AsyncClient:
+    settings = Settings(
+        default_settings
+        | {
+            "application": f"{__package__}.application",
+            "middleware": [MIDDLEWARE],
+            "compression": default_settings["compression"] | compression_settings,
+        }
+    )
+    app = Selva(settings)
+    await app._lifespan_startup()
+
+    return AsyncClient(transport=ASGITransport(app=app))
+
+
+def test_parse_accept_encoding():
+    result = parse_accept_encoding("gzip;q=0.5, br, *;q=0.1, zstd;q=invalid")
+    assert result == {"gzip": 0.5, "br": 1.0, "*": 0.1, "zstd": 0.0}
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,expected",
+    [
+        ("gzip", "gzip"),
+        ("gzip, br", "br"),
+        ("gzip, br;q=0.5", "gzip"),
+        ("*", "br"),
+        ("br;q=0, *", "gzip"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_select_encoding(accept_encoding, expected):
+    assert select_encoding(accept_encoding, ["br", "gzip"]) == expected
+
+
+async def test_compress_response():
+    client = await _make_client(encodings=["gzip"])
+    response = await client.get(
+        "http://localhost:8000/text", headers={"accept-encoding": "gzip"}
+    )
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "accept-encoding"
+    assert int(response.headers["content-length"]) < len(LOREM_IPSUM)
+    assert response.text == LOREM_IPSUM
+
+
+async def test_compress_json_response():
+    client = await _make_client(encodings=["gzip"])
+    response = await client.get(
+        "http://localhost:8000/json", headers={"accept-encoding": "gzip"}
+    )
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == {"data": LOREM_IPSUM}
+
+
+async def test_compress_stream_response():
+    client = await _make_client(encodings=["gzip"])
+
+    async with client.stream(
+        "GET", "http://localhost:8000/stream", headers={"accept-encoding": "gzip"}
+    ) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join([chunk async for chunk in response.aiter_raw()])
+
+    assert gzip.decompress(raw).decode() == LOREM_IPSUM
+
+
+async def test_compress_in_thread():
+    client = await _make_client(encodings=["gzip"], thread_threshold=1)
+    response = await client.get(
+        "http://localhost:8000/text", headers={"accept-encoding": "gzip"}
+    )
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == LOREM_IPSUM
+
+
+@pytest.mark.parametrize(
+    "encoding,package",
+    [("br", "brotli"), ("zstd", "zstandard")],
+)
+async def test_compress_with_optional_encoding(encoding, package):
+    if find_spec(package) is None:
+        pytest.skip(f"{package} not present")
+
+    client = await _make_client()
+    response = await client.get(
+        "http://localhost:8000/text", headers={"accept-encoding": encoding}
+    )
+
+    assert response.headers["content-encoding"] == encoding
+    assert response.text == LOREM_IPSUM
+
+
+@pytest.mark.parametrize(
+    "path,accept_encoding",
+    [
+        ("/small", "gzip"),
+        ("/binary", "gzip"),
+        ("/encoded", "gzip"),
+        ("/text", "identity"),
+        ("/range", "gzip"),
+    ],
+    ids=[
+        "below minimum size",
+        "not compressible",
+        "already encoded",
+        "not accepted",
+        "partial content",
+    ],
+)
+async def test_response_not_compressed(path, accept_encoding):
+    client = await _make_client(encodings=["gzip"])
+    response = await client.get(
+        f"http://localhost:8000{path}", headers={"accept-encoding": accept_encoding}
+    )
+
+    assert response.headers.get("content-encoding") != "gzip"
+    assert "vary" not in response.headers
+
+
+async def test_no_supported_encoding_should_fail():
+    with pytest.raises(ValueError, match="No supported compression encoding"):
+        await _make_client(encodings=["unknown"])